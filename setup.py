@@ -5,6 +5,9 @@ with open('requirements.txt') as f:
 
 requirements = requirements.splitlines()
 
+with open('requirements_aio.txt') as f:
+    requirements_aio = f.read().splitlines()
+
 with open('README.md') as f:
     readme = f.read()
 readme = "\n".join(readme.split('\n')[2:])
@@ -28,6 +31,7 @@ setup(
     long_description=readme,
     long_description_content_type='text/markdown',
     install_requires=requirements,
+    extras_require={'aio': requirements_aio},
     setup_requires=['wheel'],
     packages=find_packages(exclude=('tests', )),
     entry_points={
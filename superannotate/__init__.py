@@ -8,7 +8,9 @@ import requests
 from .analytics.class_analytics import (
     attribute_distribution, class_distribution
 )
-from .analytics.common import aggregate_annotations_as_df, df_to_annotations
+from .analytics.common import (
+    aggregate_annotations_as_df, df_to_annotations, update_annotations_df
+)
 from .annotation_helpers import (
     add_annotation_bbox_to_json, add_annotation_comment_to_json,
     add_annotation_cuboid_to_json, add_annotation_ellipse_to_json,
@@ -32,6 +34,8 @@ from .db.annotation_classes import (
     delete_annotation_class, download_annotation_classes_json,
     get_annotation_class_metadata, search_annotation_classes
 )
+from .db.cache import clear_metadata_cache, configure_metadata_cache
+from .db.executor import set_max_workers
 from .db.exports import (
     download_export, get_export_metadata, get_exports, prepare_export
 )
@@ -42,25 +46,29 @@ from .db.images import (
     add_annotation_polyline_to_image, add_annotation_template_to_image,
     create_fuse_image, delete_image, download_image, download_image_annotations,
     download_image_preannotations, get_image_annotations, get_image_bytes,
-    get_image_metadata, get_image_preannotations, search_images,
-    set_image_annotation_status, upload_annotations_from_json_to_image
+    get_image_metadata, get_image_preannotations, get_images_annotations,
+    invalidate_images_index, search_images, search_images_pages,
+    set_image_annotation_status, set_images_annotation_statuses,
+    upload_annotations_from_json_to_image
 )
 from .db.project import get_project_metadata, search_projects
 from .db.project_images import (
-    assign_images, copy_image, move_image, pin_image, upload_image_to_project
+    assign_images, copy_image, copy_images, move_image, move_images, pin_image,
+    pin_images, upload_image_to_project
 )
 from .db.projects import (
     clone_project, create_project, create_project_like_project, delete_project,
     get_project_default_image_quality_in_editor, get_project_image_count,
     get_project_settings, get_project_workflow, rename_project,
-    set_project_default_image_quality_in_editor, set_project_settings,
-    set_project_workflow, share_project, unshare_project,
+    set_image_upload_options, set_project_default_image_quality_in_editor,
+    set_project_settings, set_project_workflow, share_project, unshare_project,
     upload_annotations_from_folder_to_project,
     upload_images_from_folder_to_project,
     upload_images_from_s3_bucket_to_project, upload_images_to_project,
     upload_preannotations_from_folder_to_project, upload_video_to_project,
     upload_videos_from_folder_to_project
 )
+from .db.s3_clients import configure_multipart_upload
 from .db.teams import (
     delete_contributor_to_team_invitation, get_team_metadata,
     invite_contributor_to_team
@@ -126,5 +134,20 @@ def init(path_to_config_json):
     _api.init(path_to_config_json)
 
 
+def configure_storage_session(pool_size=None, timeout=None, max_retries=None):
+    """Configures the HTTP session used for image, annotation and export
+    downloads from the data storage.
+
+    :param pool_size: number of pooled connections to keep per host
+    :type pool_size: int
+    :param timeout: connect and read timeouts in seconds
+    :type timeout: float or tuple (connect, read)
+    :param max_retries: number of retries with exponential backoff on
+                        connection errors and 429, 500, 502, 503, 504 responses
+    :type max_retries: int
+    """
+    _api.configure_storage_session(pool_size, timeout, max_retries)
+
+
 _check_version()
 init(None)
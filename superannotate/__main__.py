@@ -187,7 +187,7 @@ def video_upload(args):
         default=None,
         type=float,
         help=
-        'How many frames per second need to extract from the videos (approximate).  If not specified all frames will be uploaded'
+        'How many frames per second need to extract from the videos. Frames are sampled evenly. If not specified all frames will be uploaded'
     )
     parser.add_argument(
         '--start-time',
@@ -205,6 +205,13 @@ def video_upload(args):
         help=
         'Time (in seconds) up to which to extract frames. If it is not specified, then up to end'
     )
+    parser.add_argument(
+        '--processes',
+        required=False,
+        default=None,
+        type=int,
+        help='Number of videos decoded in parallel. Default is the number of CPUs'
+    )
     args = parser.parse_args(args)
 
     sa.upload_videos_from_folder_to_project(
@@ -215,7 +222,8 @@ def video_upload(args):
         recursive_subfolders=args.recursive,
         target_fps=args.target_fps,
         start_time=args.start_time,
-        end_time=args.end_time
+        end_time=args.end_time,
+        processes=args.processes
     )
 
 
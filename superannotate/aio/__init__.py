@@ -0,0 +1,55 @@
+"""asyncio API of the SDK. Functions mirror the ones with the same names in
+the superannotate package, but are coroutines and use aiohttp for both
+SuperAnnotate platform and data storage requests, so that many of them can
+run concurrently on one event loop. Configuration is shared with the
+superannotate package, i.e., sa.init should be called first.
+
+Requires aiohttp, installed with pip install superannotate[aio].
+"""
+try:
+    import aiohttp  # pylint: disable=unused-import
+except ImportError as e:
+    raise ImportError(
+        "superannotate.aio requires aiohttp. Install it with "
+        "pip install 'superannotate[aio]'"
+    ) from e
+
+from .annotation_classes import (
+    create_annotation_class, delete_annotation_class,
+    get_annotation_class_metadata, search_annotation_classes
+)
+from .api import AsyncAPI
+from .exports import (
+    download_export, get_export_metadata, get_exports, prepare_export
+)
+from .images import (
+    delete_image, download_image_annotations, get_image_annotations,
+    get_image_bytes, get_image_metadata, get_image_preannotations,
+    get_images_annotations, search_images, set_image_annotation_status,
+    upload_annotations_from_json_to_image
+)
+from .project import get_project_metadata, search_projects
+from .projects import (
+    create_project, delete_project, get_project_image_count,
+    get_project_settings, get_project_workflow
+)
+
+_aio_api = AsyncAPI.get_instance()
+
+
+def configure(max_connections=None):
+    """Configures connection pool of the asyncio API. Applies to event loops
+    that haven't made requests yet and after :py:func:`close`.
+
+    :param max_connections: maximum number of simultaneous connections to
+                            SuperAnnotate platform and data storage
+    :type max_connections: int
+    """
+    _aio_api.configure(max_connections=max_connections)
+
+
+async def close():
+    """Closes connections of the asyncio API opened on the running event
+    loop. Should be awaited before the event loop is closed.
+    """
+    await _aio_api.close()
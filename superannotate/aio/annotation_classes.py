@@ -0,0 +1,231 @@
+import copy
+import logging
+
+from ..api import API
+from ..exceptions import (
+    SABaseException, SAExistingAnnotationClassNameException,
+    SANonExistingAnnotationClassNameException
+)
+from ..db import cache as _cache
+from ..db.annotation_classes import (
+    _invalidate_project_classes, get_annotation_classes_id_to_name,
+    get_annotation_classes_name_to_id
+)
+from .api import AsyncAPI
+from .project import get_project_metadata
+
+logger = logging.getLogger("superannotate-python-sdk")
+
+_api = API.get_instance()
+_aio_api = AsyncAPI.get_instance()
+
+
+async def create_annotation_class(project, name, color, attribute_groups=None):
+    """Create annotation class in project
+
+    :param project: project name or metadata of the project
+    :type project: str or dict
+    :param name: name for the class
+    :type name: str
+    :param color: RGB hex color value, e.g., "#FFFFAA"
+    :type color: str
+    :param attribute_groups: example:
+     [ { "name": "tall", "is_multiselect": 0, "attributes": [ { "name": "yes" }, { "name": "no" } ] },
+     { "name": "age", "is_multiselect": 0, "attributes": [ { "name": "young" }, { "name": "old" } ] } ]
+    :type attribute_groups: list of dicts
+
+    :return: new class metadata
+    :rtype: dict
+    """
+    if not isinstance(project, dict):
+        project = await get_project_metadata(project)
+    try:
+        await get_annotation_class_metadata(project, name)
+    except SANonExistingAnnotationClassNameException:
+        pass
+    else:
+        logger.warning(
+            "Annotation class %s already in project. Skipping.", name
+        )
+        return None
+    team_id, project_id = project["team_id"], project["id"]
+    logger.info(
+        "Creating annotation class in project %s with name %s", project["name"],
+        name
+    )
+    params = {
+        'team_id': team_id,
+        'project_id': project_id,
+    }
+    data = {
+        "classes":
+            [
+                {
+                    "name":
+                        name,
+                    "color":
+                        color,
+                    "attribute_groups":
+                        attribute_groups if attribute_groups is not None else []
+                }
+            ]
+    }
+    response = await _aio_api.send_request(
+        req_type='POST', path='/classes', params=params, json_req=data
+    )
+    if not response.ok:
+        raise SABaseException(
+            response.status_code, "Couldn't create class " + response.text
+        )
+    _invalidate_project_classes(project)
+    res = response.json()
+    new_class = res[0]
+    return new_class
+
+
+async def delete_annotation_class(project, annotation_class):
+    """Deletes annotation class from project
+
+    :param project: project name or metadata of the project
+    :type project: str or dict
+    :param annotation_class: annotation class name or  metadata
+    :type annotation_class: str or dict
+    """
+    if not isinstance(project, dict):
+        project = await get_project_metadata(project)
+    if not isinstance(annotation_class, dict):
+        annotation_class = await get_annotation_class_metadata(
+            project, annotation_class
+        )
+    team_id, project_id, name, class_id = _api.team_id, annotation_class[
+        "project_id"], annotation_class["name"], annotation_class["id"]
+    logger.info(
+        "Deleting annotation class from project %s with name %s",
+        project["name"], name
+    )
+    params = {
+        'team_id': team_id,
+        'project_id': project_id,
+    }
+    response = await _aio_api.send_request(
+        req_type='DELETE', path=f'/class/{class_id}', params=params
+    )
+    if not response.ok:
+        raise SABaseException(
+            response.status_code,
+            "Couldn't delete annotation class " + response.text
+        )
+    _invalidate_project_classes(project)
+
+
+async def search_annotation_classes(
+    project, name_prefix=None, return_metadata=False
+):
+    """Searches annotation classes by name_prefix (case-insensitive)
+
+    :param project: project name or metadata of the project
+    :type project: str or dict
+    :param name_prefix: name prefix for search. If None all annotation classes
+     will be returned
+    :type name_prefix: str
+
+    :return: annotation classes of the project
+    :rtype: list of dicts
+    """
+    if not isinstance(project, dict):
+        project = await get_project_metadata(project)
+    if name_prefix is None:
+        result_list = copy.deepcopy(await _get_project_classes(project))
+    else:
+        result_list = await _search_annotation_classes(project, name_prefix)
+
+    if return_metadata:
+        return result_list
+    else:
+        return [x["name"] for x in result_list]
+
+
+async def _search_annotation_classes(project, name_prefix=None):
+    result_list = []
+    team_id, project_id = project["team_id"], project["id"]
+    params = {'team_id': team_id, 'project_id': project_id, 'offset': 0}
+    if name_prefix is not None:
+        params['name'] = name_prefix
+    while True:
+        response = await _aio_api.send_request(
+            req_type='GET', path='/classes', params=params
+        )
+        if not response.ok:
+            raise SABaseException(
+                response.status_code, "Couldn't search classes " + response.text
+            )
+        res = response.json()
+        result_list += res["data"]
+        new_len = len(result_list)
+        if res["count"] <= new_len:
+            break
+        params["offset"] = new_len
+    return result_list
+
+
+async def _get_project_classes(project):
+    key = ("classes", project["team_id"], project["id"])
+    annotation_classes = _cache.get(key)
+    if annotation_classes is None:
+        annotation_classes = await _search_annotation_classes(project)
+        _cache.put(key, annotation_classes)
+    return annotation_classes
+
+
+async def _get_project_classes_id_to_name(project):
+    key = ("classes_id_to_name", project["team_id"], project["id"])
+    annotation_classes_dict = _cache.get(key)
+    if annotation_classes_dict is None:
+        annotation_classes_dict = get_annotation_classes_id_to_name(
+            await _get_project_classes(project)
+        )
+        _cache.put(key, annotation_classes_dict)
+    return annotation_classes_dict
+
+
+async def _get_project_classes_name_to_id(project):
+    key = ("classes_name_to_id", project["team_id"], project["id"])
+    annotation_classes_dict = _cache.get(key)
+    if annotation_classes_dict is None:
+        annotation_classes_dict = get_annotation_classes_name_to_id(
+            await _get_project_classes(project)
+        )
+        _cache.put(key, annotation_classes_dict)
+    return annotation_classes_dict
+
+
+async def get_annotation_class_metadata(project, annotation_class_name):
+    """Returns annotation class metadata
+
+    :param project: project name or metadata of the project
+    :type project: str or dict
+    :param annotation_class_name: annotation class name
+    :type annotation_class_name: str
+
+    :return: metadata of annotation class
+    :rtype: dict
+    """
+    if not isinstance(project, dict):
+        project = await get_project_metadata(project)
+    results = []
+    for annotation_class in await _get_project_classes(project):
+        if annotation_class["name"] == annotation_class_name:
+            results.append(copy.deepcopy(annotation_class))
+
+    if len(results) > 1:
+        raise SAExistingAnnotationClassNameException(
+            0, "Annotation class name " + annotation_class_name +
+            " is not unique. To use SDK please make annotation class names unique."
+        )
+    elif len(results) == 1:
+        return results[0]
+    else:
+        raise SANonExistingAnnotationClassNameException(
+            0, "Annotation class with name " + annotation_class_name +
+            " doesn't exist."
+        )
@@ -0,0 +1,182 @@
+import asyncio
+import json
+import logging
+import os
+
+import aiohttp
+from yarl import URL
+
+from ..api import API
+from ..exceptions import SABaseException
+
+logger = logging.getLogger("superannotate-python-sdk")
+
+_api = API.get_instance()
+
+_API_RETRY_STATUSES = (501, 502, 503, 504, 505, 506, 507, 508, 510, 511)
+_API_MAX_RETRIES = 5
+_STORAGE_RETRY_STATUSES = (429, 500, 502, 503, 504)
+_RETRY_ERRORS = (
+    aiohttp.ClientConnectionError, aiohttp.ClientPayloadError,
+    asyncio.TimeoutError
+)
+_IDEMPOTENT_METHODS = ("GET", "HEAD", "OPTIONS", "PUT", "DELETE")
+# non-idempotent requests, e.g., POSTs that create projects or images, are
+# retried only if the server didn't process them, as otherwise retries can
+# create duplicates
+_NOT_SENT_ERRORS = (aiohttp.ClientConnectorError, )
+_NOT_PROCESSED_STATUSES = (502, 503)
+
+
+class Response:
+    """Fully read HTTP response with the parts of requests.Response
+    interface used by the SDK
+    """
+    def __init__(self, status_code, content, headers):
+        self.status_code = status_code
+        self.ok = status_code < 400
+        self.content = content
+        self.headers = headers
+
+    @property
+    def text(self):
+        return self.content.decode("utf-8", errors="replace")
+
+    def json(self):
+        return json.loads(self.content)
+
+
+def _prepare_params(params):
+    # same as requests: None values are dropped, others are sent as str
+    if params is None:
+        return None
+    return {k: str(v) for k, v in params.items() if v is not None}
+
+
+class AsyncAPI:
+    """asyncio counterpart of superannotate.api.API. Uses the configuration
+    set with sa.init. REST and presigned data storage requests share one
+    aiohttp connection pool per event loop.
+    """
+    __instance = None
+
+    def __init__(self):
+        if AsyncAPI.__instance is not None:
+            raise SABaseException(0, "AsyncAPI class is a singleton!")
+        AsyncAPI.__instance = self
+        self._sessions = {}
+        self._max_connections = 100
+
+    @staticmethod
+    def get_instance():
+        if AsyncAPI.__instance is None:
+            AsyncAPI()
+        return AsyncAPI.__instance
+
+    def configure(self, max_connections=None):
+        """Sets connection pool size. Applies to sessions created after the
+        call, i.e., on new event loops or after :py:meth:`close`.
+        """
+        if max_connections is not None:
+            if not isinstance(max_connections, int) or max_connections < 1:
+                raise SABaseException(
+                    0, "max_connections should be a positive integer"
+                )
+            self._max_connections = max_connections
+
+    def _get_sessions(self):
+        loop = asyncio.get_event_loop()
+        for other_loop in [l for l in self._sessions if l.is_closed()]:
+            del self._sessions[other_loop]
+        sessions = self._sessions.get(loop)
+        if sessions is None or sessions[0].closed:
+            settings = _api.get_connection_settings()
+            connector_kwargs = {"limit": self._max_connections}
+            if settings["verify"] is False:
+                connector_kwargs["ssl"] = False
+            connector = aiohttp.TCPConnector(**connector_kwargs)
+            connect_timeout, read_timeout = settings["storage_timeout"]
+            timeout = aiohttp.ClientTimeout(
+                sock_connect=connect_timeout, sock_read=read_timeout
+            )
+            api_session = aiohttp.ClientSession(
+                connector=connector,
+                headers=settings["headers"],
+                timeout=timeout
+            )
+            storage_session = aiohttp.ClientSession(
+                connector=connector, connector_owner=False, timeout=timeout
+            )
+            sessions = (api_session, storage_session)
+            self._sessions[loop] = sessions
+        return sessions
+
+    def get_storage_session(self):
+        """Returns aiohttp session of the running event loop for requests to
+        presigned data storage URLs. Session doesn't carry SuperAnnotate
+        authorization headers.
+        """
+        return self._get_sessions()[1]
+
+    async def close(self):
+        """Closes connections opened on the running event loop"""
+        sessions = self._sessions.pop(asyncio.get_event_loop(), None)
+        if sessions is not None:
+            await sessions[1].close()
+            await sessions[0].close()
+
+    async def send_request(self, req_type, path, params=None, json_req=None):
+        settings = _api.get_connection_settings()
+        if not settings["authenticated"]:
+            raise SABaseException(
+                0,
+                "SuperAnnotate was not initialized. Please provide correct config file location to sa.init(<path>) or use CLI's superannotate init to generate default location config file."
+            )
+        session, _ = self._get_sessions()
+        return await _request(
+            session,
+            req_type,
+            settings["main_endpoint"] + path,
+            _API_RETRY_STATUSES,
+            _API_MAX_RETRIES,
+            0.3,
+            params=_prepare_params(params),
+            json=json_req
+        )
+
+    async def storage_get(self, url, headers=None):
+        """GET request to presigned data storage URL, without SuperAnnotate
+        authorization headers
+        """
+        _, session = self._get_sessions()
+        # presigned URLs are already encoded, re-quoting breaks signatures
+        return await _request(
+            session,
+            "GET",
+            URL(url, encoded=True),
+            _STORAGE_RETRY_STATUSES,
+            _api.get_connection_settings()["storage_max_retries"],
+            0.5,
+            headers=headers
+        )
+
+
+async def _request(
+    session, method, url, retry_statuses, max_retries, backoff_factor, **kwargs
+):
+    retry_errors = _RETRY_ERRORS
+    if method.upper() not in _IDEMPOTENT_METHODS:
+        retry_errors = _NOT_SENT_ERRORS
+        retry_statuses = set(retry_statuses) & set(_NOT_PROCESSED_STATUSES)
+    for attempt in range(max_retries + 1):
+        try:
+            async with session.request(method, url, **kwargs) as response:
+                content = await response.read()
+                if "SUPERANNOTATE_DEBUG" in os.environ:
+                    logger.info('HTTP %s %s %s', method, url, response.status)
+                if response.status not in retry_statuses or attempt == max_retries:
+                    return Response(response.status, content, response.headers)
+        except retry_errors:
+            if attempt == max_retries:
+                raise
+        await asyncio.sleep(backoff_factor * 2**attempt)
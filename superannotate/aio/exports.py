@@ -0,0 +1,230 @@
+import asyncio
+import functools
+import logging
+import zipfile
+from datetime import datetime
+from pathlib import Path
+
+from yarl import URL
+
+from ..common import annotation_status_str_to_int
+from ..exceptions import (
+    SABaseException, SAExistingExportNameException,
+    SANonExistingExportNameException
+)
+from ..db.exports import _DOWNLOAD_CHUNK_SIZE, _ResumableDownload
+from .api import _RETRY_ERRORS, AsyncAPI
+from .project import get_project_metadata
+
+logger = logging.getLogger("superannotate-python-sdk")
+
+_aio_api = AsyncAPI.get_instance()
+
+
+async def get_export_metadata(project, export_name):
+    """Returns project metadata
+
+    :param project: project name or metadata of the project
+    :type project: str or dict
+    :param export_name: export name
+    :type project: str
+
+    :return: metadata of export
+    :rtype: dict
+    """
+    exports = await get_exports(project, return_metadata=True)
+    results = []
+    for export in exports:
+        if export["name"] == export_name:
+            results.append(export)
+
+    if len(results) == 0:
+        raise SANonExistingExportNameException(
+            0, "Export with name " + export_name + " doesn't exist."
+        )
+    elif len(results) == 1:
+        return results[0]
+    else:
+        raise SAExistingExportNameException(
+            0, "Export name " + export_name +
+            " is not unique. To use SDK please use unique export names."
+        )
+
+
+async def get_exports(project, return_metadata=False):
+    """Get all prepared exports of the project.
+
+    :param project: project name or metadata of the project
+    :type project: str or dict
+    :param return_metadata: return metadata of images instead of names
+    :type return_metadata: bool
+
+    :return: names or metadata objects of the all prepared exports of the project
+    :rtype: list of strs or dicts
+    """
+    if not isinstance(project, dict):
+        project = await get_project_metadata(project)
+    team_id, project_id = project["team_id"], project["id"]
+    params = {'team_id': team_id, 'project_id': project_id}
+    response = await _aio_api.send_request(
+        req_type='GET', path='/exports', params=params
+    )
+    if not response.ok:
+        raise SABaseException(
+            response.status_code, "Couldn't get exports. " + response.text
+        )
+    res = response.json()
+    if return_metadata:
+        return res
+    else:
+        return [x["name"] for x in res]
+
+
+async def _get_export(export):
+    team_id, project_id, export_id = export["team_id"], export["project_id"
+                                                              ], export["id"]
+    params = {'team_id': team_id, 'project_id': project_id}
+    response = await _aio_api.send_request(
+        req_type='GET', path=f'/export/{export_id}', params=params
+    )
+    if not response.ok:
+        raise SABaseException(
+            response.status_code, "Couldn't get export. " + response.text
+        )
+    return response.json()
+
+
+async def prepare_export(
+    project, annotation_statuses=None, include_fuse=False, only_pinned=False
+):
+    """Prepare annotations and classes.json for export. Original and fused images for images with
+    annotations can be included with include_fuse flag.
+
+    :param project: project name or metadata of the project
+    :type project: str or dict
+    :param annotation_statuses: images with which status to include, if None, [ "InProgress", "QualityCheck", "Returned", "Completed"] will be chose
+           list elements should be one of NotStarted InProgress QualityCheck Returned Completed Skipped
+    :type annotation_statuses: list of strs
+    :param include_fuse: enables fuse images in the export
+    :type include_fuse: bool
+    :param only_pinned: enable only pinned output in export. This option disables all other types of output.
+    :type only_pinned: bool
+
+    :return: name of the prepared export
+    :rtype: str
+    """
+    if not isinstance(project, dict):
+        project = await get_project_metadata(project)
+    team_id, project_id = project["team_id"], project["id"]
+    if annotation_statuses is None:
+        annotation_statuses = [2, 3, 4, 5]
+    else:
+        annotation_statuses = map(
+            annotation_status_str_to_int, annotation_statuses
+        )
+    json_req = {
+        "include": ",".join(str(x) for x in annotation_statuses),
+        "fuse": int(include_fuse),
+        "is_pinned": int(only_pinned),
+        "coco": 0,
+        "time": datetime.now().strftime("%b %d %Y %H:%M")
+    }
+    params = {'team_id': team_id, 'project_id': project_id}
+    response = await _aio_api.send_request(
+        req_type='POST', path='/export', params=params, json_req=json_req
+    )
+    if not response.ok:
+        raise SABaseException(
+            response.status_code, "Couldn't create_export." + response.text
+        )
+    res = response.json()
+    logger.info(
+        "Prepared export %s for project %s (ID %s).", res['name'],
+        project["name"], project["id"]
+    )
+    return res["name"]
+
+
+async def _download_file(url, filepath, checksum=None):
+    """Async counterpart of superannotate.db.exports._download_file, with the
+    same <filepath>.part resume behaviour.
+    """
+    download = _ResumableDownload(filepath, checksum)
+    session = _aio_api.get_storage_session()
+    loop = asyncio.get_event_loop()
+    while True:
+        headers = download.get_request_headers()
+        try:
+            async with session.get(
+                URL(url, encoded=True), headers=headers
+            ) as response:
+                if response.status == 416:
+                    if download.is_complete(
+                        response.headers.get("Content-Range")
+                    ):
+                        break
+                    continue
+                if response.status >= 400:
+                    raise SABaseException(
+                        response.status,
+                        "Couldn't download file " + await response.text()
+                    )
+                mode = download.get_write_mode(response.status)
+                with open(download.part_path, mode) as f:
+                    async for chunk in response.content.iter_chunked(
+                        _DOWNLOAD_CHUNK_SIZE
+                    ):
+                        await loop.run_in_executor(None, f.write, chunk)
+            break
+        except _RETRY_ERRORS as e:
+            download.interrupted(e)
+    return await loop.run_in_executor(None, download.finish)
+
+
+def _extract_zip(filepath, folder_path):
+    with zipfile.ZipFile(filepath, 'r') as f:
+        f.extractall(folder_path)
+    Path.unlink(filepath)
+
+
+async def download_export(
+    project, export, folder_path, extract_zip_contents=True, checksum=None
+):
+    """Download prepared export to local folder. Zip extraction and checksum
+    verification run in the default executor of the event loop.
+
+    :param project: project name or metadata of the project
+    :type project: str or dict
+    :param export: export name or metadata of the prepared export
+    :type export: str or dict
+    :param folder_path: where to download the export
+    :type folder_path: Pathlike (str or Path)
+    :param extract_zip_contents: if False then a zip file will be downloaded,
+     if True the zip file will be extracted at folder_path
+    :type extract_zip_contents: bool
+    :param checksum: if not None, expected hex digest of the export zip file, MD5 by
+     default or prefixed with hashlib algorithm name, e.g., "sha256:<hex digest>"
+    :type checksum: str
+    """
+    if not isinstance(export, dict):
+        export = await get_export_metadata(project, export)
+
+    while True:
+        res = await _get_export(export)
+        if res["status"] == 1:
+            logger.info("Waiting 5 seconds for export to finish on server.")
+            await asyncio.sleep(5)
+            continue
+        if res["status"] == 4:
+            raise SABaseException(0, "Couldn't download export.")
+        break
+
+    filepath = Path(folder_path) / Path(res['path']).name
+    await _download_file(res['download'], filepath, checksum)
+    if extract_zip_contents:
+        await asyncio.get_event_loop().run_in_executor(
+            None, functools.partial(_extract_zip, filepath, folder_path)
+        )
+        logger.info("Extracted %s to folder %s", filepath, folder_path)
+    else:
+        logger.info("Downloaded export ID %s to %s", res['id'], filepath)
@@ -0,0 +1,600 @@
+import asyncio
+import copy
+import io
+import json
+import logging
+from pathlib import Path
+
+from ..api import API
+from ..common import annotation_status_str_to_int
+from ..exceptions import SABaseException
+from ..db import cache as _cache
+from ..db.annotation_classes import (
+    fill_class_and_attribute_ids, fill_class_and_attribute_names
+)
+from ..db.images import (
+    _add_to_images_index, _get_cached_images_index, _get_images_index_misses,
+    _remove_from_images_index, _set_images_index, _set_searched_image,
+    _update_images_index, invalidate_images_index
+)
+from ..db.s3_clients import get_s3_client, upload_to_s3
+from .annotation_classes import (
+    _get_project_classes_id_to_name, _get_project_classes_name_to_id
+)
+from .api import AsyncAPI
+from .project import get_project_metadata
+
+logger = logging.getLogger("superannotate-python-sdk")
+
+_api = API.get_instance()
+_aio_api = AsyncAPI.get_instance()
+
+
+async def _get_project_root_folder_id(project):
+    key = ("root_folder", project["team_id"], project["id"])
+    folder_id = _cache.get(key)
+    if folder_id is not None:
+        return folder_id
+    params = {'team_id': project['team_id']}
+    response = await _aio_api.send_request(
+        req_type='GET', path=f'/project/{project["id"]}', params=params
+    )
+    if not response.ok:
+        raise SABaseException(response.status_code, response.text)
+    folder_id = response.json()['folder_id']
+    _cache.put(key, folder_id)
+    return folder_id
+
+
+async def search_images(
+    project,
+    image_name_prefix=None,
+    annotation_status=None,
+    return_metadata=False
+):
+    """Search images by name_prefix (case-insensitive) and annotation status
+
+    :param project: project name or metadata of the project
+    :type project: str or dict
+    :param image_name_prefix: image name prefix for search
+    :type image_name_prefix: str
+    :param annotation_status: if not None, annotation statuses of images to filter,
+                              should be one of NotStarted InProgress QualityCheck Returned Completed Skipped
+    :type annotation_status: str
+
+    :param return_metadata: return metadata of images instead of names
+    :type return_metadata: bool
+
+    :return: metadata of found images or image names
+    :rtype: list of dicts or strs
+    """
+    if not isinstance(project, dict):
+        project = await get_project_metadata(project)
+    team_id, project_id = project["team_id"], project["id"]
+    folder_id = await _get_project_root_folder_id(project)
+    if annotation_status is not None:
+        annotation_status = annotation_status_str_to_int(annotation_status)
+
+    result_list = []
+    params = {
+        'team_id': team_id,
+        'project_id': project_id,
+        'folder_id': folder_id,
+        'annotation_status': annotation_status,
+        'offset': 0
+    }
+    if image_name_prefix is not None:
+        params['name'] = image_name_prefix
+    while True:
+        response = await _aio_api.send_request(
+            req_type='GET', path='/images', params=params
+        )
+        if not response.ok:
+            raise SABaseException(
+                response.status_code, "Couldn't search images " + response.text
+            )
+        res = response.json()
+        result_list += res["data"]
+        if res["count"] <= len(result_list):
+            break
+        params["offset"] = len(result_list)
+    if return_metadata:
+        return result_list
+    else:
+        return [x["name"] for x in result_list]
+
+
+async def _get_images_index(project):
+    images = _get_cached_images_index(project)
+    if images is not None:
+        return images, False
+    return _set_images_index(
+        project, await search_images(project, return_metadata=True)
+    ), True
+
+
+async def _lookup_images_index(project, image_names):
+    """Async counterpart of superannotate.db.images._lookup_images_index"""
+    images, just_filled = await _get_images_index(project)
+    if just_filled:
+        return images
+    names, relist = _get_images_index_misses(project, images, image_names)
+    if relist:
+        invalidate_images_index(project)
+        images, _ = await _get_images_index(project)
+        return images
+    found = await asyncio.gather(
+        *[_search_image_metadata(project, name) for name in names]
+    )
+    for image_name, image in zip(names, found):
+        _set_searched_image(project, image_name, image)
+        if image is not None:
+            images[image_name] = image
+    return images
+
+
+async def _search_image_metadata(project, image_name):
+    images = await search_images(project, image_name, return_metadata=True)
+    for image in images:
+        if image["name"] == image_name:
+            return image
+    return None
+
+
+async def get_image_metadata(project, image_name):
+    """Returns image metadata
+
+    :param project: project name or metadata of the project
+    :type project: str or dict
+    :param image_name: image name
+    :type image: str
+
+    :return: metadata of image
+    :rtype: dict
+    """
+    if not isinstance(project, dict):
+        project = await get_project_metadata(project)
+    if not _cache.is_enabled():
+        image = await _search_image_metadata(project, image_name)
+    else:
+        images, just_filled = await _get_images_index(project)
+        image = images.get(image_name)
+        if image is None and not just_filled:
+            # image could have been added after the index was filled
+            image = await _search_image_metadata(project, image_name)
+            if image is not None:
+                _add_to_images_index(project, image)
+    if image is None:
+        raise SABaseException(
+            0, "Image " + image_name + " doesn't exist in the project " +
+            project["name"]
+        )
+    return copy.copy(image)
+
+
+async def set_image_annotation_status(project, image_name, annotation_status):
+    """Sets the image annotation status
+
+    :param project: project name or metadata of the project
+    :type project: str or dict
+    :param image_name: image name
+    :type image: str
+    :param annotation_status: annotation status to set,
+           should be one of NotStarted InProgress QualityCheck Returned Completed Skipped
+    :type annotation_status: str
+
+    :return: metadata of the updated image
+    :rtype: dict
+    """
+    if not isinstance(project, dict):
+        project = await get_project_metadata(project)
+    image = await get_image_metadata(project, image_name)
+    team_id, project_id, image_id = image["team_id"], image["project_id"
+                                                           ], image["id"]
+    annotation_status = annotation_status_str_to_int(annotation_status)
+    json_req = {
+        "annotation_status": annotation_status,
+    }
+    params = {'team_id': team_id, 'project_id': project_id}
+    response = await _aio_api.send_request(
+        req_type='PUT',
+        path=f'/image/{image_id}',
+        json_req=json_req,
+        params=params
+    )
+    if not response.ok:
+        raise SABaseException(response.status_code, response.text)
+    _update_images_index(
+        project, image_name, annotation_status=annotation_status
+    )
+    return response.json()
+
+
+async def delete_image(project, image_name):
+    """Deletes image
+
+    :param project: project name or metadata of the project
+    :type project: str or dict
+    :param image_name: image name
+    :type image: str
+    """
+    if not isinstance(project, dict):
+        project = await get_project_metadata(project)
+    image = await get_image_metadata(project, image_name)
+    team_id, project_id, image_id = image["team_id"], image["project_id"
+                                                           ], image["id"]
+    params = {"team_id": team_id, "project_id": project_id}
+    response = await _aio_api.send_request(
+        req_type='DELETE', path=f'/image/{image_id}', params=params
+    )
+    if not response.ok:
+        raise SABaseException(
+            response.status_code, "Couldn't delete image " + response.text
+        )
+    _remove_from_images_index(project, [image_name])
+    logger.info("Successfully deleted image  %s.", image_name)
+
+
+async def _get_download_tokens(image, include_original=False):
+    params = {
+        'team_id': image["team_id"],
+        'project_id': image["project_id"],
+        'folder_id': image["folder_id"]
+    }
+    if include_original:
+        params['include_original'] = 1
+    response = await _aio_api.send_request(
+        req_type='GET',
+        path=f'/image/{image["id"]}/annotation/getAnnotationDownloadToken',
+        params=params
+    )
+    if not response.ok:
+        raise SABaseException(response.status_code, response.text)
+    return response.json()
+
+
+async def get_image_bytes(project, image_name, variant='original'):
+    """Returns an io.BytesIO() object of the image. Suitable for creating
+    PIL.Image out of it.
+
+    :param project: project name or metadata of the project
+    :type project: str or dict
+    :param image_name: image name
+    :type image: str
+    :param variant: which resolution to get, can be 'original' or 'lores'
+     (low resolution)
+    :type variant: str
+
+    :return: io.BytesIO() of the image
+    :rtype: io.BytesIO()
+    """
+    if variant not in ["original", "lores"]:
+        raise SABaseException(
+            0, "Image download variant should be either original or lores"
+        )
+    if not isinstance(project, dict):
+        project = await get_project_metadata(project)
+    image = await get_image_metadata(project, image_name)
+    try:
+        res = await _get_download_tokens(image, include_original=True)
+    except SABaseException as e:
+        raise SABaseException(
+            e.status_code, "Couldn't get image " + e.message
+        ) from e
+    response = await _aio_api.storage_get(
+        res[variant]["url"], headers=res[variant]["headers"]
+    )
+    return io.BytesIO(response.content)
+
+
+async def get_image_preannotations(project, image_name):
+    """Get pre-annotations of the image. Only works for "vector" projects.
+
+    :param project: project name or metadata of the project
+    :type project: str or dict
+    :param image_name: image name
+    :type image: str
+
+    :return: dict object with following keys:
+        "preannotation_json": dict object of the annotation,
+        "preannotation_json_filename": filename on server,
+    :rtype: dict
+    """
+    if not isinstance(project, dict):
+        project = await get_project_metadata(project)
+    image = await get_image_metadata(project, image_name)
+    res = await _get_download_tokens(image)
+    annotation_classes_dict = await _get_project_classes_id_to_name(project)
+    if project["type"] == 1:  # vector
+        res = res['preannotation']
+        url = res["url"]
+        response = await _aio_api.storage_get(url, headers=res["headers"])
+        if not response.ok:
+            logger.warning(
+                "No preannotation available for image %s.", image_name
+            )
+            return {
+                "preannotation_json_filename": None,
+                "preannotation_json": None
+            }
+        res_json = response.json()
+        fill_class_and_attribute_names(res_json, annotation_classes_dict)
+        return {
+            "preannotation_json_filename": url.rsplit('/', 1)[-1],
+            "preannotation_json": res_json
+        }
+    else:  # pixel
+        res_json = res['preAnnotationJson']
+        url = res_json["url"]
+        response = await _aio_api.storage_get(url, headers=res_json["headers"])
+        if not response.ok:
+            logger.warning("No preannotation available.")
+            return {
+                "preannotation_json_filename": None,
+                "preannotation_json": None,
+                "preannotation_mask_filename": None,
+                "preannotation_mask": None,
+            }
+        preannotation_json = response.json()
+        fill_class_and_attribute_names(
+            preannotation_json, annotation_classes_dict
+        )
+        res_mask = res['preAnnotationSavePng']
+        response = await _aio_api.storage_get(
+            res_mask["url"], headers=res_mask["headers"]
+        )
+        return {
+            "preannotation_json_filename": url.rsplit('/', 1)[-1],
+            "preannotation_json": preannotation_json,
+            "preannotation_mask_filename": res_mask["url"].rsplit('/', 1)[-1],
+            "preannotation_mask": io.BytesIO(response.content)
+        }
+
+
+async def get_image_annotations(project, image_name, project_type=None):
+    """Get annotations of the image.
+
+    :param project: project name or metadata of the project
+    :type project: str or dict
+    :param image_name: image name
+    :type image: str
+
+    :return: dict object with following keys:
+        "annotation_json": dict object of the annotation,
+        "annotation_json_filename": filename on server,
+        "annotation_mask": mask (for pixel),
+        "annotation_mask_filename": mask filename on server
+    :rtype: dict
+    """
+    if not isinstance(project, dict):
+        project = await get_project_metadata(project)
+    image = await get_image_metadata(project, image_name)
+    if project_type is None:
+        project_type = project["type"]
+    annotation_classes_dict = await _get_project_classes_id_to_name(project)
+    return await _get_image_annotations(
+        image, project_type, annotation_classes_dict
+    )
+
+
+async def _get_image_annotations(image, project_type, annotation_classes_dict):
+    res = await _get_download_tokens(image)
+    if project_type == 1:  # vector
+        url = res["objects"]["url"]
+        response = await _aio_api.storage_get(
+            url, headers=res["objects"]["headers"]
+        )
+        if response.ok:
+            res_json = response.json()
+            fill_class_and_attribute_names(res_json, annotation_classes_dict)
+            return {
+                "annotation_json_filename": url.rsplit('/', 1)[-1],
+                "annotation_json": res_json
+            }
+        if response.status_code == 403:
+            return {"annotation_json": None, "annotation_json_filename": None}
+        raise SABaseException(response.status_code, response.text)
+    else:  # pixel
+        url = res["pixelObjects"]["url"]
+        response = await _aio_api.storage_get(
+            url, headers=res["pixelObjects"]["headers"]
+        )
+        if response.status_code == 403:
+            return {
+                "annotation_json": None,
+                "annotation_json_filename": None,
+                "annotation_mask": None,
+                "annotation_mask_filename": None
+            }
+        elif not response.ok:
+            raise SABaseException(response.status_code, response.text)
+        res_json = response.json()
+        fill_class_and_attribute_names(res_json, annotation_classes_dict)
+        mask_url = res["pixelSave"]["url"]
+        response = await _aio_api.storage_get(
+            mask_url, headers=res["pixelSave"]["headers"]
+        )
+        if not response.ok:
+            raise SABaseException(response.status_code, response.text)
+        return {
+            "annotation_json": res_json,
+            "annotation_json_filename": url.rsplit('/', 1)[-1],
+            "annotation_mask": io.BytesIO(response.content),
+            "annotation_mask_filename": mask_url.rsplit('/', 1)[-1]
+        }
+
+
+async def get_images_annotations(project, image_names, max_concurrency=500):
+    """Get annotations of multiple images. Image metadata are resolved with
+    one image listing and the annotations are downloaded concurrently on the
+    running event loop. Results are yielded in completion order, failure to
+    get annotations of an image is reported in its result instead of stopping
+    the whole download.
+
+    :param project: project name or metadata of the project
+    :type project: str or dict
+    :param image_names: image names
+    :type image_names: list of strs
+    :param max_concurrency: maximum number of images downloaded at once.
+                            Connections are also limited by the pool size set
+                            with :py:func:`configure`
+    :type max_concurrency: int
+
+    :return: async generator of dict objects with the keys of
+             :py:func:`get_image_annotations` return value and additional keys:
+        "image_name": image name,
+        "error": None or the exception that occurred for this image
+    :rtype: async generator of dicts
+    """
+    if not isinstance(project, dict):
+        project = await get_project_metadata(project)
+    project_type = project["type"]
+    image_names = list(image_names)
+    if _cache.is_enabled():
+        images = await _lookup_images_index(project, image_names)
+    else:
+        images = {
+            image["name"]: image
+            for image in await search_images(project, return_metadata=True)
+        }
+    annotation_classes_dict = await _get_project_classes_id_to_name(project)
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def _get(image_name):
+        async with semaphore:
+            try:
+                if image_name not in images:
+                    raise SABaseException(
+                        0, "Image " + image_name +
+                        " doesn't exist in the project " + project["name"]
+                    )
+                result = await _get_image_annotations(
+                    images[image_name], project_type, annotation_classes_dict
+                )
+                exception = None
+            except Exception as e:  # pylint: disable=broad-except
+                logger.warning(
+                    "Couldn't get annotations of image %s: %s", image_name, e
+                )
+                exception = e
+                result = {
+                    "annotation_json": None,
+                    "annotation_json_filename": None
+                }
+                if project_type != 1:
+                    result["annotation_mask"] = None
+                    result["annotation_mask_filename"] = None
+        result["error"] = exception
+        result["image_name"] = image_name
+        return result
+
+    tasks = [asyncio.ensure_future(_get(name)) for name in image_names]
+    try:
+        for task in asyncio.as_completed(tasks):
+            yield await task
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+async def download_image_annotations(project, image_name, local_dir_path):
+    """Downloads annotations of the image (JSON and mask if pixel type project)
+    to local_dir_path.
+
+    :param project: project name or metadata of the project
+    :type project: str or dict
+    :param image_name: image name
+    :type image: str
+    :param local_dir_path: local directory path to download to
+    :type local_dir_path: Pathlike (str or Path)
+
+    :return: paths of downloaded annotations
+    :rtype: tuple
+    """
+    if not isinstance(project, dict):
+        project = await get_project_metadata(project)
+
+    annotation = await get_image_annotations(project, image_name)
+
+    if annotation["annotation_json_filename"] is None:
+        logger.info("No annotation found for image %s.", image_name)
+        return None
+    return_filepaths = []
+    json_path = Path(local_dir_path) / annotation["annotation_json_filename"]
+    return_filepaths.append(str(json_path))
+    with open(json_path, "w") as f:
+        json.dump(annotation["annotation_json"], f, indent=4)
+    if project["type"] != 1:
+        mask_path = Path(local_dir_path
+                        ) / annotation["annotation_mask_filename"]
+        return_filepaths.append(str(mask_path))
+        with open(mask_path, "wb") as f:
+            f.write(annotation["annotation_mask"].getbuffer())
+
+    return tuple(return_filepaths)
+
+
+async def upload_annotations_from_json_to_image(
+    project, image_name, annotation_json, mask=None, verbose=True
+):
+    """Upload annotations from JSON (also mask for pixel annotations)
+    to the image. Data storage upload runs in the default executor of the
+    event loop.
+
+    :param project: project name or metadata of the project
+    :type project: str or dict
+    :param image_name: image name
+    :type image: str
+    :param annotation_json: annotations in SuperAnnotate format JSON dict or path to JSON file
+    :type annotation_json: dict or Pathlike (str or Path)
+    :param mask: BytesIO object or filepath to mask annotation for pixel projects in SuperAnnotate format
+    :type mask: BytesIO or Pathlike (str or Path)
+    """
+    if not isinstance(annotation_json, list):
+        if verbose:
+            logger.info("Uploading annotations from %s.", annotation_json)
+        annotation_json = json.load(open(annotation_json))
+    if not isinstance(project, dict):
+        project = await get_project_metadata(project)
+    image = await get_image_metadata(project, image_name)
+    project_type = project["type"]
+    if verbose:
+        logger.info(
+            "Uploading annotations for image %s in project %s.", image_name,
+            project["name"]
+        )
+    annotation_classes_dict = await _get_project_classes_name_to_id(project)
+    fill_class_and_attribute_ids(annotation_json, annotation_classes_dict)
+    params = {
+        'team_id': image["team_id"],
+        'project_id': image["project_id"],
+        'folder_id': image["folder_id"]
+    }
+    response = await _aio_api.send_request(
+        req_type='GET',
+        path=f'/image/{image["id"]}/annotation/getAnnotationUploadToken',
+        params=params
+    )
+    if not response.ok:
+        raise SABaseException(
+            response.status_code, "Couldn't upload annotation. " + response.text
+        )
+    res = response.json()
+    if project_type == 1:  # vector
+        uploads = [(res['objects'], json.dumps(annotation_json).encode())]
+    else:  # pixel
+        if mask is None:
+            raise SABaseException(0, "Pixel annotation should have mask.")
+        uploads = [
+            (res['pixel'], json.dumps(annotation_json).encode()),
+            (res['save'], mask)
+        ]
+    loop = asyncio.get_event_loop()
+    await asyncio.gather(
+        *[
+            loop.run_in_executor(
+                None, upload_to_s3, get_s3_client(creds), body, creds["bucket"],
+                creds['filePath']
+            ) for creds, body in uploads
+        ]
+    )
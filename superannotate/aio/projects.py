@@ -0,0 +1,181 @@
+import logging
+
+from ..api import API
+from ..common import project_type_int_to_str, project_type_str_to_int
+from ..exceptions import (
+    SABaseException, SAExistingProjectNameException,
+    SANonExistingProjectNameException
+)
+from ..db import cache as _cache
+from ..db.images import invalidate_images_index
+from .annotation_classes import _get_project_classes
+from .api import AsyncAPI
+from .project import get_project_metadata
+
+logger = logging.getLogger("superannotate-python-sdk")
+
+_api = API.get_instance()
+_aio_api = AsyncAPI.get_instance()
+
+
+async def create_project(project_name, project_description, project_type):
+    """Create a new project in the team.
+
+    :param project_name: the new project's name
+    :type project_name: str
+    :param project_description: the new project's description
+    :type project_description: str
+    :param project_type: the new project type, Vector or Pixel.
+    :type project_type: str
+
+    :return: dict object metadata the new project
+    :rtype: dict
+    """
+    try:
+        await get_project_metadata(project_name)
+    except SANonExistingProjectNameException:
+        pass
+    else:
+        raise SAExistingProjectNameException(
+            0, "Project with name " + project_name +
+            " already exists. Please use unique names for projects to use with SDK."
+        )
+    project_type = project_type_str_to_int(project_type)
+    data = {
+        "team_id": str(_api.team_id),
+        "name": project_name,
+        "description": project_description,
+        "status": 0,
+        "type": project_type
+    }
+    response = await _aio_api.send_request(
+        req_type='POST', path='/project', json_req=data
+    )
+    if not response.ok:
+        raise SABaseException(
+            response.status_code, "Couldn't create project " + response.text
+        )
+    res = response.json()
+    logger.info(
+        "Created project %s (ID %s) with type %s", res["name"], res["id"],
+        project_type_int_to_str(res["type"])
+    )
+    return res
+
+
+async def delete_project(project):
+    """Deletes the project
+
+    :param project: project name or metadata of the project to be deleted
+    :type project: str or dict
+    """
+    if not isinstance(project, dict):
+        project = await get_project_metadata(project)
+    team_id, project_id = project["team_id"], project["id"]
+    params = {"team_id": team_id}
+    response = await _aio_api.send_request(
+        req_type='DELETE', path=f'/project/{project_id}', params=params
+    )
+    if not response.ok:
+        raise SABaseException(
+            response.status_code, "Couldn't delete project " + response.text
+        )
+    _cache.invalidate(team_id, project_id)
+    invalidate_images_index(project)
+    logger.info("Successfully deleted project %s.", project["name"])
+
+
+async def get_project_image_count(project):
+    """Returns number of images in the project.
+
+    :param project: project name or metadata of the project
+    :type project: str or dict
+
+    :return: number of images in the project
+    :rtype: int
+    """
+    if not isinstance(project, dict):
+        project = await get_project_metadata(project)
+    team_id, project_id = project["team_id"], project["id"]
+    params = {'team_id': team_id}
+    response = await _aio_api.send_request(
+        req_type='GET',
+        path=f'/reporting/project/{project_id}/overview',
+        params=params
+    )
+    if not response.ok:
+        raise SABaseException(
+            response.status_code,
+            "Couldn't get project image count " + response.text
+        )
+    return response.json()["total_images"]
+
+
+async def get_project_settings(project):
+    """Gets project's settings.
+
+    Return value example: [{ "attribute" : "Brightness", "value" : 10, ...},...]
+
+    :param project: project name or metadata
+    :type project: str or dict
+
+    :return: project settings
+    :rtype: list of dicts
+    """
+    if not isinstance(project, dict):
+        project = await get_project_metadata(project)
+    team_id, project_id = project["team_id"], project["id"]
+    params = {
+        "team_id": team_id,
+    }
+    response = await _aio_api.send_request(
+        req_type='GET', path=f'/project/{project_id}/settings', params=params
+    )
+    if not response.ok:
+        raise SABaseException(
+            response.status_code,
+            "Couldn't get project settings " + response.text
+        )
+    return response.json()
+
+
+async def get_project_workflow(project):
+    """Gets project's workflow.
+
+    Return value example: [{ "step" : <step_num>, "className" : <annotation_class>, "tool" : <tool_num>, ...},...]
+
+    :param project: project name or metadata
+    :type project: str or dict
+
+    :return: project workflow
+    :rtype: list of dicts
+    """
+    if not isinstance(project, dict):
+        project = await get_project_metadata(project)
+    team_id, project_id = project["team_id"], project["id"]
+    params = {
+        "team_id": team_id,
+    }
+    response = await _aio_api.send_request(
+        req_type='GET', path=f'/project/{project_id}/workflow', params=params
+    )
+    if not response.ok:
+        raise SABaseException(
+            response.status_code,
+            "Couldn't get project workflow " + response.text
+        )
+    res = response.json()
+    annotation_classes = await _get_project_classes(project)
+    for r in res:
+        if "class_id" not in r:
+            continue
+        found_classid = False
+        for a_class in annotation_classes:
+            if a_class["id"] == r["class_id"]:
+                found_classid = True
+                r["className"] = a_class["name"]
+                del r["class_id"]
+                break
+        if not found_classid:
+            raise SABaseException(0, "Couldn't find class_id in workflow")
+    return res
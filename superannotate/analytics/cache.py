@@ -0,0 +1,151 @@
+"""On-disk cache of the values aggregate_annotations_as_df reads from the
+annotation JSONs of an export root. The cache is kept with the modification
+times and sizes of the JSONs, so that only new and changed JSONs are read
+again.
+
+Values of each column are pickled separately, followed by the pickled
+metadata and its size, so that only the needed columns are loaded. As
+unpickling can run arbitrary code, caches are kept in the user's
+~/.superannotate/cache/annotations_df directory, named by hash of the
+resolved export root path, and not in the export roots, which are often
+shared or downloaded.
+"""
+import hashlib
+import logging
+import os
+import pickle
+import struct
+import tempfile
+from pathlib import Path
+
+logger = logging.getLogger("superannotate-python-sdk")
+
+_VERSION = 1
+_CACHE_DIR = Path(".superannotate") / "cache" / "annotations_df"
+_SIZE_FORMAT = "<Q"
+
+
+def get_files_stats(paths):
+    """Returns file name -> [modification time in ns, size] of the paths.
+
+    :rtype: dict
+    """
+    stats = {}
+    for path in paths:
+        stat = os.stat(path)
+        stats[Path(path).name] = [stat.st_mtime_ns, stat.st_size]
+    return stats
+
+
+def _get_cache_path(project_root):
+    root = str(Path(project_root).resolve())
+    digest = hashlib.sha256(root.encode()).hexdigest()
+    return Path.home() / _CACHE_DIR / f"{digest}.pickle"
+
+
+def load_metadata(project_root, key):
+    """Loads metadata of the cache of the export root if it was saved with
+    the same key.
+
+    :param key: options the values were read with
+    :type key: dict
+
+    :return: None if there is no usable cache, otherwise dict with "columns"
+             and "files" keys, files is the list of [file name, modification
+             time in ns, size, number of rows] in the order of the rows
+    :rtype: dict
+    """
+    path = _get_cache_path(project_root)
+    if not path.is_file():
+        return None
+    try:
+        with open(path, "rb") as f:
+            metadata = _read_metadata(f)
+    except Exception as e:  # pylint: disable=broad-except
+        logger.warning("Couldn't load annotations cache %s: %s", path, e)
+        return None
+    if metadata["version"] != _VERSION or metadata["key"] != key:
+        return None
+    return metadata
+
+
+def load(project_root, metadata, columns):
+    """Loads values of the columns from the cache of the export root.
+
+    :param metadata: metadata returned by load_metadata
+    :type metadata: dict
+    :param columns: columns to load, a subset of metadata["columns"]
+    :type columns: list of strs
+
+    :return: None if the cache couldn't be loaded, otherwise column name ->
+             list of values
+    :rtype: dict
+    """
+    path = _get_cache_path(project_root)
+    data = {}
+    try:
+        with open(path, "rb") as f:
+            if _read_metadata(f) != metadata:
+                raise ValueError("cache was changed")
+            f.seek(0)
+            for column, size in zip(metadata["columns"], metadata["sizes"]):
+                if column in columns:
+                    data[column] = pickle.loads(f.read(size))
+                else:
+                    f.seek(size, os.SEEK_CUR)
+    except Exception as e:  # pylint: disable=broad-except
+        logger.warning("Couldn't load annotations cache %s: %s", path, e)
+        return None
+    return {column: data[column] for column in columns}
+
+
+def save(project_root, key, files, data):
+    """Saves the values read from the JSONs of the export root. Errors are
+    logged, e.g., if the cache directory isn't writable.
+
+    :param key: options the values were read with
+    :type key: dict
+    :param files: [file name, modification time in ns, size, number of rows]
+                  of the JSONs in the order of the rows
+    :type files: list
+    :param data: column name -> list of values
+    :type data: dict
+    """
+    path = _get_cache_path(project_root)
+    try:
+        path.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+        # written to a temporary file first, so that a partly written cache
+        # isn't loaded
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                sizes = []
+                for values in data.values():
+                    sizes.append(
+                        f.write(pickle.dumps(values, pickle.HIGHEST_PROTOCOL))
+                    )
+                metadata = pickle.dumps(
+                    {
+                        "version": _VERSION,
+                        "key": key,
+                        "columns": list(data),
+                        "sizes": sizes,
+                        "files": files
+                    }, pickle.HIGHEST_PROTOCOL
+                )
+                f.write(metadata)
+                f.write(struct.pack(_SIZE_FORMAT, len(metadata)))
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.remove(tmp_path)
+            raise
+    except Exception as e:  # pylint: disable=broad-except
+        logger.warning("Couldn't save annotations cache %s: %s", path, e)
+
+
+def _read_metadata(f):
+    size_length = struct.calcsize(_SIZE_FORMAT)
+    f.seek(-size_length, os.SEEK_END)
+    metadata_size, = struct.unpack(_SIZE_FORMAT, f.read(size_length))
+    f.seek(-size_length - metadata_size, os.SEEK_END)
+    return pickle.loads(f.read(metadata_size))
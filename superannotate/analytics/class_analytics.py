@@ -12,7 +12,9 @@ import logging
 logger = logging.getLogger("superannotate-python-sdk")
 
 
-def class_distribution(export_root, project_names, visualize=False):
+def class_distribution(
+    export_root, project_names, visualize=False, cache=False
+):
     """Aggregate distribution of classes across multiple projects.
 
     :param export_root: root export path of the projects
@@ -21,6 +23,10 @@ def class_distribution(export_root, project_names, visualize=False):
     :type project_names: list of str
     :param visulaize: enables class histogram plot
     :type visualize: bool
+    :param cache: keep the annotations read from the export roots in their
+                  pickled caches in ~/.superannotate/cache, see
+                  aggregate_annotations_as_df
+    :type cache: bool
     :return: DataFrame on class distribution with columns ["className", "count"]
     :rtype: pandas DataFrame
     """
@@ -35,7 +41,7 @@ def class_distribution(export_root, project_names, visualize=False):
     for project_name in project_names:
         project_root = Path(export_root).joinpath(project_name)
         project_df = aggregate_annotations_as_df(
-            project_root, include_classes_wo_annotations=True
+            project_root, include_classes_wo_annotations=True, cache=cache
         )
         project_df = project_df[["imageName", "instanceId", "className"]]
         project_df["projectName"] = project_name
@@ -63,7 +69,9 @@ def class_distribution(export_root, project_names, visualize=False):
     return df
 
 
-def attribute_distribution(export_root, project_names, visualize=False):
+def attribute_distribution(
+    export_root, project_names, visualize=False, cache=False
+):
     """Aggregate distribution of attributes across multiple projects.
 
     :param export_root: root export path of the projects
@@ -72,6 +80,10 @@ def attribute_distribution(export_root, project_names, visualize=False):
     :type project_names: list of str
     :param visulaize: enables attribute histogram plot
     :type visualize: bool
+    :param cache: keep the annotations read from the export roots in their
+                  pickled caches in ~/.superannotate/cache, see
+                  aggregate_annotations_as_df
+    :type cache: bool
     :return: DataFrame on attribute distribution with columns ["className", "attributeGroupName", "attributeName", "count"] 
     :rtype: pandas DataFrame
     """
@@ -86,7 +98,7 @@ def attribute_distribution(export_root, project_names, visualize=False):
     for project_name in project_names:
         project_root = Path(export_root).joinpath(project_name)
         project_df = aggregate_annotations_as_df(
-            project_root, include_classes_wo_annotations=True
+            project_root, include_classes_wo_annotations=True, cache=cache
         )
         project_df = project_df[[
             "imageName", "instanceId", "className", "attributeGroupName",
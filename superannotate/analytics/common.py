@@ -1,120 +1,230 @@
+import concurrent.futures
+import functools
 import json
 import logging
+import os
 from pathlib import Path
 import glob
 
+import numpy as np
 import pandas as pd
 from ..exceptions import SABaseException
+from . import cache as _cache
+
 logger = logging.getLogger("superannotate-python-sdk")
 
+_ANNOTATION_COLUMNS = (
+    "imageName", "imageHeight", "imageWidth", "imageStatus", "imagePinned",
+    "instanceId", "className", "attributeGroupName", "attributeName", "type",
+    "error", "locked", "visible", "trackingId", "probability", "pointLabels",
+    "meta", "classColor", "groupId", "createdAt", "creatorRole", "creationType",
+    "creatorEmail", "updatedAt", "updatorRole", "updatorEmail"
+)
+_USER_METADATA_COLUMNS = (
+    "createdAt", "creatorRole", "creationType", "creatorEmail", "updatedAt",
+    "updatorRole", "updatorEmail"
+)
+# string columns with few distinct values, converted with categorical=True
+_CATEGORICAL_COLUMNS = (
+    "imageName", "imageStatus", "className", "attributeGroupName",
+    "attributeName", "type", "classColor", "creatorRole", "creationType",
+    "creatorEmail", "updatorRole", "updatorEmail", "tag"
+)
+# number of annotation JSONs read by a worker process at once
+_AGGREGATE_CHUNK_SIZE = 500
+
 
-def df_to_annotations(df, output_dir):
+def df_to_annotations(df, output_dir, processes=1):
     """Converts and saves pandas DataFrame annotation info (see aggregate_annotations_as_df) in output_dir
     The DataFrame should have columns: "imageName", "className", "attributeGroupName", "attributeName", "type", "error", "locked", "visible", trackingId", "probability", "pointLabels", "meta", "commentResolved", "classColor", "groupId"
 
     Currently only works for Vector projects.
 
+    Missing values are written as null, instances don't get attributes from
+    rows with missing attributeGroupName and classes.json doesn't get classes
+    from rows with missing className. Earlier versions wrote missing values
+    of non-object columns as NaN, which isn't valid JSON.
+
     :param df: pandas DataFrame of annotations possibly created by aggregate_annotations_as_df
     :type df: pandas.DataFrame
     :param output_dir: output dir for annotations and classes.json
     :type output_dir: str or Pathlike
+    :param processes: number of worker processes that write annotation JSONs.
+                      1 (default) or 0 writes them in this process, if None
+                      the number of CPUs is used. Worker processes are
+                      started with multiprocessing, so on Windows and macOS
+                      the calling script should be guarded with
+                      if __name__ == "__main__":
+    :type processes: int
 
     """
 
+    output_dir = Path(output_dir)
     project_suffix = "objects.json"
-    images = df["imageName"].dropna().unique()
-    for image in images:
-        image_df = df[df["imageName"] == image]
-        image_annotation = []
-        instances = image_df["instanceId"].dropna().unique()
-        for instance in instances:
-            instance_df = image_df[image_df["instanceId"] == instance]
-            annotation_type = instance_df.iloc[0]["type"]
-            annotation_meta = instance_df.iloc[0]["meta"]
-
-            instance_annotation = {
-                "className": instance_df.iloc[0]["className"],
-                "type": annotation_type,
-                "attributes": [],
-                "probability": instance_df.iloc[0]["probability"],
-                "error": instance_df.iloc[0]["error"]
-            }
-            point_labels = instance_df.iloc[0]["pointLabels"]
-            if point_labels is None:
-                point_labels = []
-            instance_annotation["pointLabels"] = point_labels
-            instance_annotation["locked"] = bool(instance_df.iloc[0]["locked"])
-            instance_annotation["visible"] = bool(
-                instance_df.iloc[0]["visible"]
-            )
-            instance_annotation["trackingId"] = instance_df.iloc[0]["trackingId"
-                                                                   ]
-            instance_annotation["groupId"] = int(instance_df.iloc[0]["groupId"])
-            instance_annotation.update(annotation_meta)
-            for _, row in instance_df.iterrows():
-                if row["attributeGroupName"] is not None:
-                    instance_annotation["attributes"].append(
-                        {
-                            "groupName": row["attributeGroupName"],
-                            "name": row["attributeName"]
-                        }
-                    )
-            image_annotation.append(instance_annotation)
-
-        comments = image_df[image_df["type"] == "comment"]
-        for _, comment in comments.iterrows():
-            comment_json = {"type": "comment"}
-            comment_json.update(comment["meta"])
-            comment_json["resolved"] = comment["commentResolved"]
-            image_annotation.append(comment_json)
-
-        json.dump(
-            image_annotation,
-            open(output_dir / f"{image}___{project_suffix}", "w"),
-            indent=4
-        )
+    image_codes, images = pd.factorize(df["imageName"].to_numpy(dtype=object))
+    instance_codes = df.groupby(
+        [image_codes, df["instanceId"].to_numpy()], sort=False, dropna=True
+    ).ngroup().to_numpy()
+    # rows without instance, e.g., comments and tags, are NaN groups, which
+    # ngroup returns as NaN or, before pandas 1.5, as -1
+    has_instance = df["instanceId"].notna().to_numpy()
+    # instances are numbered in the order of their first rows, rows of each
+    # instance keep their order
+    instance_rows = np.argsort(instance_codes, kind="stable")
+    instance_rows = instance_rows[has_instance[instance_rows]]
+    instance_starts = np.flatnonzero(
+        np.diff(instance_codes[instance_rows], prepend=-1)
+    )
+
+    image_annotations = [[] for _ in images]
+    if len(instance_rows):
+        values = {
+            column: _to_list(df[column])
+            for column in [
+                "className", "type", "probability", "error", "pointLabels",
+                "locked", "visible", "trackingId", "groupId", "meta",
+                "attributeGroupName", "attributeName"
+            ]
+        }
+    instance_stops = list(instance_starts[1:]) + [len(instance_rows)]
+    for start, stop in zip(instance_starts, instance_stops):
+        rows = instance_rows[start:stop]
+        first_row = rows[0]
+        if image_codes[first_row] == -1:
+            continue
+        instance_annotation = {
+            "className": values["className"][first_row],
+            "type": values["type"][first_row],
+            "attributes": [],
+            "probability": values["probability"][first_row],
+            "error": values["error"][first_row]
+        }
+        point_labels = values["pointLabels"][first_row]
+        if point_labels is None:
+            point_labels = []
+        instance_annotation["pointLabels"] = point_labels
+        instance_annotation["locked"] = bool(values["locked"][first_row])
+        instance_annotation["visible"] = bool(values["visible"][first_row])
+        instance_annotation["trackingId"] = values["trackingId"][first_row]
+        instance_annotation["groupId"] = int(values["groupId"][first_row])
+        instance_annotation.update(values["meta"][first_row])
+        for row in rows:
+            if values["attributeGroupName"][row] is not None:
+                instance_annotation["attributes"].append(
+                    {
+                        "groupName": values["attributeGroupName"][row],
+                        "name": values["attributeName"][row]
+                    }
+                )
+        image_annotations[image_codes[first_row]].append(instance_annotation)
+
+    comment_rows = np.flatnonzero(
+        (df["type"] == "comment").to_numpy(dtype=bool, na_value=False) &
+        (image_codes != -1)
+    )
+    if len(comment_rows):
+        comment_metas = _to_list(df["meta"])
+        comments_resolved = _to_list(df["commentResolved"])
+    for row in comment_rows:
+        comment_json = {"type": "comment"}
+        comment_json.update(comment_metas[row])
+        comment_json["resolved"] = comments_resolved[row]
+        image_annotations[image_codes[row]].append(comment_json)
+
+    annotations_files = [
+        (output_dir / f"{image}___{project_suffix}", image_annotation)
+        for image, image_annotation in zip(images, image_annotations)
+    ]
+    chunks = [
+        annotations_files[i:i + _AGGREGATE_CHUNK_SIZE]
+        for i in range(0, len(annotations_files), _AGGREGATE_CHUNK_SIZE)
+    ]
+    if processes is None:
+        processes = os.cpu_count() or 1
+    if processes > 1 and len(chunks) > 1:
+        with concurrent.futures.ProcessPoolExecutor(
+            min(processes, len(chunks))
+        ) as pool:
+            list(pool.map(_write_annotations_chunk, chunks))
+    else:
+        for chunk in chunks:
+            _write_annotations_chunk(chunk)
+
+    Path(output_dir / "classes").mkdir(exist_ok=True)
+    with open(output_dir / "classes" / "classes.json", "w") as f:
+        json.dump(_get_classes_json(df), f, indent=4)
+
+
+def _to_list(series):
+    """Returns values of the column as Python objects. Missing values of
+    string and categorical columns are None, as of object columns.
+
+    :rtype: list
+    """
+    if isinstance(series.dtype, (pd.StringDtype, pd.CategoricalDtype)):
+        return series.astype(object).where(series.notna(), None).tolist()
+    return series.tolist()
+
 
+def _write_annotations_chunk(annotations_files):
+    for path, image_annotation in annotations_files:
+        # same output as json.dump, which writes each token separately
+        with open(path, "w") as f:
+            f.write(json.dumps(image_annotation, indent=4))
+
+
+def _get_classes_json(df):
+    """Returns classes JSON of the classes and attributes of annotations
+    DataFrame in the order of their first rows.
+
+    :rtype: list of dicts
+    """
     annotation_classes = []
-    for _, row in df.iterrows():
-        if row["className"] is None:
+    # class name -> (class, attribute group name -> (attribute group,
+    # attribute names))
+    classes = {}
+    for class_name, class_color, attribute_group_name, attribute_name in zip(
+        _to_list(df["className"]), _to_list(df["classColor"]),
+        _to_list(df["attributeGroupName"]), _to_list(df["attributeName"])
+    ):
+        if class_name is None:
             continue
-        for annotation_class in annotation_classes:
-            if annotation_class["name"] == row["className"]:
-                break
-        else:
-            annotation_classes.append(
+        annotation_class = _get_matching(classes, class_name)
+        if annotation_class is None:
+            annotation_class = (
                 {
-                    "name": row["className"],
-                    "color": row["classColor"],
+                    "name": class_name,
+                    "color": class_color,
                     "attribute_groups": []
-                }
+                }, {}
             )
-            annotation_class = annotation_classes[-1]
-        if row["attributeGroupName"] is None or row["attributeName"] is None:
+            annotation_classes.append(annotation_class[0])
+            classes[class_name] = annotation_class
+        if attribute_group_name is None or attribute_name is None:
             continue
-        for attribute_group in annotation_class["attribute_groups"]:
-            if attribute_group["name"] == row["attributeGroupName"]:
-                break
-        else:
-            annotation_class["attribute_groups"].append(
+        attribute_group = _get_matching(
+            annotation_class[1], attribute_group_name
+        )
+        if attribute_group is None:
+            attribute_group = (
                 {
-                    "name": row["attributeGroupName"],
+                    "name": attribute_group_name,
                     "attributes": []
-                }
+                }, {}
             )
-            attribute_group = annotation_class["attribute_groups"][-1]
-        for attribute in attribute_group["attributes"]:
-            if attribute["name"] == row["attributeName"]:
-                break
-        else:
-            attribute_group["attributes"].append({"name": row["attributeName"]})
+            annotation_class[0]["attribute_groups"].append(attribute_group[0])
+            annotation_class[1][attribute_group_name] = attribute_group
+        if _get_matching(attribute_group[1], attribute_name) is None:
+            attribute_group[0]["attributes"].append({"name": attribute_name})
+            attribute_group[1][attribute_name] = True
+    return annotation_classes
 
-    Path(output_dir / "classes").mkdir(exist_ok=True)
-    json.dump(
-        annotation_classes,
-        open(output_dir / "classes" / "classes.json", "w"),
-        indent=4
-    )
+
+def _get_matching(values, name):
+    # names are matched with ==, so NaN names don't match any
+    if name != name:
+        return None
+    return values.get(name)
 
 
 def aggregate_annotations_as_df(
@@ -122,16 +232,48 @@ def aggregate_annotations_as_df(
     include_classes_wo_annotations=False,
     include_comments=False,
     include_tags=False,
-    verbose=True
+    verbose=True,
+    processes=1,
+    columns=None,
+    categorical=False,
+    cache=False
 ):
     """Aggregate annotations as pandas dataframe from project root.
 
+    Annotation JSONs of large exports are read and flattened in a process pool.
+    For large projects memory use of the DataFrame can be reduced by building
+    only the needed columns (e.g., without "meta", "pointLabels" and user
+    metadata columns) and with categorical=True.
+
     :param project_root: export path of the project
     :type project_root: Pathlike (str or Path)
     :param include_classes_wo_annotations: enables inclusion of classes info that have no instances in annotations
     :type include_classes_wo_annotations: bool
     :param include_comments: enables inclusion of comments info as commentResolved column
     :type include_comments: bool
+    :param processes: number of worker processes that read annotation JSONs.
+                      1 (default) or 0 reads them in this process, if None
+                      the number of CPUs is used. Worker processes are
+                      started with multiprocessing, so on Windows and macOS
+                      the calling script should be guarded with
+                      if __name__ == "__main__":
+    :type processes: int
+    :param columns: columns of the DataFrame to build, in this order. If None
+                    all columns are built. Values of the other columns aren't
+                    computed
+    :type columns: list of strs
+    :param categorical: convert string columns with few distinct values
+                        ("imageName", "className", "attributeGroupName",
+                        "attributeName", "type", "classColor", user metadata
+                        etc.) to pandas categoricals. Missing values
+                        become NaN
+    :type categorical: bool
+    :param cache: keep the values read from annotation JSONs in a cache of
+                  the export root in ~/.superannotate/cache, so that next
+                  calls read only the JSONs added or changed since then.
+                  The cache is pickled and loaded as trusted data, so that
+                  directory shouldn't be writable by other users
+    :type cache: bool
 
     :return: DataFrame on annotations with columns: "imageName", "instanceId" className", "attributeGroupName", "attributeName", "type", "error", "locked", "visible", "trackingId", "probability", "pointLabels", "meta" (geometry information as string), "commentResolved", "classColor", "groupId"
     :rtype: pandas DataFrame
@@ -142,41 +284,258 @@ def aggregate_annotations_as_df(
             "Aggregating annotations from %s as pandas DataFrame", project_root
         )
 
-    annotation_data = {
-        "imageName": [],
-        "imageHeight": [],
-        "imageWidth": [],
-        "imageStatus": [],
-        "imagePinned": [],
-        "instanceId": [],
-        "className": [],
-        "attributeGroupName": [],
-        "attributeName": [],
-        "type": [],
-        "error": [],
-        "locked": [],
-        "visible": [],
-        "trackingId": [],
-        "probability": [],
-        "pointLabels": [],
-        "meta": [],
-        "classColor": [],
-        "groupId": [],
-        "createdAt": [],
-        "creatorRole": [],
-        "creationType": [],
-        "creatorEmail": [],
-        "updatedAt": [],
-        "updatorRole": [],
-        "updatorEmail": []
-    }
+    all_columns = _get_all_columns(include_comments, include_tags)
+    if columns is None:
+        columns = all_columns
+    else:
+        columns = list(columns)
+        unknown_columns = [
+            column for column in columns if column not in all_columns
+        ]
+        if unknown_columns:
+            raise SABaseException(
+                0, "Unknown annotation DataFrame columns " +
+                str(unknown_columns) + ". commentResolved and tag columns " +
+                "need include_comments and include_tags"
+            )
+    read_columns = list(columns)
+    if include_classes_wo_annotations:
+        for column in ["className", "attributeGroupName", "attributeName"]:
+            if column not in read_columns:
+                read_columns.append(column)
+
+    classes_path = Path(project_root) / "classes" / "classes.json"
+    classes_json, class_name_to_color, class_group_name_to_values = (
+        _read_classes_json(classes_path)
+    )
+
+    annotations_paths = []
+
+    for path in Path(project_root).glob('*.json'):
+        annotations_paths.append(path)
+
+    if not annotations_paths:
+        logger.warning(
+            "No annotations found in project export root %s", project_root
+        )
+    type_postfix = "___objects.json" if glob.glob(
+        "{}/*___objects.json".format(project_root)
+    ) else "___pixel.json"
+
+    read_chunk = functools.partial(
+        _read_annotations_chunk,
+        type_postfix=type_postfix,
+        class_name_to_color=class_name_to_color,
+        class_group_name_to_values=class_group_name_to_values,
+        include_comments=include_comments,
+        include_tags=include_tags
+    )
+    if processes is None:
+        processes = os.cpu_count() or 1
+    if cache:
+        cache_key = {
+            "include_comments": include_comments,
+            "include_tags": include_tags,
+            "type_postfix": type_postfix,
+            "classes": _cache.get_files_stats([classes_path])["classes.json"]
+        }
+        annotation_data = _read_annotations_cached(
+            project_root, annotations_paths, read_columns, read_chunk,
+            processes, cache_key, verbose
+        )
+    else:
+        annotation_data, _ = _read_annotations(
+            annotations_paths, read_columns, read_chunk, processes
+        )
+
+    def __append_annotation(annotation_dict):
+        for annotation_key in annotation_data:
+            if annotation_key in annotation_dict:
+                annotation_data[annotation_key].append(
+                    annotation_dict[annotation_key]
+                )
+            else:
+                annotation_data[annotation_key].append(None)
+
+    #Add classes/attributes w/o annotations
+    if include_classes_wo_annotations:
+        df = pd.DataFrame(
+            {
+                column: annotation_data[column]
+                for column in
+                ["className", "attributeGroupName", "attributeName"]
+            }
+        )
+        for annotation_dict in _get_classes_wo_annotations(classes_json, df):
+            __append_annotation(annotation_dict)
+
+    return _build_annotations_df(annotation_data, columns, categorical)
+
+
+def update_annotations_df(
+    df,
+    project_root,
+    added=None,
+    modified=None,
+    removed=None,
+    include_classes_wo_annotations=False,
+    include_comments=False,
+    include_tags=False,
+    verbose=True,
+    processes=1
+):
+    """Updates DataFrame of aggregate_annotations_as_df after some annotation
+    JSONs of the export root were added, modified or removed, e.g., after
+    partial re-download of the export. Only the given JSONs are read: rows of
+    modified and removed images are replaced in place and rows of added ones
+    are appended. Rows of classes without annotations are recomputed.
+
+    :param df: DataFrame returned by aggregate_annotations_as_df for the
+               export root. Its columns are kept
+    :type df: pandas DataFrame
+    :param project_root: export path of the project
+    :type project_root: Pathlike (str or Path)
+    :param added: annotation JSON paths or file names in project_root added
+                  since df was aggregated
+    :type added: list of Pathlikes (str or Path)
+    :param modified: annotation JSON paths or file names in project_root
+                     modified since df was aggregated
+    :type modified: list of Pathlikes (str or Path)
+    :param removed: annotation JSON paths or file names removed from
+                    project_root since df was aggregated
+    :type removed: list of Pathlikes (str or Path)
+    :param include_classes_wo_annotations: df was aggregated with
+                                           include_classes_wo_annotations
+    :type include_classes_wo_annotations: bool
+    :param include_comments: df was aggregated with include_comments
+    :type include_comments: bool
+    :param include_tags: df was aggregated with include_tags
+    :type include_tags: bool
+    :param processes: number of worker processes that read annotation JSONs,
+                      see aggregate_annotations_as_df
+    :type processes: int
+
+    :return: updated DataFrame
+    :rtype: pandas DataFrame
+    """
+    columns = list(df.columns)
+    all_columns = _get_all_columns(include_comments, include_tags)
+    unknown_columns = [
+        column for column in columns if column not in all_columns
+    ]
+    if unknown_columns:
+        raise SABaseException(
+            0, "Unknown annotation DataFrame columns " + str(unknown_columns) +
+            ". commentResolved and tag columns need include_comments and " +
+            "include_tags"
+        )
+    required_columns = ["imageName"]
+    if include_classes_wo_annotations:
+        required_columns += ["className", "attributeGroupName", "attributeName"]
+    missing_columns = [
+        column for column in required_columns if column not in columns
+    ]
+    if missing_columns:
+        raise SABaseException(
+            0, "Annotation DataFrame columns " + str(missing_columns) +
+            " are needed to update it"
+        )
+
+    project_root = Path(project_root)
+    added_paths = [project_root / Path(path).name for path in added or []]
+    modified_paths = [project_root / Path(path).name for path in modified or []]
+    removed_paths = [project_root / Path(path).name for path in removed or []]
+    read_paths = added_paths + modified_paths
+    if verbose:
+        logger.info(
+            "Updating annotations DataFrame of %s with %s added, %s modified "
+            "and %s removed annotation JSONs", project_root, len(added_paths),
+            len(modified_paths), len(removed_paths)
+        )
+    type_postfix = "___objects.json" if any(
+        path.name.endswith("___objects.json")
+        for path in read_paths + removed_paths
+    ) else "___pixel.json"
+    classes_json, class_name_to_color, class_group_name_to_values = (
+        _read_classes_json(project_root / "classes" / "classes.json")
+    )
+
+    read_chunk = functools.partial(
+        _read_annotations_chunk,
+        type_postfix=type_postfix,
+        class_name_to_color=class_name_to_color,
+        class_group_name_to_values=class_group_name_to_values,
+        include_comments=include_comments,
+        include_tags=include_tags
+    )
+    if processes is None:
+        processes = os.cpu_count() or 1
+    annotation_data, file_rows = _read_annotations(
+        read_paths, columns, read_chunk, processes
+    )
+    read_df = _build_annotations_df(annotation_data, columns, False)
+    read_images = {}
+    offset = 0
+    for path, rows in zip(read_paths, file_rows):
+        image_name = path.name.split(type_postfix)[0]
+        read_images[image_name] = read_df.iloc[offset:offset + rows]
+        offset += rows
+    removed_images = {
+        path.name.split(type_postfix)[0]
+        for path in removed_paths
+    } - set(read_images)
 
+    if include_classes_wo_annotations:
+        # rows of classes without annotations have no image name
+        df = df[df["imageName"].notna()]
+    # rows of an image are consecutive, so the rows of each run of changed
+    # images are replaced at once
+    changed = df["imageName"].isin(list(read_images) +
+                                   list(removed_images)).to_numpy()
+    run_starts = np.flatnonzero(np.diff(changed, prepend=False, append=False))
+    dfs = []
+    previous_stop = 0
+    for start, stop in zip(run_starts[::2], run_starts[1::2]):
+        dfs.append(df.iloc[previous_stop:start])
+        for image_name in df["imageName"].iloc[start:stop].unique():
+            if image_name in read_images:
+                dfs.append(read_images.pop(image_name))
+        previous_stop = stop
+    dfs.append(df.iloc[previous_stop:])
+    # images that weren't in df are added at the end in the order of JSONs
+    dfs += read_images.values()
+
+    if include_classes_wo_annotations:
+        updated_df = _concat_annotations_dfs(dfs, df.dtypes)
+        annotation_data = {column: [] for column in columns}
+        for annotation_dict in _get_classes_wo_annotations(
+            classes_json, updated_df
+        ):
+            for column in columns:
+                annotation_data[column].append(annotation_dict.get(column))
+        dfs = [
+            updated_df,
+            _build_annotations_df(annotation_data, columns, False)
+        ]
+    return _concat_annotations_dfs(dfs, df.dtypes)
+
+
+def _get_all_columns(include_comments, include_tags):
+    all_columns = list(_ANNOTATION_COLUMNS)
     if include_comments:
-        annotation_data["commentResolved"] = []
+        all_columns.append("commentResolved")
     if include_tags:
-        annotation_data["tag"] = []
+        all_columns.append("tag")
+    return all_columns
 
-    classes_path = Path(project_root) / "classes" / "classes.json"
+
+def _read_classes_json(classes_path):
+    """Reads classes.json of an export root.
+
+    :return: classes JSON, class name -> color and class name -> attribute
+             group name -> attribute names
+    :rtype: tuple
+    """
     if not classes_path.is_file():
         raise SABaseException(
             0, "SuperAnnotate classes file " + str(classes_path) +
@@ -195,8 +554,305 @@ def aggregate_annotations_as_df(
             for attribute in attribute_group["attributes"]:
                 class_group_name_to_values[name][attribute_group["name"]
                                                 ].append(attribute["name"])
+    return classes_json, class_name_to_color, class_group_name_to_values
+
+
+def _get_classes_wo_annotations(classes_json, df):
+    """Returns rows of aggregate_annotations_as_df for the classes and
+    attributes of classes_json that have no annotations in df.
+
+    :rtype: list of dicts
+    """
+    rows = []
+    for class_meta in classes_json:
+        annotation_class_name = class_meta["name"]
+        annotation_class_color = class_meta["color"]
+
+        if not annotation_class_name in df["className"].unique():
+            rows.append(
+                {
+                    "className": annotation_class_name,
+                    "classColor": annotation_class_color
+                }
+            )
+            continue
+
+        class_df = df[df["className"] == annotation_class_name][[
+            "className", "attributeGroupName", "attributeName"
+        ]]
+        attribute_groups = class_meta["attribute_groups"]
+
+        for attribute_group in attribute_groups:
+
+            attribute_group_name = attribute_group["name"]
+
+            attribute_group_df = class_df[
+                class_df["attributeGroupName"] == attribute_group_name][[
+                    "attributeGroupName", "attributeName"
+                ]]
+            attributes = attribute_group["attributes"]
+            for attribute in attributes:
+                attribute_name = attribute["name"]
+
+                if not attribute_name in attribute_group_df["attributeName"
+                                                           ].unique():
+                    rows.append(
+                        {
+                            "className": annotation_class_name,
+                            "classColor": annotation_class_color,
+                            "attributeGroupName": attribute_group_name,
+                            "attributeName": attribute_name,
+                        }
+                    )
+    return rows
+
+
+def _build_annotations_df(annotation_data, columns, categorical):
+    for column in ("createdAt", "updatedAt"):
+        if column in columns:
+            annotation_data[column] = _to_datetime(annotation_data[column])
+    df = pd.DataFrame({column: annotation_data[column] for column in columns})
+
+    if "probability" in columns:
+        df = df.astype({"probability": float})
+    if categorical:
+        df = df.astype(
+            {
+                column: "category"
+                for column in _CATEGORICAL_COLUMNS if column in columns
+            }
+        )
+
+    return df
+
+
+def _concat_annotations_dfs(dfs, dtypes):
+    """Concatenates parts of annotations DataFrame with dtypes as if it was
+    built at once, e.g., all missing values of a part don't change the dtype.
+
+    :rtype: pandas DataFrame
+    """
+    parts = []
+    for part in dfs:
+        missing_columns = {}
+        for column, dtype in dtypes.items():
+            if part[column].dtype == dtype or not part[column].isna().all():
+                continue
+            if dtype.kind in "iu":
+                # integers with missing values become floats
+                dtype = float
+            elif dtype.kind == "b":
+                continue
+            missing_columns[column] = pd.Series(
+                None, index=part.index, dtype=dtype
+            )
+        parts.append(part.assign(**missing_columns))
+    df = pd.concat(parts, ignore_index=True)
+    for column, dtype in dtypes.items():
+        if not isinstance(dtype, pd.CategoricalDtype):
+            continue
+        if isinstance(df[column].dtype, pd.CategoricalDtype):
+            df[column] = df[column].cat.remove_unused_categories()
+        else:
+            df[column] = df[column].astype("category")
+    return df
+
+
+def _read_annotations(annotations_paths, columns, read_chunk, processes):
+    """Reads annotation JSONs with read_chunk in a process pool.
+
+    :return: column name -> list of values and number of rows of each JSON
+    :rtype: tuple
+    """
+    chunks = [
+        annotations_paths[i:i + _AGGREGATE_CHUNK_SIZE]
+        for i in range(0, len(annotations_paths), _AGGREGATE_CHUNK_SIZE)
+    ]
+    read_chunk = functools.partial(read_chunk, columns=columns)
+    if processes > 1 and len(chunks) > 1:
+        with concurrent.futures.ProcessPoolExecutor(
+            min(processes, len(chunks))
+        ) as pool:
+            # chunks are returned in order, so rows keep the order of files
+            chunk_results = list(pool.map(read_chunk, chunks))
+    else:
+        chunk_results = [read_chunk(chunk) for chunk in chunks]
+
+    annotation_data = {column: [] for column in columns}
+    file_rows = []
+    for chunk_data, chunk_file_rows in chunk_results:
+        for column in columns:
+            annotation_data[column] += chunk_data[column]
+        file_rows += chunk_file_rows
+    return annotation_data, file_rows
+
+
+def _read_annotations_cached(
+    project_root, annotations_paths, columns, read_chunk, processes, key,
+    verbose
+):
+    """Reads annotation JSONs as _read_annotations, but takes the values of
+    the JSONs that haven't changed since the previous call from the cache of
+    the export root and updates the cache.
+
+    :rtype: dict
+    """
+    files_stats = _cache.get_files_stats(annotations_paths)
+    metadata = _cache.load_metadata(project_root, key)
+    cache_columns = columns
+    cached_files = {}
+    if metadata is not None and all(
+        column in metadata["columns"] for column in columns
+    ):
+        # changed JSONs are read with all the columns of the cache, so that
+        # none of them are dropped from the updated cache
+        cache_columns = metadata["columns"]
+        offset = 0
+        for name, mtime, size, rows in metadata["files"]:
+            cached_files[name] = ([mtime, size], offset, offset + rows)
+            offset += rows
+    paths_to_read = [
+        path for path in annotations_paths if path.name not in cached_files or
+        cached_files[path.name][0] != files_stats[path.name]
+    ]
+    cached_data = {}
+    if cached_files and not paths_to_read and [
+        path.name for path in annotations_paths
+    ] == [file[0] for file in metadata["files"]]:
+        cached_data = _cache.load(project_root, metadata, columns)
+        if cached_data is not None:
+            if verbose:
+                logger.info("Loaded annotations from cache")
+            return cached_data
+    elif len(paths_to_read) < len(annotations_paths):
+        cached_data = _cache.load(project_root, metadata, cache_columns)
+    if cached_data is None:
+        cache_columns = columns
+        cached_files = {}
+        paths_to_read = annotations_paths
+    if verbose and cached_files:
+        logger.info(
+            "Reading %s of %s annotation JSONs, the others are loaded from "
+            "cache", len(paths_to_read), len(annotations_paths)
+        )
+
+    read_data, read_file_rows = _read_annotations(
+        paths_to_read, cache_columns, read_chunk, processes
+    )
+    read_files = {}
+    offset = 0
+    for path, rows in zip(paths_to_read, read_file_rows):
+        read_files[path.name] = (offset, offset + rows)
+        offset += rows
+
+    # rows are copied in runs of consecutive JSONs with rows from the same
+    # source
+    files = []
+    runs = []
+    for path in annotations_paths:
+        if path.name in read_files:
+            source = read_data
+            start, stop = read_files[path.name]
+        else:
+            source = cached_data
+            _, start, stop = cached_files[path.name]
+        files.append([path.name] + files_stats[path.name] + [stop - start])
+        if runs and runs[-1][0] is source and runs[-1][2] == start:
+            runs[-1][2] = stop
+        else:
+            runs.append([source, start, stop])
+    annotation_data = {column: [] for column in cache_columns}
+    for source, start, stop in runs:
+        for column in cache_columns:
+            annotation_data[column] += source[column][start:stop]
+    _cache.save(project_root, key, files, annotation_data)
+    return {column: annotation_data[column] for column in columns}
+
+
+def _to_datetime(values):
+    """Converts createdAt or updatedAt values collected by
+    _read_annotations_chunk to the same values as pd.to_datetime of each of
+    them, parsing the timestamp strings together when they have one format.
+
+    :rtype: list
+    """
+    converted = list(values)
+    positions = [i for i, value in enumerate(values) if isinstance(value, str)]
+    strings = pd.Series([values[i] for i in positions], dtype=object)
+    timestamps = None
+    if positions:
+        try:
+            timestamps = pd.to_datetime(strings).tolist()
+        except (ValueError, TypeError, OverflowError):
+            pass
+    if timestamps:
+        # parsed together the timestamps could get other resolution than
+        # parsed one by one
+        first = pd.to_datetime(strings[0])
+        if timestamps[0] != first or getattr(timestamps[0], "unit", None
+                                            ) != getattr(first, "unit", None):
+            timestamps = None
+    if timestamps is None:
+        timestamps = [pd.to_datetime(string) for string in strings]
+    for i, timestamp in zip(positions, timestamps):
+        converted[i] = timestamp
+    for i, value in enumerate(values):
+        if value is not None and value is not pd.NaT and not isinstance(
+            value, str
+        ):
+            converted[i] = pd.to_datetime(value)
+    return converted
+
+
+def _get_annotation_meta(annotation_type, annotation):
+    annotation_meta = None
+    if annotation_type in ["bbox", "polygon", "polyline", "cuboid"]:
+        annotation_meta = {"points": annotation["points"]}
+    elif annotation_type == "point":
+        annotation_meta = {"x": annotation["x"], "y": annotation["y"]}
+    elif annotation_type == "ellipse":
+        annotation_meta = {
+            "cx": annotation["cx"],
+            "cy": annotation["cy"],
+            "rx": annotation["rx"],
+            "ry": annotation["ry"],
+            "angle": annotation["angle"]
+        }
+    elif annotation_type == "mask":
+        annotation_meta = {"parts": annotation["parts"]}
+    elif annotation_type == "template":
+        annotation_meta = {
+            "connections": annotation["connections"],
+            "points": annotation["points"]
+        }
+    return annotation_meta
+
+
+def _read_annotations_chunk(
+    annotations_paths, columns, type_postfix, class_name_to_color,
+    class_group_name_to_values, include_comments, include_tags
+):
+    """Reads annotation JSONs and flattens them to the columns of
+    aggregate_annotations_as_df, with createdAt and updatedAt not converted
+    to datetimes yet. Runs in the worker processes of
+    aggregate_annotations_as_df.
+
+    :return: column name -> list of values and number of rows of each JSON
+    :rtype: tuple
+    """
+    annotation_data = {column: [] for column in columns}
+    file_rows = []
+    rows = 0
+    no_timestamp = pd.to_datetime(None)
+    # values of the columns that aren't read aren't computed
+    need_meta = "meta" in annotation_data
+    need_user_metadata = any(
+        column in annotation_data for column in _USER_METADATA_COLUMNS
+    )
 
     def __append_annotation(annotation_dict):
+        nonlocal rows
+        rows += 1
         for annotation_key in annotation_data:
             if annotation_key in annotation_dict:
                 annotation_data[annotation_key].append(
@@ -217,7 +873,13 @@ def aggregate_annotations_as_df(
         return image_metadata
 
     def __get_user_metadata(annotation):
-        annotation_created_at = pd.to_datetime(annotation.get("createdAt"))
+        if not need_user_metadata:
+            return {}
+        # timestamps are converted with _to_datetime of all annotations,
+        # missing ones are already converted
+        annotation_created_at = annotation.get("createdAt")
+        if annotation_created_at is None:
+            annotation_created_at = no_timestamp
         annotation_created_by = annotation.get("createdBy")
         annotation_creator_email = None
         annotation_creator_role = None
@@ -225,14 +887,16 @@ def aggregate_annotations_as_df(
             annotation_creator_email = annotation_created_by.get("email")
             annotation_creator_role = annotation_created_by.get("role")
         annotation_creation_type = annotation.get("creationType")
-        annotation_updated_at = pd.to_datetime(annotation.get("updatedAt"))
+        annotation_updated_at = annotation.get("updatedAt")
+        if annotation_updated_at is None:
+            annotation_updated_at = no_timestamp
         annotation_updated_by = annotation.get("updatedBy")
         annotation_updator_email = None
         annotation_updator_role = None
         if annotation_updated_by:
             annotation_updator_email = annotation_updated_by.get("email")
             annotation_updator_role = annotation_updated_by.get("role")
-        user_metadata = {                   
+        user_metadata = {
             "createdAt": annotation_created_at,
             "creatorRole": annotation_creator_role,
             "creatorEmail": annotation_creator_email,
@@ -242,19 +906,10 @@ def aggregate_annotations_as_df(
             "updatorEmail": annotation_updator_email
         }
         return user_metadata
-    
-    annotations_paths = []
-    
-    for path in Path(project_root).glob('*.json'):
-        annotations_paths.append(path)
 
-    if not annotations_paths:
-        logger.warning(
-            "No annotations found in project export root %s", project_root
-        )
-    type_postfix = "___objects.json" if glob.glob("{}/*___objects.json".format(project_root)) else "___pixel.json"
     for annotation_path in annotations_paths:
-        annotation_json = json.load(open(annotation_path))
+        with open(annotation_path) as f:
+            annotation_json = json.load(f)
         image_name = annotation_path.name.split(type_postfix)[0]
         image_metadata = __get_image_metadata(image_name, annotation_json)
         annotation_instance_id = 0
@@ -265,11 +920,13 @@ def aggregate_annotations_as_df(
             if annotation_type == "comment":
                 if include_comments:
                     comment_resolved = annotation["resolved"]
-                    comment_meta = {
-                        "x": annotation["x"],
-                        "y": annotation["y"],
-                        "comments": annotation["comments"]
-                    }
+                    comment_meta = None
+                    if need_meta:
+                        comment_meta = {
+                            "x": annotation["x"],
+                            "y": annotation["y"],
+                            "comments": annotation["comments"]
+                        }
                     annotation_dict = {
                         "type": annotation_type,
                         "meta": comment_meta,
@@ -304,25 +961,10 @@ def aggregate_annotations_as_df(
             annotation_visible = annotation.get("visible")
             annotation_tracking_id = annotation.get("trackingId")
             annotation_meta = None
-            if annotation_type in ["bbox", "polygon", "polyline", "cuboid"]:
-                annotation_meta = {"points": annotation["points"]}
-            elif annotation_type == "point":
-                annotation_meta = {"x": annotation["x"], "y": annotation["y"]}
-            elif annotation_type == "ellipse":
-                annotation_meta = {
-                    "cx": annotation["cx"],
-                    "cy": annotation["cy"],
-                    "rx": annotation["rx"],
-                    "ry": annotation["ry"],
-                    "angle": annotation["angle"]
-                }
-            elif annotation_type == "mask":
-                annotation_meta = {"parts": annotation["parts"]}
-            elif annotation_type == "template":
-                annotation_meta = {
-                    "connections": annotation["connections"],
-                    "points": annotation["points"]
-                }
+            if need_meta:
+                annotation_meta = _get_annotation_meta(
+                    annotation_type, annotation
+                )
             annotation_error = annotation.get('error')
             annotation_probability = annotation.get("probability")
             annotation_point_labels = annotation.get("pointLabels")
@@ -385,54 +1027,7 @@ def aggregate_annotations_as_df(
                     annotation_dict.update(user_metadata)
                     annotation_dict.update(image_metadata)
                     __append_annotation(annotation_dict)
+        file_rows.append(rows)
+        rows = 0
 
-    df = pd.DataFrame(annotation_data)
-
-    #Add classes/attributes w/o annotations
-    if include_classes_wo_annotations:
-        for class_meta in classes_json:
-            annotation_class_name = class_meta["name"]
-            annotation_class_color = class_meta["color"]
-
-            if not annotation_class_name in df["className"].unique():
-                __append_annotation(
-                    {
-                        "className": annotation_class_name,
-                        "classColor": annotation_class_color
-                    }
-                )
-                continue
-
-            class_df = df[df["className"] == annotation_class_name][[
-                "className", "attributeGroupName", "attributeName"
-            ]]
-            attribute_groups = class_meta["attribute_groups"]
-
-            for attribute_group in attribute_groups:
-
-                attribute_group_name = attribute_group["name"]
-
-                attribute_group_df = class_df[
-                    class_df["attributeGroupName"] == attribute_group_name][[
-                        "attributeGroupName", "attributeName"
-                    ]]
-                attributes = attribute_group["attributes"]
-                for attribute in attributes:
-                    attribute_name = attribute["name"]
-
-                    if not attribute_name in attribute_group_df["attributeName"
-                                                               ].unique():
-                        __append_annotation(
-                            {
-                                "className": annotation_class_name,
-                                "classColor": annotation_class_color,
-                                "attributeGroupName": attribute_group_name,
-                                "attributeName": attribute_name,
-                            }
-                        )
-
-        df = pd.DataFrame(annotation_data)
-
-    df = df.astype({"probability": float})
-
-    return df
+    return annotation_data, file_rows
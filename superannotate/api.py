@@ -1,6 +1,7 @@
 import os
 import json
 import logging
+import threading
 from pathlib import Path
 
 import requests
@@ -13,6 +14,17 @@ from .version import __version__
 logger = logging.getLogger("superannotate-python-sdk")
 
 
+class _StorageSession(requests.Session):
+    """requests.Session that applies default timeout to every request"""
+    def __init__(self, timeout):
+        super().__init__()
+        self.timeout = timeout
+
+    def request(self, method, url, **kwargs):  # pylint: disable=arguments-differ
+        kwargs.setdefault("timeout", self.timeout)
+        return super().request(method, url, **kwargs)
+
+
 class API:
     __instance = None
 
@@ -24,6 +36,11 @@ class API:
         self._default_headers = None
         self._main_endpoint = None
         self.team_id = None
+        self._storage_session = None
+        self._storage_session_lock = threading.Lock()
+        self._storage_pool_size = 16
+        self._storage_timeout = (10, 300)
+        self._storage_max_retries = 5
         if API.__instance is not None:
             raise SABaseException(0, "API class is a singleton!")
         API.__instance = self
@@ -108,6 +125,25 @@ class API:
             API()
         return API.__instance
 
+    def get_connection_settings(self):
+        """Returns settings of SuperAnnotate platform and data storage
+        connections, set with init and configure_storage_session, for other
+        HTTP clients of the SDK.
+
+        :return: dict with authenticated, main_endpoint, headers, verify,
+                 storage_timeout and storage_max_retries keys
+        :rtype: dict
+        """
+        with self._storage_session_lock:
+            return {
+                "authenticated": self._authenticated,
+                "main_endpoint": self._main_endpoint,
+                "headers": dict(self._default_headers or {}),
+                "verify": self._verify,
+                "storage_timeout": self._storage_timeout,
+                "storage_max_retries": self._storage_max_retries
+            }
+
     def send_request(self, req_type, path, params=None, json_req=None):
         if not self._authenticated:
             raise SABaseException(
@@ -150,6 +186,53 @@ class API:
 
         return session
 
+    def get_storage_session(self):
+        """Returns pooled and retrying session for requests to presigned
+        data storage URLs. Session doesn't carry SuperAnnotate authorization
+        headers.
+        """
+        with self._storage_session_lock:
+            if self._storage_session is None:
+                self._storage_session = self._create_storage_session()
+            return self._storage_session
+
+    def configure_storage_session(
+        self, pool_size=None, timeout=None, max_retries=None
+    ):
+        with self._storage_session_lock:
+            if pool_size is not None:
+                self._storage_pool_size = pool_size
+            if timeout is not None:
+                self._storage_timeout = timeout
+            if max_retries is not None:
+                self._storage_max_retries = max_retries
+            if self._storage_session is not None:
+                self._storage_session.close()
+                self._storage_session = None
+
+    def _create_storage_session(self):
+        session = _StorageSession(self._storage_timeout)
+        retry = urllib3.Retry(
+            total=self._storage_max_retries,
+            read=self._storage_max_retries,
+            connect=self._storage_max_retries,
+            backoff_factor=0.5,
+            status_forcelist=(429, 500, 502, 503, 504),
+            raise_on_status=False
+        )
+        adapter = requests.adapters.HTTPAdapter(
+            max_retries=retry,
+            pool_maxsize=self._storage_pool_size,
+            pool_connections=self._storage_pool_size
+        )
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+
+        if "SUPERANNOTATE_DEBUG" in os.environ:
+            session.hooks['response'].append(_log_requests)
+
+        return session
+
 
 if "SUPERANNOTATE_DEBUG" in os.environ:
     from requests_toolbelt.utils import dump
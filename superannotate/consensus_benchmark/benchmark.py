@@ -19,7 +19,8 @@ def benchmark(
     export_root=None,
     image_list=None,
     annot_type='bbox',
-    show_plots=False
+    show_plots=False,
+    cache=False
 ):
     """Computes benchmark score for each instance of given images that are present both gt_project_name project and projects in project_names list:    
     
@@ -35,6 +36,10 @@ def benchmark(
     :type annot_type: str
     :param show_plots: If True, show plots based on results of consensus computation. Default: False
     :type show_plots: bool
+    :param cache: keep the annotations read from the export roots of
+                  export_root in their pickled caches in
+                  ~/.superannotate/cache, see aggregate_annotations_as_df
+    :type cache: bool
 
     """
     def aggregate_attributes(instance_df):
@@ -77,7 +82,7 @@ def benchmark(
             gt_project_df = aggregate_annotations_as_df(export_dir)
     else:
         export_dir = Path(export_root) / gt_project_name
-        gt_project_df = aggregate_annotations_as_df(export_dir)
+        gt_project_df = aggregate_annotations_as_df(export_dir, cache=cache)
     gt_project_df["project"] = gt_project_name
 
     benchmark_dfs = []
@@ -89,7 +94,7 @@ def benchmark(
                 project_df = aggregate_annotations_as_df(export_dir)
         else:
             export_dir = Path(export_root) / project_name
-            project_df = aggregate_annotations_as_df(export_dir)
+            project_df = aggregate_annotations_as_df(export_dir, cache=cache)
 
         project_df["project"] = project_name
         project_gt_df = pd.concat([project_df, gt_project_df])
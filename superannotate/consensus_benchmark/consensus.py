@@ -18,7 +18,8 @@ def consensus(
     export_root=None,
     image_list=None,
     annot_type='bbox',
-    show_plots=False
+    show_plots=False,
+    cache=False
 ):
     """Computes consensus score for each instance of given images that are present in at least 2 of the given projects:    
     
@@ -32,6 +33,10 @@ def consensus(
     :type annot_type: str
     :param show_plots: If True, show plots based on results of consensus computation. Default: False
     :type show_plots: bool
+    :param cache: keep the annotations read from the export roots of
+                  export_root in their pickled caches in
+                  ~/.superannotate/cache, see aggregate_annotations_as_df
+    :type cache: bool
 
     """
     supported_types = ['polygon', 'bbox', 'point']
@@ -47,7 +52,7 @@ def consensus(
                 project_df = aggregate_annotations_as_df(export_dir)
         else:
             export_dir = Path(export_root) / project_name
-            project_df = aggregate_annotations_as_df(export_dir)
+            project_df = aggregate_annotations_as_df(export_dir, cache=cache)
         project_df["project"] = project_name
         project_dfs.append(project_df)
 
@@ -1,16 +1,18 @@
+import copy
 import io
 import json
 import logging
 from pathlib import Path
 
-import boto3
-
 from ..api import API
 from ..exceptions import (
     SABaseException, SAExistingAnnotationClassNameException,
     SANonExistingAnnotationClassNameException
 )
+from . import cache as _cache
+from .executor import get_all_pages
 from .project import get_project_metadata
+from .s3_clients import get_s3_client
 
 logger = logging.getLogger("superannotate-python-sdk")
 
@@ -74,6 +76,7 @@ def create_annotation_class(project, name, color, attribute_groups=None):
         raise SABaseException(
             response.status_code, "Couldn't create class " + response.text
         )
+    _invalidate_project_classes(project)
     res = response.json()
     new_class = res[0]
     return new_class
@@ -111,6 +114,7 @@ def delete_annotation_class(project, annotation_class):
             response.status_code,
             "Couldn't delete annotation class " + response.text
         )
+    _invalidate_project_classes(project)
 
 
 def create_annotation_classes_from_classes_json(
@@ -140,11 +144,8 @@ def create_annotation_classes_from_classes_json(
         if from_s3_bucket is None:
             classes = json.load(open(classes_json))
         else:
-            from_session = boto3.Session()
-            from_s3 = from_session.resource('s3')
             file = io.BytesIO()
-            from_s3_object = from_s3.Object(from_s3_bucket, classes_json)
-            from_s3_object.download_fileobj(file)
+            get_s3_client().download_fileobj(from_s3_bucket, classes_json, file)
             file.seek(0)
             classes = json.load(file)
     else:
@@ -187,6 +188,7 @@ def create_annotation_classes_from_classes_json(
         response = _api.send_request(
             req_type='POST', path='/classes', params=params, json_req=data
         )
+        _invalidate_project_classes(project)
         if not response.ok:
             raise SABaseException(
                 response.status_code, "Couldn't create classes " + response.text
@@ -211,32 +213,65 @@ def search_annotation_classes(project, name_prefix=None, return_metadata=False):
     """
     if not isinstance(project, dict):
         project = get_project_metadata(project)
-    result_list = []
+    if name_prefix is None:
+        result_list = copy.deepcopy(_get_project_classes(project))
+    else:
+        result_list = _search_annotation_classes(project, name_prefix)
+
+    if return_metadata:
+        return result_list
+    else:
+        return [x["name"] for x in result_list]
+
+
+def _search_annotation_classes(project, name_prefix=None):
     team_id, project_id = project["team_id"], project["id"]
     params = {'team_id': team_id, 'project_id': project_id, 'offset': 0}
     if name_prefix is not None:
         params['name'] = name_prefix
-    while True:
-        response = _api.send_request(
-            req_type='GET', path='/classes', params=params
+    return get_all_pages('/classes', params, "Couldn't search classes ")
+
+
+def _get_project_classes(project):
+    """Returns all annotation classes of the project from the metadata cache,
+    fetching them if needed. Returned list should not be modified.
+    """
+    key = ("classes", project["team_id"], project["id"])
+    annotation_classes = _cache.get(key)
+    if annotation_classes is None:
+        annotation_classes = _search_annotation_classes(project)
+        _cache.put(key, annotation_classes)
+    return annotation_classes
+
+
+def _get_project_classes_id_to_name(project):
+    key = ("classes_id_to_name", project["team_id"], project["id"])
+    annotation_classes_dict = _cache.get(key)
+    if annotation_classes_dict is None:
+        annotation_classes_dict = get_annotation_classes_id_to_name(
+            _get_project_classes(project)
         )
-        if not response.ok:
-            raise SABaseException(
-                response.status_code, "Couldn't search classes " + response.text
-            )
-        res = response.json()
-        result_list += res["data"]
-        new_len = len(result_list)
-        # for r in result_list:
-        #     print(r)
-        if res["count"] <= new_len:
-            break
-        params["offset"] = new_len
+        _cache.put(key, annotation_classes_dict)
+    return annotation_classes_dict
 
-    if return_metadata:
-        return result_list
-    else:
-        return [x["name"] for x in result_list]
+
+def _get_project_classes_name_to_id(project):
+    key = ("classes_name_to_id", project["team_id"], project["id"])
+    annotation_classes_dict = _cache.get(key)
+    if annotation_classes_dict is None:
+        annotation_classes_dict = get_annotation_classes_name_to_id(
+            _get_project_classes(project)
+        )
+        _cache.put(key, annotation_classes_dict)
+    return annotation_classes_dict
+
+
+def _invalidate_project_classes(project):
+    _cache.invalidate(
+        project["team_id"],
+        project["id"],
+        kinds=("classes", "classes_id_to_name", "classes_name_to_id")
+    )
 
 
 def get_annotation_class_metadata(project, annotation_class_name):
@@ -250,13 +285,12 @@ def get_annotation_class_metadata(project, annotation_class_name):
     :return: metadata of annotation class
     :rtype: dict
     """
-    annotation_classes = search_annotation_classes(
-        project, annotation_class_name, return_metadata=True
-    )
+    if not isinstance(project, dict):
+        project = get_project_metadata(project)
     results = []
-    for annotation_class in annotation_classes:
+    for annotation_class in _get_project_classes(project):
         if annotation_class["name"] == annotation_class_name:
-            results.append(annotation_class)
+            results.append(copy.deepcopy(annotation_class))
 
     if len(results) > 1:
         raise SAExistingAnnotationClassNameException(
@@ -0,0 +1,109 @@
+import logging
+import threading
+import time
+from collections import OrderedDict
+
+logger = logging.getLogger("superannotate-python-sdk")
+
+_enabled = True
+_max_size = 1024
+_ttl = 300  # seconds
+_entries = OrderedDict()
+_lock = threading.Lock()
+
+
+def is_enabled():
+    return _enabled
+
+
+def get_ttl():
+    return _ttl
+
+
+def get(key):
+    """Returns cached value of the key or None if it is missing or expired.
+    Keys are tuples of (kind, team_id, project_id, ...).
+    """
+    if not _enabled:
+        return None
+    with _lock:
+        entry = _entries.get(key)
+        if entry is None:
+            return None
+        value, created = entry
+        if time.monotonic() - created >= _ttl:
+            del _entries[key]
+            return None
+        _entries.move_to_end(key)
+        return value
+
+
+def put(key, value):
+    if not _enabled:
+        return
+    with _lock:
+        _entries[key] = (value, time.monotonic())
+        _entries.move_to_end(key)
+        while len(_entries) > _max_size:
+            _entries.popitem(last=False)
+
+
+def invalidate(team_id, project_id, kinds=None):
+    """Drops cached entries of the project. If kinds is not None only entries
+    of these kinds are dropped.
+    """
+    with _lock:
+        for key in list(_entries):
+            kind = key[0]
+            if kinds is not None and kind not in kinds:
+                continue
+            if key[1:3] == (team_id, project_id):
+                del _entries[key]
+            elif kind == "project_name" and key[1] == team_id:
+                # project name entries hold the project ID
+                if _entries[key][0] == project_id:
+                    del _entries[key]
+
+
+def clear():
+    with _lock:
+        _entries.clear()
+
+
+def clear_metadata_cache():
+    """Clears locally cached project metadata, project root folder IDs,
+    annotation classes and image indexes. Use it when projects were changed
+    outside of this SDK session.
+    """
+    from .images import invalidate_images_index
+    clear()
+    invalidate_images_index()
+
+
+def configure_metadata_cache(enabled=None, max_size=None, ttl=None):
+    """Configures local caching of project metadata, project root folder IDs,
+    annotation classes and image name -> metadata indexes, which are
+    otherwise re-fetched from the platform in every SDK call. The settings
+    apply to all of them, except max_size that applies to the entries other
+    than image indexes (one index is kept per project).
+
+    :param enabled: enables or disables the caching. Disabling also clears the cache
+    :type enabled: bool
+    :param max_size: maximum number of cached entries, least recently used
+                     entries are dropped first
+    :type max_size: int
+    :param ttl: time in seconds after which cached entries expire
+    :type ttl: float
+    """
+    global _enabled, _max_size, _ttl
+    if max_size is not None:
+        _max_size = max_size
+    if ttl is not None:
+        _ttl = ttl
+    if enabled is not None:
+        _enabled = enabled
+        if not enabled:
+            clear_metadata_cache()
+    with _lock:
+        while len(_entries) > _max_size:
+            _entries.popitem(last=False)
@@ -0,0 +1,296 @@
+import collections
+import concurrent.futures
+import contextlib
+import logging
+import queue
+import threading
+
+from tqdm import tqdm
+
+from ..api import API
+from ..exceptions import SABaseException
+
+logger = logging.getLogger("superannotate-python-sdk")
+_api = API.get_instance()
+
+_max_workers = 10
+# connection pool size of the SuperAnnotate platform session
+_MAX_CONCURRENT_PAGE_REQUESTS = 16
+
+
+def get_max_workers():
+    return _max_workers
+
+
+def set_max_workers(max_workers):
+    """Sets the number of worker threads used by bulk upload and download
+    functions (e.g., upload_images_to_project, upload_annotations_from_folder_to_project,
+    download_export). Connection pool of the data storage HTTP session is
+    resized to the same number. Listings (e.g., search_images) request
+    their pages with up to the same number of concurrent requests, but not
+    more than 16.
+
+    :param max_workers: number of worker threads
+    :type max_workers: int
+    """
+    global _max_workers
+    if not isinstance(max_workers, int) or max_workers < 1:
+        raise SABaseException(0, "max_workers should be a positive integer")
+    _max_workers = max_workers
+    _api.configure_storage_session(pool_size=max_workers)
+    from .s3_clients import clear_s3_clients
+    clear_s3_clients()
+
+
+class BulkResult:
+    """Result of a bulk operation run by :py:func:`run_bulk`. Items are kept
+    in their input order.
+
+    :ivar succeeded: items processed successfully
+    :ivar results: return values for the succeeded items
+    :ivar failed: (item, exception) tuples of the items that failed
+    :ivar cancelled: items that weren't processed because of cancellation
+    """
+    def __init__(self, succeeded, results, failed, cancelled):
+        self.succeeded = succeeded
+        self.results = results
+        self.failed = failed
+        self.cancelled = cancelled
+
+    def __repr__(self):
+        return (
+            f"BulkResult(succeeded={len(self.succeeded)}, "
+            f"failed={len(self.failed)}, cancelled={len(self.cancelled)})"
+        )
+
+
+@contextlib.contextmanager
+def _borrowed_pool(pool):
+    # pools given by the caller aren't shut down after use
+    yield pool
+
+
+def iter_bulk(func, items, max_workers=None, cancel_event=None, pool=None):
+    """Calls func on every item in a shared pool of worker threads. Each idle
+    worker takes the next item, so a slow item doesn't hold up the others.
+    At most 2 * max_workers items are pending at once, so items can be
+    a lazily produced iterator.
+
+    Yields (index, item, result, exception) tuples in completion order.
+    When cancel_event is set no new items are started; the remaining items
+    are yielded with concurrent.futures.CancelledError as exception.
+    If pool is given (e.g., a ProcessPoolExecutor) items are submitted to it
+    instead of a new thread pool, max_workers should then be its size.
+    """
+    if max_workers is None:
+        max_workers = _max_workers
+    max_pending = 2 * max_workers
+    items_iter = enumerate(items)
+    if pool is None:
+        pool_context = concurrent.futures.ThreadPoolExecutor(max_workers)
+    else:
+        pool_context = _borrowed_pool(pool)
+    with pool_context as pool:
+        pending = {}
+        try:
+            while True:
+                for index, item in items_iter:
+                    if cancel_event is not None and cancel_event.is_set():
+                        yield index, item, None, concurrent.futures.CancelledError(
+                        )
+                        continue
+                    pending[pool.submit(func, item)] = (index, item)
+                    if len(pending) >= max_pending:
+                        break
+                if not pending:
+                    break
+                done, _ = concurrent.futures.wait(
+                    pending, return_when=concurrent.futures.FIRST_COMPLETED
+                )
+                for future in done:
+                    index, item = pending.pop(future)
+                    try:
+                        result = future.result()
+                    except Exception as e:  # pylint: disable=broad-except
+                        yield index, item, None, e
+                    else:
+                        yield index, item, result, None
+        finally:
+            for future in pending:
+                future.cancel()
+
+
+def run_bulk(
+    func,
+    items,
+    max_workers=None,
+    cancel_event=None,
+    total=None,
+    show_progress=True
+):
+    """Runs func on all items with :py:func:`iter_bulk`, showing progress bar.
+    KeyboardInterrupt cancels the items that haven't started yet.
+
+    :return: result of the bulk operation
+    :rtype: BulkResult
+    """
+    if total is None and hasattr(items, "__len__"):
+        total = len(items)
+    if cancel_event is None:
+        cancel_event = threading.Event()
+    succeeded, failed, cancelled = [], [], []
+    with tqdm(total=total, disable=not show_progress) as pbar:
+        bulk = iter_bulk(func, items, max_workers, cancel_event)
+        try:
+            for index, item, result, exception in bulk:
+                if exception is None:
+                    succeeded.append((index, item, result))
+                elif isinstance(exception, concurrent.futures.CancelledError):
+                    cancelled.append((index, item))
+                else:
+                    failed.append((index, item, exception))
+                pbar.update(1)
+        except KeyboardInterrupt:
+            cancel_event.set()
+            bulk.close()
+            raise
+    succeeded.sort(key=lambda x: x[0])
+    failed.sort(key=lambda x: x[0])
+    cancelled.sort(key=lambda x: x[0])
+    return BulkResult(
+        [x[1] for x in succeeded], [x[2] for x in succeeded],
+        [(x[1], x[2]) for x in failed], [x[1] for x in cancelled]
+    )
+
+
+def iter_in_background(items, max_queued):
+    """Iterates items in a background thread that puts them to a queue of at
+    most max_queued items, so that producing the items (e.g., decoding)
+    overlaps with their consumption while memory use stays bounded.
+    Exception raised by items is re-raised to the consumer. Closing the
+    returned generator stops the background thread.
+    """
+    items_queue = queue.Queue(max_queued)
+    stop_event = threading.Event()
+    end = object()
+
+    def _put(item):
+        while not stop_event.is_set():
+            try:
+                items_queue.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def _produce():
+        try:
+            for item in items:
+                if not _put((item, None)):
+                    return
+        except Exception as e:  # pylint: disable=broad-except
+            _put((end, e))
+        else:
+            _put((end, None))
+        finally:
+            if hasattr(items, "close"):
+                items.close()
+
+    thread = threading.Thread(target=_produce, daemon=True)
+    thread.start()
+    try:
+        while True:
+            item, exception = items_queue.get()
+            if item is end:
+                if exception is not None:
+                    raise exception
+                return
+            yield item
+    finally:
+        stop_event.set()
+        thread.join()
+
+
+def iter_pages(path, params, error_message, max_workers=None):
+    """Yields pages (lists of items) of an offset paginated listing of the
+    SuperAnnotate platform in order. The first response gives the total count
+    and the page size, so the remaining pages are requested concurrently,
+    at most max_workers at once. If a page is shorter than the first one,
+    e.g., items were removed meanwhile, or the listing has grown meanwhile,
+    its remaining items are requested after that sequentially from the end
+    of the last received page.
+
+    :param path: listing path, e.g., /images
+    :type path: str
+    :param params: request parameters
+    :type params: dict
+    :param error_message: message of SABaseException raised on failed request
+    :type error_message: str
+    :param max_workers: number of concurrent page requests. If None
+                        min(max_workers set with :py:func:`set_max_workers`,
+                        _MAX_CONCURRENT_PAGE_REQUESTS) is used
+    :type max_workers: int
+    """
+    if max_workers is None:
+        max_workers = min(_max_workers, _MAX_CONCURRENT_PAGE_REQUESTS)
+
+    def _get_page(offset):
+        response = _api.send_request(
+            req_type='GET', path=path, params=dict(params, offset=offset)
+        )
+        if not response.ok:
+            raise SABaseException(
+                response.status_code, error_message + response.text
+            )
+        return response.json()
+
+    offset = params.get("offset", 0)
+    res = _get_page(offset)
+    yield res["data"]
+    page_size = len(res["data"])
+    offset += page_size
+    if page_size == 0 or res["count"] <= offset:
+        return
+    offsets = iter(range(offset, res["count"], page_size))
+    with concurrent.futures.ThreadPoolExecutor(max_workers) as pool:
+        pending = collections.deque()
+        try:
+            for page_offset in offsets:
+                pending.append(
+                    (page_offset, pool.submit(_get_page, page_offset))
+                )
+                if len(pending) >= max_workers:
+                    break
+            while pending:
+                page_offset, future = pending.popleft()
+                res = future.result()
+                for next_offset in offsets:
+                    pending.append(
+                        (next_offset, pool.submit(_get_page, next_offset))
+                    )
+                    break
+                yield res["data"]
+                offset = page_offset + len(res["data"])
+                if len(res["data"]) < page_size:
+                    # listing has changed meanwhile, next pages requested
+                    # at the precomputed offsets may skip items
+                    break
+        finally:
+            for _, future in pending:
+                future.cancel()
+    while res["data"] and res["count"] > offset:
+        res = _get_page(offset)
+        yield res["data"]
+        offset += len(res["data"])
+
+
+def get_all_pages(path, params, error_message, max_workers=None):
+    """Returns all items of an offset paginated listing with
+    :py:func:`iter_pages`.
+
+    :rtype: list
+    """
+    result_list = []
+    for page in iter_pages(path, params, error_message, max_workers):
+        result_list += page
+    return result_list
@@ -1,26 +1,37 @@
+import hashlib
+import io
 import logging
-import math
+import struct
 import tempfile
-import threading
 import time
 import zipfile
 from datetime import datetime
 from pathlib import Path
 
-import boto3
 import requests
+from boto3.s3.transfer import TransferConfig
 from tqdm import tqdm
 
 from ..api import API
 from ..common import annotation_status_str_to_int
-from ..exceptions import (SABaseException, SAExistingExportNameException,
-                          SANonExistingExportNameException)
+from ..exceptions import (
+    SABaseException, SAExistingExportNameException,
+    SANonExistingExportNameException
+)
+from .executor import run_bulk
 from .projects import get_project_metadata
+from .s3_clients import get_s3_client
 
 logger = logging.getLogger("superannotate-python-sdk")
 
 _api = API.get_instance()
-_NUM_THREADS = 10
+_DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+_DOWNLOAD_MAX_ATTEMPTS = 10
+_S3_MEMBER_MAX_ATTEMPTS = 3
+_S3_TRANSFER_CONFIG = TransferConfig(
+    multipart_chunksize=8 * 1024 * 1024, max_concurrency=2
+)
+_ZIP_LOCAL_HEADER = struct.Struct("<4s2B4HL2L2H")
 
 
 def get_export_metadata(project, export_name):
@@ -141,58 +152,338 @@ def prepare_export(
         )
     res = response.json()
     logger.info(
-        "Prepared export %s for project %s (ID %s).", res['name'], project["name"], project["id"]
+        "Prepared export %s for project %s (ID %s).", res['name'],
+        project["name"], project["id"]
     )
     return res["name"]
 
 
-def __tqdm_thread(total_num, current_nums, finish_event):
-    with tqdm(total=total_num) as pbar:
-        while True:
-            finished = finish_event.wait(5)
-            if not finished:
-                pbar.update(sum(current_nums) - pbar.n)
-            else:
-                pbar.update(total_num - pbar.n)
-                break
+def _retry_upload_to_s3(upload, name):
+    for attempt in range(1, _S3_MEMBER_MAX_ATTEMPTS + 1):
+        try:
+            upload()
+        except Exception as e:  # pylint: disable=broad-except
+            if attempt == _S3_MEMBER_MAX_ATTEMPTS:
+                raise
+            logger.warning("Retrying upload of %s to AWS: %s", name, e)
+        else:
+            return
 
 
-def __upload_files_to_aws_thread(
-    to_s3_bucket,
-    folder_path,
-    filepaths,
-    tmpdirname,
-    thread_id,
-    chunksize,
-    already_uploaded,
-    num_uploaded,
-):
-    len_files_to_upload = len(filepaths)
-    start_index = thread_id * chunksize
-    end_index = start_index + chunksize
-    if start_index >= len_files_to_upload:
-        return
-    to_s3 = boto3.Session().resource('s3').Bucket(to_s3_bucket)
-    for i in range(start_index, end_index):
-        if i >= len_files_to_upload:
-            break
-        if already_uploaded[i]:
-            continue
-        file = filepaths[i]
+def _check_s3_upload_result(result, get_name=str):
+    for item, e in result.failed:
+        logger.warning("Unable to upload %s to AWS %s", get_name(item), e)
+    if result.failed:
+        raise SABaseException(
+            0, f"Couldn't upload {len(result.failed)} export files to AWS: " +
+            ", ".join(get_name(item) for item, _ in result.failed[:10])
+        )
+
+
+def _verify_checksum(filepath, checksum):
+    if ":" in checksum:
+        algorithm, expected = checksum.split(":", 1)
+    else:
+        algorithm, expected = "md5", checksum
+    file_hash = hashlib.new(algorithm)
+    with open(filepath, "rb") as f:
+        for chunk in iter(lambda: f.read(_DOWNLOAD_CHUNK_SIZE), b""):
+            file_hash.update(chunk)
+    if file_hash.hexdigest() != expected.lower():
+        raise SABaseException(
+            0, f"Checksum mismatch for downloaded file {filepath}: expected "
+            f"{algorithm} {expected}, got {file_hash.hexdigest()}"
+        )
+
+
+class _ResumableDownload:
+    """Bookkeeping of download to <filepath>.part that is resumed with HTTP
+    Range requests from an existing partial file, both after connection
+    errors and from previous unfinished downloads. Shared by the sync and
+    asyncio download functions, which only send the requests and write the
+    content.
+    """
+    def __init__(self, filepath, checksum=None):
+        self.filepath = Path(filepath)
+        self.part_path = self.filepath.with_name(self.filepath.name + ".part")
+        self.checksum = checksum
+        self.downloaded = 0
+        self._attempts = 0
+
+    def get_request_headers(self):
+        """Returns headers of the next request, that resumes from the end of
+        the partial file if there is one.
+        """
+        self.downloaded = 0
+        if self.part_path.exists():
+            self.downloaded = self.part_path.stat().st_size
+        if self.downloaded:
+            return {"Range": f"bytes={self.downloaded}-"}
+        return None
+
+    def is_complete(self, content_range):
+        """Handles 416 (Range Not Satisfiable) response to the resumed
+        request. Partial file has all the content if its size is the total
+        size of Content-Range: bytes */<total>. Otherwise, e.g., if the partial
+        file was left from an earlier export with the same name, it is removed
+        and the next request downloads from the beginning.
+
+        :param content_range: Content-Range header of the response
+        :type content_range: str
+
+        :rtype: bool
+        """
+        total = None
+        if content_range is not None and content_range.startswith("bytes */"):
+            try:
+                total = int(content_range[len("bytes */"):])
+            except ValueError:
+                pass
+        if total == self.downloaded:
+            return True
+        logger.warning(
+            "Partial download %s doesn't match the file size. Restarting.",
+            self.part_path
+        )
+        self.part_path.unlink()
+        return False
+
+    def get_write_mode(self, status_code):
+        """Returns mode to open the partial file with for the content of
+        successful response.
+        """
+        if status_code != 206:
+            # server ignored the Range header, content starts from the beginning
+            self.downloaded = 0
+        return "ab" if self.downloaded else "wb"
+
+    def interrupted(self, e):
+        """Raises SABaseException if the download was interrupted too many
+        times, otherwise the next request resumes it.
+        """
+        self._attempts += 1
+        if self._attempts >= _DOWNLOAD_MAX_ATTEMPTS:
+            raise SABaseException(
+                0, f"Couldn't download file, partial download is kept "
+                f"at {self.part_path} and will be resumed on the next call. {e}"
+            )
+        logger.warning("Download interrupted (%s). Resuming.", e)
+
+    def finish(self):
+        """Verifies checksum of the partial file and moves it to filepath.
+        Partial file is removed on checksum mismatch.
+
+        :return: filepath
+        :rtype: Path
+        """
+        if self.checksum is not None:
+            try:
+                _verify_checksum(self.part_path, self.checksum)
+            except SABaseException:
+                self.part_path.unlink()
+                raise
+        self.part_path.replace(self.filepath)
+        return self.filepath
+
+
+def _download_file(url, filepath, checksum=None):
+    """Streams url content to filepath. Download goes to <filepath>.part
+    first and is resumed with HTTP Range requests from an existing partial
+    file, both after connection errors and from previous unfinished calls.
+    """
+    download = _ResumableDownload(filepath, checksum)
+    session = _api.get_storage_session()
+    while True:
+        headers = download.get_request_headers()
         try:
-            relative_filename = file.relative_to(tmpdirname)
-            s3_key = f'{folder_path}/{relative_filename}'
-            to_s3.upload_file(str(file), s3_key)
-        except Exception as e:
-            logger.warning("Unable to upload to data server %s", e)
-            return
+            with session.get(
+                url, headers=headers, stream=True, allow_redirects=True
+            ) as response:
+                if response.status_code == 416:
+                    if download.is_complete(
+                        response.headers.get("Content-Range")
+                    ):
+                        break
+                    continue
+                if not response.ok:
+                    raise SABaseException(
+                        response.status_code,
+                        "Couldn't download file " + response.text
+                    )
+                mode = download.get_write_mode(response.status_code)
+                total = int(response.headers.get("Content-Length", 0))
+                with open(download.part_path, mode) as f, tqdm(
+                    total=total + download.downloaded if total else None,
+                    initial=download.downloaded,
+                    unit="B",
+                    unit_scale=True,
+                    unit_divisor=1024
+                ) as pbar:
+                    for chunk in response.iter_content(_DOWNLOAD_CHUNK_SIZE):
+                        f.write(chunk)
+                        pbar.update(len(chunk))
+            break
+        except (
+            requests.exceptions.ConnectionError,
+            requests.exceptions.ChunkedEncodingError,
+            requests.exceptions.Timeout
+        ) as e:
+            download.interrupted(e)
+    return download.finish()
+
+
+class _RangeRequestsNotSupported(Exception):
+    pass
+
+
+class _HTTPRangeFile(io.RawIOBase):
+    """Read-only seekable file object over URL that supports HTTP Range
+    requests, e.g., presigned data storage URL.
+    """
+    def __init__(self, url, session):
+        super().__init__()
+        self._url = url
+        self._session = session
+        self._pos = 0
+        # streamed, so that servers ignoring Range don't send the whole file
+        with session.get(
+            url, headers={"Range": "bytes=0-0"}, stream=True
+        ) as response:
+            content_range = response.headers.get("Content-Range")
+            if response.status_code != 206 or content_range is None:
+                raise _RangeRequestsNotSupported()
+        self.size = int(content_range.rsplit("/", 1)[1])
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def tell(self):
+        return self._pos
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        if whence == io.SEEK_SET:
+            self._pos = offset
+        elif whence == io.SEEK_CUR:
+            self._pos += offset
         else:
-            num_uploaded[thread_id] += 1
-            already_uploaded[i] = True
+            self._pos = self.size + offset
+        return self._pos
+
+    def readinto(self, b):
+        length = min(len(b), self.size - self._pos)
+        if length <= 0:
+            return 0
+        data = self.read_range(self._pos, length)
+        b[:len(data)] = data
+        self._pos += len(data)
+        return len(data)
+
+    def open_range(self, start, length):
+        response = self._session.get(
+            self._url,
+            headers={"Range": f"bytes={start}-{start + length - 1}"},
+            stream=True
+        )
+        if response.status_code != 206:
+            response.close()
+            raise SABaseException(
+                response.status_code, "Couldn't read export " + response.text
+            )
+        return response
+
+    def read_range(self, start, length):
+        with self.open_range(start, length) as response:
+            return response.content
+
+
+def _upload_zip_member_to_s3(range_file, zip_info, s3_client, bucket, key):
+    """Streams zip member from remote zip file to S3 without keeping it on
+    disk or fully in memory.
+    """
+    if zip_info.compress_size == 0:
+        s3_client.put_object(Bucket=bucket, Key=key, Body=b"")
+        return
+    header = _ZIP_LOCAL_HEADER.unpack(
+        range_file.read_range(zip_info.header_offset, _ZIP_LOCAL_HEADER.size)
+    )
+    if header[0] != zipfile.stringFileHeader:
+        raise SABaseException(0, "Bad zip member header " + zip_info.filename)
+    data_offset = zip_info.header_offset + _ZIP_LOCAL_HEADER.size + header[
+        -2] + header[-1]
+    with range_file.open_range(data_offset, zip_info.compress_size) as response:
+        member = zipfile.ZipExtFile(response.raw, "r", zip_info)
+        s3_client.upload_fileobj(
+            member, bucket, key, Config=_S3_TRANSFER_CONFIG
+        )
+
+
+def _stream_export_to_s3(url, filename, to_s3_bucket, folder_path):
+    """Uploads export zip members to S3 by reading them directly from the
+    export URL with HTTP Range requests. Raises _RangeRequestsNotSupported if
+    URL doesn't support Range requests.
+    """
+    session = _api.get_storage_session()
+    range_file = _HTTPRangeFile(url, session)
+    with zipfile.ZipFile(
+        io.BufferedReader(range_file, _DOWNLOAD_CHUNK_SIZE)
+    ) as zip_file:
+        members = [m for m in zip_file.infolist() if not m.is_dir()]
+    logger.info(
+        "Uploading %s files from export %s to AWS %s/%s", len(members),
+        filename, to_s3_bucket, folder_path
+    )
+    s3_client = get_s3_client()
+
+    def _upload(zip_info):
+        _retry_upload_to_s3(
+            lambda: _upload_zip_member_to_s3(
+                range_file, zip_info, s3_client, to_s3_bucket,
+                f'{folder_path}/{zip_info.filename}'
+            ), zip_info.filename
+        )
+
+    _check_s3_upload_result(
+        run_bulk(_upload, members), lambda zip_info: zip_info.filename
+    )
+
+
+def _try_stream_export_to_s3(url, filename, to_s3_bucket, folder_path):
+    try:
+        _stream_export_to_s3(url, filename, to_s3_bucket, folder_path)
+    except _RangeRequestsNotSupported:
+        logger.info(
+            "Export server doesn't support partial downloads. Export will be extracted to a temporary directory before uploading to AWS."
+        )
+        return False
+    return True
+
+
+def _upload_export_zip_to_s3(url, filename, to_s3_bucket, folder_path):
+    """Streams export zip file itself to S3."""
+    with _api.get_storage_session().get(url, stream=True) as response:
+        if not response.ok:
+            raise SABaseException(
+                response.status_code,
+                "Couldn't download export " + response.text
+            )
+        get_s3_client().upload_fileobj(
+            response.raw,
+            to_s3_bucket,
+            f'{folder_path}/{filename}',
+            Config=_S3_TRANSFER_CONFIG
+        )
 
 
 def download_export(
-    project, export, folder_path, extract_zip_contents=True, to_s3_bucket=None
+    project,
+    export,
+    folder_path,
+    extract_zip_contents=True,
+    to_s3_bucket=None,
+    checksum=None
 ):
     """Download prepared export.
 
@@ -209,7 +500,12 @@ def download_export(
      if True the zip file will be extracted at folder_path
     :type extract_zip_contents: bool
     :param to_s3_bucket: AWS S3 bucket to use for download. If None then folder_path is in local filesystem.
+     Export files are streamed to the bucket without being stored on local disk,
+     unless checksum is set or the export server doesn't support HTTP Range requests.
     :type tofrom_s3_bucket: str
+    :param checksum: if not None, expected hex digest of the export zip file, MD5 by
+     default or prefixed with hashlib algorithm name, e.g., "sha256:<hex digest>"
+    :type checksum: str
     """
     if not isinstance(export, dict):
         export = get_export_metadata(project, export)
@@ -225,10 +521,9 @@ def download_export(
         break
 
     filename = Path(res['path']).name
-    r = requests.get(res['download'], allow_redirects=True)
     if to_s3_bucket is None:
         filepath = Path(folder_path) / filename
-        open(filepath, 'wb').write(r.content)
+        _download_file(res['download'], filepath, checksum)
         if extract_zip_contents:
             with zipfile.ZipFile(filepath, 'r') as f:
                 f.extractall(folder_path)
@@ -236,10 +531,19 @@ def download_export(
             logger.info("Extracted %s to folder %s", filepath, folder_path)
         else:
             logger.info("Downloaded export ID %s to %s", res['id'], filepath)
+    elif checksum is None and not extract_zip_contents:
+        _upload_export_zip_to_s3(
+            res['download'], filename, to_s3_bucket, folder_path
+        )
+        logger.info("Exported to AWS %s/%s", to_s3_bucket, folder_path)
+    elif checksum is None and _try_stream_export_to_s3(
+        res['download'], filename, to_s3_bucket, folder_path
+    ):
+        logger.info("Exported to AWS %s/%s", to_s3_bucket, folder_path)
     else:
         with tempfile.TemporaryDirectory() as tmpdirname:
             filepath = Path(tmpdirname) / filename
-            open(filepath, 'wb').write(r.content)
+            _download_file(res['download'], filepath, checksum)
             if extract_zip_contents:
                 with zipfile.ZipFile(filepath, 'r') as f:
                     f.extractall(tmpdirname)
@@ -249,33 +553,16 @@ def download_export(
                 if not file.is_file():
                     continue
                 files_to_upload.append(file)
-            len_files_to_upload = len(files_to_upload)
-            num_uploaded = [0] * _NUM_THREADS
-            already_uploaded = [False] * len_files_to_upload
-            finish_event = threading.Event()
-            chunksize = int(math.ceil(len_files_to_upload / _NUM_THREADS))
-            tqdm_thread = threading.Thread(
-                target=__tqdm_thread,
-                args=(len_files_to_upload, num_uploaded, finish_event)
-            )
-            tqdm_thread.start()
-            while True:
-                if sum(num_uploaded) == len_files_to_upload:
-                    break
-                threads = []
-                for thread_id in range(_NUM_THREADS):
-                    t = threading.Thread(
-                        target=__upload_files_to_aws_thread,
-                        args=(
-                            to_s3_bucket, folder_path, files_to_upload,
-                            tmpdirname, thread_id, chunksize, already_uploaded,
-                            num_uploaded
-                        )
-                    )
-                    threads.append(t)
-                    t.start()
-                for t in threads:
-                    t.join()
-            finish_event.set()
-            tqdm_thread.join()
+            s3_client = get_s3_client()
+
+            def _upload(file):
+                relative_filename = file.relative_to(tmpdirname)
+                _retry_upload_to_s3(
+                    lambda: s3_client.upload_file(
+                        str(file), to_s3_bucket,
+                        f'{folder_path}/{relative_filename}'
+                    ), relative_filename
+                )
+
+            _check_s3_upload_result(run_bulk(_upload, files_to_upload))
         logger.info("Exported to AWS %s/%s", to_s3_bucket, folder_path)
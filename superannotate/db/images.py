@@ -1,12 +1,13 @@
+import copy
 import io
 import json
 import logging
+import threading
+import time
 from pathlib import Path
 
-import boto3
 import cv2
 import numpy as np
-import requests
 from PIL import Image, ImageDraw
 
 from ..annotation_helpers import (
@@ -21,17 +22,29 @@ from ..common import (
     image_path_to_annotation_paths, project_type_int_to_str
 )
 from ..exceptions import SABaseException
+from . import cache as _cache
 from .annotation_classes import (
+    _get_project_classes_id_to_name, _get_project_classes_name_to_id,
     fill_class_and_attribute_ids, fill_class_and_attribute_names,
-    get_annotation_classes_id_to_name, get_annotation_classes_name_to_id,
     search_annotation_classes
 )
+from .executor import iter_bulk, iter_pages, run_bulk
 from .project import get_project_metadata
+from .s3_clients import get_s3_client, upload_to_s3
 
 logger = logging.getLogger("superannotate-python-sdk")
 
 _api = API.get_instance()
 
+# names missing from an image index are looked up on the platform at most
+# this often, unless they were removed from the index by this SDK session
+_IMAGES_INDEX_RELIST_INTERVAL = 30  # seconds
+# missing names are searched one by one if there are at most this many,
+# otherwise the project is re-listed
+_IMAGES_INDEX_MAX_NAME_SEARCHES = 10
+_images_index = {}
+_images_index_lock = threading.Lock()
+
 
 def _get_project_root_folder_id(project):
     """Get root folder ID
@@ -40,13 +53,19 @@ def _get_project_root_folder_id(project):
     int
         Root folder ID
     """
+    key = ("root_folder", project["team_id"], project["id"])
+    folder_id = _cache.get(key)
+    if folder_id is not None:
+        return folder_id
     params = {'team_id': project['team_id']}
     response = _api.send_request(
         req_type='GET', path=f'/project/{project["id"]}', params=params
     )
     if not response.ok:
         raise SABaseException(response.status_code, response.text)
-    return response.json()['folder_id']
+    folder_id = response.json()['folder_id']
+    _cache.put(key, folder_id)
+    return folder_id
 
 
 def search_images(
@@ -71,6 +90,38 @@ def search_images(
     :return: metadata of found images or image names
     :rtype: list of dicts or strs
     """
+    result_list = []
+    for page in search_images_pages(
+        project, image_name_prefix, annotation_status, return_metadata
+    ):
+        result_list += page
+    return result_list
+
+
+def search_images_pages(
+    project,
+    image_name_prefix=None,
+    annotation_status=None,
+    return_metadata=False
+):
+    """Same as :py:func:`search_images`, but yields the found images page by
+    page, in the same order. Pages after the first one are requested
+    concurrently.
+
+    :param project: project name or metadata of the project
+    :type project: str or dict
+    :param image_name_prefix: image name prefix for search
+    :type image_name_prefix: str
+    :param annotation_status: if not None, annotation statuses of images to filter,
+                              should be one of NotStarted InProgress QualityCheck Returned Completed Skipped
+    :type annotation_status: str
+
+    :param return_metadata: return metadata of images instead of names
+    :type return_metadata: bool
+
+    :return: generator of lists of metadata of found images or image names
+    :rtype: generator of lists of dicts or strs
+    """
     if not isinstance(project, dict):
         project = get_project_metadata(project)
     team_id, project_id = project["team_id"], project["id"]
@@ -78,7 +129,6 @@ def search_images(
     if annotation_status is not None:
         annotation_status = annotation_status_str_to_int(annotation_status)
 
-    result_list = []
     params = {
         'team_id': team_id,
         'project_id': project_id,
@@ -88,32 +138,207 @@ def search_images(
     }
     if image_name_prefix is not None:
         params['name'] = image_name_prefix
-    total_got = 0
-    while True:
-        response = _api.send_request(
-            req_type='GET', path='/images', params=params
-        )
-        if response.ok:
-            # print(response.json())
-            results = response.json()["data"]
-            total_got += len(results)
-            for r in results:
-                if return_metadata:
-                    result_list.append(r)
-                else:
-                    result_list.append(r["name"])
-            if response.json()["count"] <= total_got:
-                break
-            params["offset"] = total_got
-            # print(
-            #     "Got to ", len(result_list),
-            #     response.json()["count"], len(new_results), params['offset']
-            # )
+    for page in iter_pages('/images', params, "Couldn't search images "):
+        if return_metadata:
+            yield page
         else:
-            raise SABaseException(
-                response.status_code, "Couldn't search images " + response.text
-            )
-    return result_list
+            yield [r["name"] for r in page]
+
+
+def _images_index_key(project):
+    return (project["team_id"], project["id"])
+
+
+def _get_images_index(project):
+    """Returns project's image name -> image metadata index. The index is
+    filled with one full image listing and is reused until it expires after
+    the TTL of the metadata cache or is invalidated. If the metadata cache is
+    disabled the index isn't kept.
+
+    :return: index dict and whether it was filled by this call
+    :rtype: tuple (dict, bool)
+    """
+    images = _get_cached_images_index(project)
+    if images is not None:
+        return images, False
+    return _set_images_index(
+        project, search_images(project, return_metadata=True)
+    ), True
+
+
+def _get_cached_images_index(project):
+    if not _cache.is_enabled():
+        return None
+    with _images_index_lock:
+        entry = _images_index.get(_images_index_key(project))
+        if entry is not None and time.monotonic(
+        ) - entry["created"] < _cache.get_ttl():
+            return entry["images"]
+    return None
+
+
+def _set_images_index(project, images_metadata):
+    images = {}
+    for image in images_metadata:
+        images[image["name"]] = image
+    if not _cache.is_enabled():
+        return images
+    with _images_index_lock:
+        _images_index[_images_index_key(project)] = {
+            "images": images,
+            "removed": set(),
+            "created": time.monotonic()
+        }
+    return images
+
+
+def _update_images_index(project, image_name, **fields):
+    """Updates fields of the image's entry in the project's image index,
+    if the image is indexed.
+    """
+    with _images_index_lock:
+        entry = _images_index.get(_images_index_key(project))
+        if entry is not None and image_name in entry["images"]:
+            entry["images"][image_name].update(fields)
+
+
+def _add_to_images_index(project, image):
+    with _images_index_lock:
+        entry = _images_index.get(_images_index_key(project))
+        if entry is not None:
+            entry["images"][image["name"]] = image
+            entry["removed"].discard(image["name"])
+
+
+def _remove_from_images_index(project, image_names):
+    """Removes images from the project's image index. Next lookup of these
+    names will be done on the server.
+    """
+    with _images_index_lock:
+        entry = _images_index.get(_images_index_key(project))
+        if entry is not None:
+            for image_name in image_names:
+                entry["images"].pop(image_name, None)
+                entry["removed"].add(image_name)
+
+
+def _set_searched_image(project, image_name, image):
+    """Updates the project's image index with the result of a search of an
+    image missing from it.
+
+    :param image: metadata of the found image or None if it doesn't exist
+    :type image: dict
+    """
+    if image is not None:
+        _add_to_images_index(project, image)
+        return
+    with _images_index_lock:
+        entry = _images_index.get(_images_index_key(project))
+        if entry is not None:
+            entry["removed"].discard(image_name)
+
+
+def _get_images_index_misses(project, images, image_names):
+    """Returns how to look up the names missing from the project's image
+    index. Names removed from the index by this SDK session are always looked
+    up, other missing names only if the index was listed at least
+    _IMAGES_INDEX_RELIST_INTERVAL seconds ago, so that names that don't
+    exist, e.g., of new images in upload duplicate checks, don't re-list the
+    project on every call.
+
+    :return: names to search one by one and whether to re-list the project
+             instead
+    :rtype: tuple (list of strs, bool)
+    """
+    missing = {name for name in image_names if name not in images}
+    if not missing:
+        return [], False
+    with _images_index_lock:
+        entry = _images_index.get(_images_index_key(project))
+        if entry is None:
+            return [], True
+        if time.monotonic() - entry["created"] < _IMAGES_INDEX_RELIST_INTERVAL:
+            missing &= entry["removed"]
+    if len(missing) > _IMAGES_INDEX_MAX_NAME_SEARCHES:
+        return [], True
+    return sorted(missing), False
+
+
+def _lookup_images_index(project, image_names):
+    """Returns the project's image index, with the existing ones of
+    image_names looked up on the platform if they are missing from it, see
+    _get_images_index_misses.
+
+    :rtype: dict
+    """
+    images, just_filled = _get_images_index(project)
+    if just_filled:
+        return images
+    names, relist = _get_images_index_misses(project, images, image_names)
+    if relist:
+        invalidate_images_index(project)
+        images, _ = _get_images_index(project)
+        return images
+    for image_name in names:
+        image = _search_image_metadata(project, image_name)
+        _set_searched_image(project, image_name, image)
+        if image is not None:
+            images[image_name] = image
+    return images
+
+
+def invalidate_images_index(project=None):
+    """Drops the locally cached image name -> metadata index of the project,
+    so that the next image lookup re-lists images from the platform.
+    Use it when the project's images were changed outside of this SDK session.
+
+    :param project: project name or metadata of the project. If None
+                    indexes of all projects are dropped
+    :type project: str, dict or None
+    """
+    if project is None:
+        with _images_index_lock:
+            _images_index.clear()
+        return
+    if not isinstance(project, dict):
+        project = get_project_metadata(project)
+    with _images_index_lock:
+        _images_index.pop(_images_index_key(project), None)
+
+
+def _get_existing_image_names(project, image_names):
+    """Returns the subset of image_names that exist in the project. Names are
+    looked up in the project's image index, see _lookup_images_index.
+
+    :rtype: set of strs
+    """
+    image_names = set(image_names)
+    if not _cache.is_enabled():
+        return image_names.intersection(search_images(project))
+    return image_names.intersection(_lookup_images_index(project, image_names))
+
+
+def _get_images_metadata(project, image_names):
+    """Returns image name -> metadata dict that has at least the existing
+    ones of image_names. Names are looked up in the project's image index,
+    see _lookup_images_index.
+
+    :rtype: dict
+    """
+    if not _cache.is_enabled():
+        return {
+            image["name"]: image
+            for image in search_images(project, return_metadata=True)
+        }
+    return _lookup_images_index(project, image_names)
+
+
+def _search_image_metadata(project, image_name):
+    images = search_images(project, image_name, return_metadata=True)
+    for image in images:
+        if image["name"] == image_name:
+            return image
+    return None
 
 
 def get_image_metadata(project, image_name):
@@ -127,14 +352,24 @@ def get_image_metadata(project, image_name):
     :return: metadata of image
     :rtype: dict
     """
-    images = search_images(project, image_name, return_metadata=True)
-    for image in images:
-        if image["name"] == image_name:
-            return image
-    raise SABaseException(
-        0, "Image " + image_name + " doesn't exist in the project " +
-        project["name"]
-    )
+    if not isinstance(project, dict):
+        project = get_project_metadata(project)
+    if not _cache.is_enabled():
+        image = _search_image_metadata(project, image_name)
+    else:
+        images, just_filled = _get_images_index(project)
+        image = images.get(image_name)
+        if image is None and not just_filled:
+            # image could have been added after the index was filled
+            image = _search_image_metadata(project, image_name)
+            if image is not None:
+                _add_to_images_index(project, image)
+    if image is None:
+        raise SABaseException(
+            0, "Image " + image_name + " doesn't exist in the project " +
+            project["name"]
+        )
+    return copy.copy(image)
 
 
 def set_image_annotation_status(project, image_name, annotation_status):
@@ -151,25 +386,98 @@ def set_image_annotation_status(project, image_name, annotation_status):
     :return: metadata of the updated image
     :rtype: dict
     """
+    if not isinstance(project, dict):
+        project = get_project_metadata(project)
     image = get_image_metadata(project, image_name)
+    annotation_status = annotation_status_str_to_int(annotation_status)
+    return _update_image(
+        project, image, {"annotation_status": annotation_status}
+    )
+
+
+def _update_image(project, image, fields):
+    """Updates fields of the image with its metadata, also in the project's
+    image index.
+
+    :return: metadata of the updated image
+    :rtype: dict
+    """
     team_id, project_id, image_id = image["team_id"], image["project_id"
                                                            ], image["id"]
-    annotation_status = annotation_status_str_to_int(annotation_status)
-    json_req = {
-        "annotation_status": annotation_status,
-    }
     params = {'team_id': team_id, 'project_id': project_id}
     response = _api.send_request(
         req_type='PUT',
         path=f'/image/{image_id}',
-        json_req=json_req,
+        json_req=fields,
         params=params
     )
     if not response.ok:
-        raise SABaseException(response.status_code, response.text)
+        raise SABaseException(
+            response.status_code,
+            "Couldn't update image " + image["name"] + " " + response.text
+        )
+    _update_images_index(project, image["name"], **fields)
     return response.json()
 
 
+def _update_images(project, image_names, fields):
+    """Updates fields of the images concurrently. Image metadata are resolved
+    with one image listing.
+
+    :return: updated and not-updated image names
+    :rtype: tuple (2 members) of list of strs
+    """
+    images = _get_images_metadata(project, image_names)
+    not_updated = []
+    to_update = []
+    for image_name in image_names:
+        if image_name in images:
+            to_update.append(images[image_name])
+        else:
+            logger.warning(
+                "Image %s doesn't exist in the project %s", image_name,
+                project["name"]
+            )
+            not_updated.append(image_name)
+    result = run_bulk(
+        lambda image: _update_image(project, image, fields), to_update
+    )
+    for image, e in result.failed:
+        logger.warning("Couldn't update image %s: %s", image["name"], e)
+        not_updated.append(image["name"])
+    for image in result.cancelled:
+        not_updated.append(image["name"])
+    return [image["name"] for image in result.succeeded], not_updated
+
+
+def set_images_annotation_statuses(project, image_names, annotation_status):
+    """Sets annotation statuses of multiple images. Images are resolved with
+    one image listing and updated concurrently by the workers set with
+    :py:func:`set_max_workers`.
+
+    :param project: project name or metadata of the project
+    :type project: str or dict
+    :param image_names: image names
+    :type image_names: list of strs
+    :param annotation_status: annotation status to set,
+           should be one of NotStarted InProgress QualityCheck Returned Completed Skipped
+    :type annotation_status: str
+
+    :return: updated and not-updated image names
+    :rtype: tuple (2 members) of list of strs
+    """
+    if not isinstance(project, dict):
+        project = get_project_metadata(project)
+    annotation_status = annotation_status_str_to_int(annotation_status)
+    logger.info(
+        "Setting annotation statuses of %s images in project %s.",
+        len(image_names), project["name"]
+    )
+    return _update_images(
+        project, image_names, {"annotation_status": annotation_status}
+    )
+
+
 def add_annotation_comment_to_image(
     project,
     image_name,
@@ -535,6 +843,8 @@ def delete_image(project, image_name):
     :param image_name: image name
     :type image: str
     """
+    if not isinstance(project, dict):
+        project = get_project_metadata(project)
     image = get_image_metadata(project, image_name)
     team_id, project_id, image_id = image["team_id"], image["project_id"
                                                            ], image["id"]
@@ -546,6 +856,7 @@ def delete_image(project, image_name):
         raise SABaseException(
             response.status_code, "Couldn't delete image " + response.text
         )
+    _remove_from_images_index(project, [image_name])
     logger.info("Successfully deleted image  %s.", image_name)
 
 
@@ -568,7 +879,13 @@ def get_image_bytes(project, image_name, variant='original'):
         raise SABaseException(
             0, "Image download variant should be either original or lores"
         )
+    if not isinstance(project, dict):
+        project = get_project_metadata(project)
     image = get_image_metadata(project, image_name)
+    return _get_image_bytes(image, variant)
+
+
+def _get_image_bytes(image, variant):
     team_id, project_id, image_id, folder_id = image["team_id"], image[
         "project_id"], image["id"], image['folder_id']
     params = {
@@ -589,7 +906,7 @@ def get_image_bytes(project, image_name, variant='original'):
     res = response.json()
     url = res[variant]["url"]
     headers = res[variant]["headers"]
-    response = requests.get(url=url, headers=headers)
+    response = _api.get_storage_session().get(url=url, headers=headers)
     img = io.BytesIO(response.content)
     return img
 
@@ -607,11 +924,11 @@ def get_image_preannotations(project, image_name):
         "preannotation_json_filename": filename on server,
     :rtype: dict
     """
+    if not isinstance(project, dict):
+        project = get_project_metadata(project)
     image = get_image_metadata(project, image_name)
     team_id, project_id, image_id, folder_id = image["team_id"], image[
         "project_id"], image["id"], image['folder_id']
-    if not isinstance(project, dict):
-        project = get_project_metadata(project)
     project_type = project["type"]
 
     params = {
@@ -628,18 +945,13 @@ def get_image_preannotations(project, image_name):
         raise SABaseException(response.status_code, response.text)
     res = response.json()
 
-    annotation_classes = search_annotation_classes(
-        project, return_metadata=True
-    )
-    annotation_classes_dict = get_annotation_classes_id_to_name(
-        annotation_classes
-    )
+    annotation_classes_dict = _get_project_classes_id_to_name(project)
     if project_type == 1:  # vector
         res = res['preannotation']
         url = res["url"]
         annotation_json_filename = url.rsplit('/', 1)[-1]
         headers = res["headers"]
-        response = requests.get(url=url, headers=headers)
+        response = _api.get_storage_session().get(url=url, headers=headers)
         if not response.ok:
             logger.warning(
                 "No preannotation available for image %s.", image_name
@@ -659,7 +971,7 @@ def get_image_preannotations(project, image_name):
         url = res_json["url"]
         preannotation_json_filename = url.rsplit('/', 1)[-1]
         headers = res_json["headers"]
-        response = requests.get(url=url, headers=headers)
+        response = _api.get_storage_session().get(url=url, headers=headers)
         if not response.ok:
             logger.warning("No preannotation available.")
             return {
@@ -678,7 +990,7 @@ def get_image_preannotations(project, image_name):
         preannotation_mask_filename = url.rsplit('/', 1)[-1]
         annotation_json_filename = url.rsplit('/', 1)[-1]
         headers = res_mask["headers"]
-        response = requests.get(url=url, headers=headers)
+        response = _api.get_storage_session().get(url=url, headers=headers)
         mask = io.BytesIO(response.content)
         return {
             "preannotation_json_filename": preannotation_json_filename,
@@ -703,13 +1015,23 @@ def get_image_annotations(project, image_name, project_type=None):
         "annotation_mask_filename": mask filename on server
     :rtype: dict
     """
+    if not isinstance(project, dict):
+        project = get_project_metadata(project)
     image = get_image_metadata(project, image_name)
-    team_id, project_id, image_id, folder_id = image["team_id"], image[
-        "project_id"], image["id"], image['folder_id']
     if project_type is None:
-        if not isinstance(project, dict):
-            project = get_project_metadata(project)
         project_type = project["type"]
+    annotation_classes_dict = _get_project_classes_id_to_name(project)
+    return _get_image_annotations(
+        image, project_type, annotation_classes_dict, _api.get_storage_session()
+    )
+
+
+def _get_image_annotations(
+    image, project_type, annotation_classes_dict, session
+):
+    team_id, project_id, image_id, folder_id = image["team_id"], image[
+        "project_id"], image["id"], image['folder_id']
+
     params = {
         'team_id': team_id,
         'project_id': project_id,
@@ -724,17 +1046,11 @@ def get_image_annotations(project, image_name, project_type=None):
         raise SABaseException(response.status_code, response.text)
     res = response.json()
 
-    annotation_classes = search_annotation_classes(
-        project, return_metadata=True
-    )
-    annotation_classes_dict = get_annotation_classes_id_to_name(
-        annotation_classes
-    )
     if project_type == 1:  # vector
         url = res["objects"]["url"]
         annotation_json_filename = url.rsplit('/', 1)[-1]
         headers = res["objects"]["headers"]
-        response = requests.get(url=url, headers=headers)
+        response = session.get(url=url, headers=headers)
         if response.ok:
             res_json = response.json()
             fill_class_and_attribute_names(res_json, annotation_classes_dict)
@@ -749,7 +1065,7 @@ def get_image_annotations(project, image_name, project_type=None):
         url = res["pixelObjects"]["url"]
         annotation_json_filename = url.rsplit('/', 1)[-1]
         headers = res["pixelObjects"]["headers"]
-        response = requests.get(url=url, headers=headers)
+        response = session.get(url=url, headers=headers)
         if not response.ok and response.status_code == 403:
             return {
                 "annotation_json": None,
@@ -764,7 +1080,7 @@ def get_image_annotations(project, image_name, project_type=None):
         url = res["pixelSave"]["url"]
         annotation_mask_filename = url.rsplit('/', 1)[-1]
         headers = res["pixelSave"]["headers"]
-        response = requests.get(url=url, headers=headers)
+        response = session.get(url=url, headers=headers)
         if not response.ok:
             raise SABaseException(response.status_code, response.text)
         mask = io.BytesIO(response.content)
@@ -776,6 +1092,62 @@ def get_image_annotations(project, image_name, project_type=None):
         }
 
 
+def get_images_annotations(project, image_names, max_workers=None):
+    """Get annotations of multiple images. Image metadata are resolved with
+    one image listing and the annotations are downloaded concurrently.
+    Results are yielded in completion order, failure to get annotations of
+    an image is reported in its result instead of stopping the whole download.
+
+    :param project: project name or metadata of the project
+    :type project: str or dict
+    :param image_names: image names
+    :type image_names: list of strs
+    :param max_workers: number of concurrent downloads. If None the value set
+                        with :py:func:`set_max_workers` is used
+    :type max_workers: int
+
+    :return: generator of dict objects with the keys of
+             :py:func:`get_image_annotations` return value and additional keys:
+        "image_name": image name,
+        "error": None or the exception that occurred for this image
+    :rtype: generator of dicts
+    """
+    if not isinstance(project, dict):
+        project = get_project_metadata(project)
+    project_type = project["type"]
+    image_names = list(image_names)
+    images = _get_images_metadata(project, image_names)
+    annotation_classes_dict = _get_project_classes_id_to_name(project)
+
+    session = _api.get_storage_session()
+
+    def _get(image_name):
+        if image_name not in images:
+            raise SABaseException(
+                0, "Image " + image_name + " doesn't exist in the project " +
+                project["name"]
+            )
+        return _get_image_annotations(
+            images[image_name], project_type, annotation_classes_dict, session
+        )
+
+    for _, image_name, result, exception in iter_bulk(
+        _get, image_names, max_workers
+    ):
+        if exception is not None:
+            logger.warning(
+                "Couldn't get annotations of image %s: %s", image_name,
+                exception
+            )
+            result = {"annotation_json": None, "annotation_json_filename": None}
+            if project_type != 1:
+                result["annotation_mask"] = None
+                result["annotation_mask_filename"] = None
+        result["error"] = exception
+        result["image_name"] = image_name
+        yield result
+
+
 def download_image_annotations(project, image_name, local_dir_path):
     """Downloads annotations of the image (JSON and mask if pixel type project)
     to local_dir_path.
@@ -886,12 +1258,7 @@ def upload_annotations_from_json_to_image(
             "Uploading annotations for image %s in project %s.", image_name,
             project["name"]
         )
-    annotation_classes = search_annotation_classes(
-        project, return_metadata=True
-    )
-    annotation_classes_dict = get_annotation_classes_name_to_id(
-        annotation_classes
-    )
+    annotation_classes_dict = _get_project_classes_name_to_id(project)
     fill_class_and_attribute_ids(annotation_json, annotation_classes_dict)
     params = {
         'team_id': team_id,
@@ -910,42 +1277,25 @@ def upload_annotations_from_json_to_image(
     res = response.json()
     if project_type == 1:  # vector
         res = res['objects']
-        s3_session = boto3.Session(
-            aws_access_key_id=res['accessKeyId'],
-            aws_secret_access_key=res['secretAccessKey'],
-            aws_session_token=res['sessionToken']
-        )
-        s3_resource = s3_session.resource('s3')
-        bucket = s3_resource.Bucket(res["bucket"])
-        bucket.put_object(
-            Key=res['filePath'], Body=json.dumps(annotation_json)
+        get_s3_client(res).put_object(
+            Bucket=res["bucket"],
+            Key=res['filePath'],
+            Body=json.dumps(annotation_json)
         )
     else:  # pixel
         if mask is None:
             raise SABaseException(0, "Pixel annotation should have mask.")
-        if not isinstance(mask, io.BytesIO):
-            with open(mask, "rb") as f:
-                mask = io.BytesIO(f.read())
         res_j = res['pixel']
-        s3_session = boto3.Session(
-            aws_access_key_id=res_j['accessKeyId'],
-            aws_secret_access_key=res_j['secretAccessKey'],
-            aws_session_token=res_j['sessionToken']
-        )
-        s3_resource = s3_session.resource('s3')
-        bucket = s3_resource.Bucket(res_j["bucket"])
-        bucket.put_object(
-            Key=res_j['filePath'], Body=json.dumps(annotation_json)
+        get_s3_client(res_j).put_object(
+            Bucket=res_j["bucket"],
+            Key=res_j['filePath'],
+            Body=json.dumps(annotation_json)
         )
         res_m = res['save']
-        s3_session = boto3.Session(
-            aws_access_key_id=res_m['accessKeyId'],
-            aws_secret_access_key=res_m['secretAccessKey'],
-            aws_session_token=res_m['sessionToken']
+        # mask file path is streamed from disk
+        upload_to_s3(
+            get_s3_client(res_m), mask, res_m["bucket"], res_m['filePath']
         )
-        s3_resource = s3_session.resource('s3')
-        bucket = s3_resource.Bucket(res_m["bucket"])
-        bucket.put_object(Key=res_m['filePath'], Body=mask)
 
 
 def create_fuse_image(
@@ -1,3 +1,4 @@
+import copy
 import logging
 
 from ..api import API
@@ -5,6 +6,8 @@ from ..exceptions import (
     SABaseException, SAExistingProjectNameException,
     SANonExistingProjectNameException
 )
+from . import cache as _cache
+from .executor import get_all_pages
 
 logger = logging.getLogger("superannotate-python-sdk")
 _api = API.get_instance()
@@ -36,25 +39,12 @@ def search_projects(name=None, return_metadata=False):
     :return: project names or metadatas
     :rtype: list of strs or dicts
     """
-    result_list = []
     params = {'team_id': str(_api.team_id), 'offset': 0}
     if name is not None:
         params['name'] = name
-    while True:
-        response = _api.send_request(
-            req_type='GET', path='/projects', params=params
-        )
-        if response.ok:
-            new_results = response.json()
-            result_list += new_results["data"]
-            if response.json()["count"] <= len(result_list):
-                break
-            params["offset"] = len(result_list)
-        else:
-            raise SABaseException(
-                response.status_code,
-                "Couldn't search projects." + response.text
-            )
+    result_list = get_all_pages(
+        '/projects', params, "Couldn't search projects."
+    )
     if return_metadata:
         return result_list
     else:
@@ -70,6 +60,12 @@ def get_project_metadata(project_name):
     :return: metadata of project
     :rtype: dict
     """
+    team_id = _api.team_id
+    project_id = _cache.get(("project_name", team_id, project_name))
+    if project_id is not None:
+        project = _cache.get(("project", team_id, project_id))
+        if project is not None:
+            return copy.deepcopy(project)
     projects = search_projects(project_name, return_metadata=True)
     results = []
     for project in projects:
@@ -82,7 +78,10 @@ def get_project_metadata(project_name):
             " is not unique. To use SDK please make project names unique."
         )
     elif len(results) == 1:
-        return _get_project_metadata(results[0])
+        project = _get_project_metadata(results[0])
+        _cache.put(("project", team_id, project["id"]), project)
+        _cache.put(("project_name", team_id, project_name), project["id"])
+        return copy.deepcopy(project)
     else:
         raise SANonExistingProjectNameException(
             0, "Project with name " + project_name + " doesn't exist."
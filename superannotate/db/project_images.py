@@ -1,27 +1,152 @@
+import concurrent.futures
+import contextlib
 import io
 import logging
 import re
+import threading
 import time
 from pathlib import Path
 
-import boto3
-
 from ..api import API
 from ..common import annotation_status_int_to_str, annotation_status_str_to_int
 from ..exceptions import SABaseException
+from . import cache as _cache
+from .executor import iter_bulk, run_bulk
 from .images import (
-    delete_image, get_image_annotations, get_image_bytes, get_image_metadata,
+    _get_image_bytes, _get_images_index, _get_images_metadata, _update_image,
+    _update_images, delete_image, get_image_annotations, get_image_bytes,
+    get_image_metadata, get_images_annotations, invalidate_images_index,
     search_images, set_image_annotation_status,
     upload_annotations_from_json_to_image
 )
 from .projects import (
-    __create_image, _get_project_image_quality_in_editor,
+    __create_image, __upload_images, _get_image_upload_options,
+    _get_project_image_quality_in_editor, _prepare_image_to_upload,
     get_image_array_to_upload, get_project_metadata
 )
+from .s3_clients import get_s3_client, upload_to_s3
 
 logger = logging.getLogger("superannotate-python-sdk")
 _api = API.get_instance()
 
+_READINESS_CHECK_BATCH_SIZE = 500
+_READINESS_CHECK_INITIAL_DELAY = 0.2
+_READINESS_CHECK_MAX_DELAY = 5.0
+_COPY_READINESS_TIMEOUT = 300
+_COPY_SUFFIX_RE = re.compile(r"(.*)_\(([0-9]+)\)")
+
+
+class _ImageReadinessWatcher:
+    """Resolves futures of uploaded images when the images become available
+    in their projects. Pending images of all uploads are checked together
+    from one background thread, in batches of _READINESS_CHECK_BATCH_SIZE
+    names per request, with exponential backoff between the checks.
+    """
+    def __init__(self):
+        self._condition = threading.Condition()
+        # (team_id, project_id) -> image name -> list of (future, deadline)
+        self._pending = {}
+        self._thread = None
+        self._delay = _READINESS_CHECK_INITIAL_DELAY
+        self._next_check = 0
+
+    def watch(self, project, image_name, timeout):
+        future = concurrent.futures.Future()
+        key = (project["team_id"], project["id"])
+        now = time.monotonic()
+        with self._condition:
+            self._pending.setdefault(key, {}).setdefault(image_name, []).append(
+                (future, now + timeout)
+            )
+            self._delay = _READINESS_CHECK_INITIAL_DELAY
+            first_check = now + _READINESS_CHECK_INITIAL_DELAY
+            if self._thread is None:
+                self._next_check = first_check
+                self._thread = threading.Thread(target=self._run, daemon=True)
+                self._thread.start()
+            else:
+                self._next_check = min(self._next_check, first_check)
+                self._condition.notify()
+        return future
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while True:
+                    if not self._pending:
+                        self._thread = None
+                        return
+                    now = time.monotonic()
+                    if now >= self._next_check:
+                        break
+                    self._condition.wait(self._next_check - now)
+                to_check = {
+                    key: list(images)
+                    for key, images in self._pending.items()
+                }
+            ready = {
+                key: self._get_ready_images(key, image_names)
+                for key, image_names in to_check.items()
+            }
+            resolved, expired = [], []
+            now = time.monotonic()
+            with self._condition:
+                for key, images in list(self._pending.items()):
+                    for image_name, waiters in list(images.items()):
+                        if image_name in ready.get(key, ()):
+                            resolved += [(f, image_name) for f, _ in waiters]
+                            del images[image_name]
+                            continue
+                        expired += [
+                            (f, image_name) for f, d in waiters if d <= now
+                        ]
+                        waiters[:] = [(f, d) for f, d in waiters if d > now]
+                        if not waiters:
+                            del images[image_name]
+                    if not images:
+                        del self._pending[key]
+                self._delay = min(self._delay * 2, _READINESS_CHECK_MAX_DELAY)
+                self._next_check = now + self._delay
+            for future, image_name in resolved:
+                future.set_result(image_name)
+            for future, image_name in expired:
+                future.set_exception(
+                    SABaseException(
+                        0, "Uploaded image " + image_name +
+                        " didn't become available in the project in time"
+                    )
+                )
+
+    @staticmethod
+    def _get_ready_images(key, image_names):
+        team_id, project_id = key
+        ready = set()
+        for i in range(0, len(image_names), _READINESS_CHECK_BATCH_SIZE):
+            data = {
+                "project_id": project_id,
+                "team_id": team_id,
+                "names": image_names[i:i + _READINESS_CHECK_BATCH_SIZE]
+            }
+            try:
+                response = _api.send_request(
+                    req_type='POST',
+                    path='/images/getAnnotationsPathsAndTokens',
+                    json_req=data
+                )
+            except Exception as e:  # pylint: disable=broad-except
+                logger.warning("Couldn't check uploaded images %s", e)
+                continue
+            if not response.ok:
+                logger.warning(
+                    "Couldn't check uploaded images %s", response.text
+                )
+                continue
+            ready.update(response.json()["images"])
+        return ready
+
+
+_image_readiness_watcher = _ImageReadinessWatcher()
+
 
 def upload_image_to_project(
     project,
@@ -29,11 +154,20 @@ def upload_image_to_project(
     image_name=None,
     annotation_status="NotStarted",
     from_s3_bucket=None,
-    image_quality_in_editor=None
+    image_quality_in_editor=None,
+    wait=True,
+    timeout=300
 ):
     """Uploads image (io.BytesIO() or filepath to image) to project.
     Sets status of the uploaded image to set_status if it is not None.
 
+    The image becomes available in the project shortly after the upload.
+    By default the function waits for it and returns None. With wait=False
+    it doesn't wait and returns a concurrent.futures.Future instead, which is
+    resolved in the background; its result() waits for the image. Availability
+    of all images uploaded this way is checked in batched requests, so many
+    images can be uploaded without waiting on each of them.
+
     :param project: project name or metadata of the project to upload image to
     :type project: str or dict
     :param img: image to upload
@@ -48,6 +182,16 @@ def upload_image_to_project(
     :param image_quality_in_editor: image quality be seen in SuperAnnotate web annotation editor.
            Can be either "compressed" or "original".  If None then the default value in project settings will be used.
     :type image_quality_in_editor: str
+    :param wait: wait until the image is available in the project
+    :type wait: bool
+    :param timeout: seconds after which the image availability check fails
+                    with SABaseException
+    :type timeout: float
+
+    :return: None if wait is True, otherwise future that resolves to the image
+             name when the image is available in the project, or fails with
+             SABaseException after timeout
+    :rtype: None or concurrent.futures.Future
     """
     if not isinstance(project, dict):
         project = get_project_metadata(project)
@@ -59,15 +203,6 @@ def upload_image_to_project(
     img_name = None
     if not isinstance(img, io.BytesIO):
         img_name = Path(img).name
-        if from_s3_bucket is not None:
-            from_session = boto3.Session()
-            from_s3 = from_session.resource('s3')
-            from_s3_object = from_s3.Object(from_s3_bucket, img)
-            img = io.BytesIO()
-            from_s3_object.download_fileobj(img)
-        else:
-            with open(img, "rb") as f:
-                img = io.BytesIO(f.read())
     if image_name is not None:
         img_name = image_name
 
@@ -75,6 +210,16 @@ def upload_image_to_project(
         raise SABaseException(
             0, "Image name img_name should be set if img is not Pathlike"
         )
+    if isinstance(img, io.BytesIO):
+        images = get_image_array_to_upload(
+            img, image_quality_in_editor, **_get_image_upload_options()
+        )
+    else:
+        # large local files are streamed from disk
+        images = _prepare_image_to_upload(
+            img, image_quality_in_editor, from_s3_bucket,
+            **_get_image_upload_options()
+        )
 
     team_id, project_id = project["team_id"], project["id"]
     params = {
@@ -92,34 +237,25 @@ def upload_image_to_project(
         raise SABaseException(
             response.status_code, "Couldn't get upload token " + response.text
         )
-    s3_session = boto3.Session(
-        aws_access_key_id=res['accessKeyId'],
-        aws_secret_access_key=res['secretAccessKey'],
-        aws_session_token=res['sessionToken']
-    )
-    s3_resource = s3_session.resource('s3')
-    bucket = s3_resource.Bucket(res["bucket"])
-    orig_image, lores_image, huge_image, thumbnail_image = get_image_array_to_upload(
-        img, image_quality_in_editor
-    )
+    s3_client = get_s3_client(res)
+    bucket = res["bucket"]
+    orig_image, lores_image, huge_image, thumbnail_image = images
     key = prefix + f'{img_name}'
     try:
-        bucket.put_object(Body=orig_image, Key=key)
-        bucket.put_object(Body=lores_image, Key=key + '___lores.jpg')
-        bucket.put_object(Body=huge_image, Key=key + '___huge.jpg')
-        bucket.put_object(Body=thumbnail_image, Key=key + '___thumb.jpg')
+        upload_to_s3(s3_client, orig_image, bucket, key)
+        upload_to_s3(s3_client, lores_image, bucket, key + '___lores.jpg')
+        upload_to_s3(s3_client, huge_image, bucket, key + '___huge.jpg')
+        upload_to_s3(s3_client, thumbnail_image, bucket, key + '___thumb.jpg')
     except Exception as e:
-        raise SABaseException(0, "Couldn't upload to data server. " + e)
+        raise SABaseException(0, "Couldn't upload to data server. " + str(e))
 
     __create_image([img_name], project, annotation_status, prefix)
 
-    while True:
-        try:
-            get_image_metadata(project, img_name)
-        except SABaseException:
-            time.sleep(0.2)
-        else:
-            break
+    future = _image_readiness_watcher.watch(project, img_name, timeout)
+    if not wait:
+        return future
+    future.result()
+    return None
 
 
 def copy_image(
@@ -153,27 +289,12 @@ def copy_image(
         destination_project = get_project_metadata(destination_project)
     img_b = get_image_bytes(source_project, image_name)
     img_metadata = get_image_metadata(source_project, image_name)
-    new_name = image_name
-    extension = Path(image_name).suffix
-    p = re.compile(r"_\([0-9]+\)\.")
-    while True:
-        try:
-            get_image_metadata(destination_project, new_name)
-        except SABaseException:
-            break
-        else:
-            found_copied = False
-            for m in p.finditer(new_name):
-                if m.start() + len(m.group()
-                                  ) + len(extension) - 1 == len(new_name):
-                    num = int(m.group()[2:-2])
-                    found_copied = True
-                    break
-            if not found_copied:
-                new_name = Path(new_name).stem + "_(1)" + extension
-            else:
-                new_name = new_name[:m.start() +
-                                    2] + str(num + 1) + ")" + extension
+    # all names that the copy can get start with the name without suffix
+    taken_names = set(
+        search_images(destination_project,
+                      _split_copy_suffix(image_name)[0])
+    )
+    new_name = _get_copy_name(image_name, taken_names)
     upload_image_to_project(destination_project, img_b, new_name)
     if include_annotations:
         annotations = get_image_annotations(source_project, image_name)
@@ -203,6 +324,262 @@ def copy_image(
     )
 
 
+def _split_copy_suffix(image_name):
+    """Splits image name to the name without _(<num>) copy suffix, the number
+    of the suffix (0 if there is none) and extension.
+    """
+    extension = Path(image_name).suffix
+    stem = image_name[:len(image_name) - len(extension)]
+    m = _COPY_SUFFIX_RE.fullmatch(stem)
+    if m is None:
+        return stem, 0, extension
+    return m.group(1), int(m.group(2)), extension
+
+
+def _get_copy_name(image_name, taken_names):
+    """Returns image_name if it isn't in taken_names, otherwise the name with
+    the next _(<num>) copy suffix that isn't taken.
+    """
+    if image_name not in taken_names:
+        return image_name
+    stem, num, extension = _split_copy_suffix(image_name)
+    while True:
+        num += 1
+        new_name = f"{stem}_({num}){extension}"
+        if new_name not in taken_names:
+            return new_name
+
+
+def copy_images(
+    source_project,
+    image_names,
+    destination_project,
+    include_annotations=False,
+    copy_annotation_status=False,
+    copy_pin=False
+):
+    """Copy images to a project. Names that are taken in the destination project
+    are changed as in :py:func:`copy_image`, resolved with one listing of the
+    destination project's images. Images are copied concurrently by the
+    workers set with :py:func:`set_max_workers`, their annotations are
+    transferred with :py:func:`get_images_annotations`.
+
+    :param source_project: project name or metadata of the project of source project
+    :type source_project: str or dict
+    :param image_names: names of the images to copy. If None, all images of
+                        the source project are copied
+    :type image_names: list of strs
+    :param destination_project: project name or metadata of the project of destination project
+    :type destination_project: str or dict
+    :param include_annotations: enables annotations copy
+    :type include_annotations: bool
+    :param copy_annotation_status: enables annotations status copy
+    :type copy_annotation_status: bool
+    :param copy_pin: enables image pin status copy
+    :type copy_pin: bool
+
+    :return: dict of copied image names to their names in the destination
+             project, and names of the images that couldn't be copied
+    :rtype: tuple (2 members) of dict and list of strs
+    """
+    if not isinstance(source_project, dict):
+        source_project = get_project_metadata(source_project)
+    if not isinstance(destination_project, dict):
+        destination_project = get_project_metadata(destination_project)
+    if image_names is None:
+        image_names = search_images(source_project)
+    images = _get_images_metadata(source_project, image_names)
+    not_copied = []
+    to_copy = []
+    for image_name in image_names:
+        if image_name in images:
+            to_copy.append(image_name)
+        else:
+            logger.warning(
+                "Image %s doesn't exist in the project %s", image_name,
+                source_project["name"]
+            )
+            not_copied.append(image_name)
+
+    taken_names = set(search_images(destination_project))
+    new_names = {}
+    for image_name in to_copy:
+        new_names[image_name] = _get_copy_name(image_name, taken_names)
+        taken_names.add(new_names[image_name])
+    source_names = {v: k for k, v in new_names.items()}
+
+    logger.info(
+        "Copying %s images from %s to %s.", len(to_copy),
+        source_project["name"], destination_project["name"]
+    )
+    image_quality_in_editor = _get_project_image_quality_in_editor(
+        destination_project, None
+    )
+    image_upload_options = _get_image_upload_options()
+
+    def _prepare(_, image_name):
+        return get_image_array_to_upload(
+            _get_image_bytes(images[image_name], "original"),
+            image_quality_in_editor, **image_upload_options
+        )
+
+    # images get their annotation status when they are created
+    by_status = {}
+    for image_name in to_copy:
+        status = images[image_name]["annotation_status"
+                                   ] if copy_annotation_status else 1
+        by_status.setdefault(status, []).append(image_name)
+    copied = []
+    for status, names in by_status.items():
+        uploaded, not_uploaded = __upload_images(
+            destination_project,
+            ((new_names[name], name, None) for name in names), _prepare, status,
+            len(names)
+        )
+        copied += [source_names[name] for name in uploaded]
+        not_copied += [source_names[name] for name in not_uploaded]
+
+    pinned = [name for name in copied if copy_pin and images[name]["is_pinned"]]
+    if copied and (include_annotations or pinned):
+        failed = _copy_images_annotations_and_pins(
+            source_project, destination_project, new_names,
+            copied if include_annotations else [], pinned
+        )
+        copied = [name for name in copied if name not in failed]
+        not_copied += [name for name in to_copy if name in failed]
+
+    logger.info(
+        "Copied %s images from %s to %s.", len(copied), source_project["name"],
+        destination_project["name"]
+    )
+    return {name: new_names[name] for name in copied}, not_copied
+
+
+def _copy_images_annotations_and_pins(
+    source_project, destination_project, new_names, to_annotate, to_pin
+):
+    """Copies annotations and pins of images copied to new_names in the
+    destination project after they become available there.
+
+    :return: names of the source images for which it failed
+    :rtype: set of strs
+    """
+    failed = set()
+    futures = {
+        name:
+            _image_readiness_watcher.watch(
+                destination_project, new_names[name], _COPY_READINESS_TIMEOUT
+            )
+        for name in set(to_annotate + to_pin)
+    }
+    for name, future in futures.items():
+        try:
+            future.result()
+        except SABaseException as e:
+            logger.warning("Couldn't copy image %s: %s", name, e)
+            failed.add(name)
+    if _cache.is_enabled():
+        # destination metadata are listed once for all images
+        invalidate_images_index(destination_project)
+        _get_images_index(destination_project)
+
+    def _upload_annotations(result):
+        if result["error"] is not None:
+            raise result["error"]
+        if result["annotation_json"] is None:
+            return
+        upload_annotations_from_json_to_image(
+            destination_project,
+            new_names[result["image_name"]],
+            result["annotation_json"],
+            result.get("annotation_mask"),
+            verbose=False
+        )
+
+    to_annotate = [name for name in to_annotate if name not in failed]
+    if to_annotate:
+        annotations = get_images_annotations(source_project, to_annotate)
+        with contextlib.closing(annotations):
+            for _, result, _, exception in iter_bulk(
+                _upload_annotations, annotations
+            ):
+                if exception is not None:
+                    logger.warning(
+                        "Couldn't copy annotations of image %s: %s",
+                        result["image_name"], exception
+                    )
+                    failed.add(result["image_name"])
+
+    to_pin = [name for name in to_pin if name not in failed]
+    if to_pin:
+        _, not_pinned = pin_images(
+            destination_project, [new_names[name] for name in to_pin]
+        )
+        source_names = {new_names[name]: name for name in to_pin}
+        failed.update(source_names[name] for name in not_pinned)
+    return failed
+
+
+def move_images(
+    source_project,
+    image_names,
+    destination_project,
+    include_annotations=True,
+    copy_annotation_status=True,
+    copy_pin=True
+):
+    """Move images from source_project to destination_project with
+    :py:func:`copy_images`. Only the images that were fully copied are
+    deleted from source_project. source_project and destination_project
+    cannot be the same.
+
+    :param source_project: project name or metadata of the project of source project
+    :type source_project: str or dict
+    :param image_names: names of the images to move. If None, all images of
+                        the source project are moved
+    :type image_names: list of strs
+    :param destination_project: project name or metadata of the project of destination project
+    :type destination_project: str or dict
+    :param include_annotations: enables annotations move
+    :type include_annotations: bool
+    :param copy_annotation_status: enables annotations status copy
+    :type copy_annotation_status: bool
+    :param copy_pin: enables image pin status copy
+    :type copy_pin: bool
+
+    :return: dict of moved image names to their names in the destination
+             project, and names of the images that couldn't be moved
+    :rtype: tuple (2 members) of dict and list of strs
+    """
+    if not isinstance(source_project, dict):
+        source_project = get_project_metadata(source_project)
+    if not isinstance(destination_project, dict):
+        destination_project = get_project_metadata(destination_project)
+    if source_project == destination_project:
+        raise SABaseException(
+            0, "Cannot move images if source_project == destination_project."
+        )
+    copied, not_moved = copy_images(
+        source_project, image_names, destination_project, include_annotations,
+        copy_annotation_status, copy_pin
+    )
+    result = run_bulk(
+        lambda name: delete_image(source_project, name),
+        list(copied),
+        show_progress=False
+    )
+    for name, exception in result.failed:
+        logger.warning(
+            "Couldn't delete moved image %s from %s: %s", name,
+            source_project["name"], exception
+        )
+    logger.info(
+        "Deleted %s moved images from %s.", len(result.succeeded),
+        source_project["name"]
+    )
+    return copied, not_moved
+
+
 def move_image(
     source_project,
     image_name,
@@ -256,20 +633,31 @@ def pin_image(project, image_name, pin=True):
     if not isinstance(project, dict):
         project = get_project_metadata(project)
     img_metadata = get_image_metadata(project, image_name)
-    team_id, project_id, image_id = project["team_id"], project[
-        "id"], img_metadata["id"]
-    params = {"team_id": team_id, "project_id": project_id}
-    json_req = {"is_pinned": int(pin)}
-    response = _api.send_request(
-        req_type='PUT',
-        path=f'/image/{image_id}',
-        params=params,
-        json_req=json_req
+    _update_image(project, img_metadata, {"is_pinned": int(pin)})
+
+
+def pin_images(project, image_names, pin=True):
+    """Pins (or unpins) multiple images. Images are resolved with one image
+    listing and updated concurrently by the workers set with
+    :py:func:`set_max_workers`.
+
+    :param project: project name or metadata of the project
+    :type project: str or dict
+    :param image_names: image names
+    :type image_names: list of strs
+    :param pin: sets to pin if True, else unpins images
+    :type pin: bool
+
+    :return: updated and not-updated image names
+    :rtype: tuple (2 members) of list of strs
+    """
+    if not isinstance(project, dict):
+        project = get_project_metadata(project)
+    logger.info(
+        "%s %s images in project %s.", "Pinning" if pin else "Unpinning",
+        len(image_names), project["name"]
     )
-    if not response.ok:
-        raise SABaseException(
-            response.status_code, "Couldn't pin image " + response.text
-        )
+    return _update_images(project, image_names, {"is_pinned": int(pin)})
 
 
 def assign_images(project, image_names, user):
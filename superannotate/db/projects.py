@@ -1,16 +1,16 @@
+import concurrent.futures
+import contextlib
 import copy
+import functools
 import io
 import json
 import logging
-import math
+import multiprocessing
 import os
-import random
-import threading
-import tempfile
+import queue
 import time
 from pathlib import Path
 
-import boto3
 import cv2
 import ffmpeg
 from PIL import Image
@@ -25,18 +25,31 @@ from ..exceptions import (
     SABaseException, SAExistingProjectNameException,
     SANonExistingProjectNameException
 )
+from . import cache as _cache
 from .annotation_classes import (
+    _get_project_classes_name_to_id,
     create_annotation_classes_from_classes_json, fill_class_and_attribute_ids,
-    get_annotation_classes_name_to_id, search_annotation_classes
+    search_annotation_classes
 )
+from .executor import get_max_workers, iter_bulk, iter_in_background, run_bulk
 from .project import get_project_metadata
+from .s3_clients import get_multipart_threshold, get_s3_client, upload_to_s3
 from .users import get_team_contributor_metadata
-from .images import search_images
+from .images import (
+    _get_existing_image_names, _remove_from_images_index,
+    invalidate_images_index, search_images
+)
 
 logger = logging.getLogger("superannotate-python-sdk")
 
 _api = API.get_instance()
-_NUM_THREADS = 10
+_CREATE_IMAGES_BATCH_SIZE = 100
+# seeking decodes from the preceding keyframe, for shorter gaps between
+# sampled video frames grabbing them one by one is faster
+_VIDEO_SEEK_MIN_GAP = 10.0  # seconds
+_image_upload_processes = 0
+_image_upload_fast = False
+_image_upload_resample = Image.LANCZOS
 
 
 def create_project(project_name, project_description, project_type):
@@ -199,6 +212,8 @@ def delete_project(project):
         raise SABaseException(
             response.status_code, "Couldn't delete project " + response.text
         )
+    _cache.invalidate(team_id, project_id)
+    invalidate_images_index(project)
     logger.info("Successfully deleted project %s.", project["name"])
 
 
@@ -234,6 +249,7 @@ def rename_project(project, new_name):
         raise SABaseException(
             response.status_code, "Couldn't rename project " + response.text
         )
+    _cache.invalidate(team_id, project_id)
     logger.info(
         "Successfully renamed project %s to %s.", project["name"], new_name
     )
@@ -281,7 +297,8 @@ def upload_video_to_project(
     :type project: str or dict
     :param video_path: video to upload
     :type video_path: Pathlike (str or Path)
-    :param target_fps: how many frames per second need to extract from the video (approximate).
+    :param target_fps: how many frames per second need to extract from the video.
+                       Frames are sampled evenly and deterministically.
                        If None, all frames will be uploaded
     :type target_fps: float
     :param start_time: Time (in seconds) from which to start extracting frames
@@ -298,7 +315,51 @@ def upload_video_to_project(
     :return: filenames of uploaded images
     :rtype: list of strs
     """
+    if not isinstance(project, dict):
+        project = get_project_metadata(project)
+    annotation_status = annotation_status_str_to_int(annotation_status)
+    image_quality_in_editor = _get_project_image_quality_in_editor(
+        project, image_quality_in_editor
+    )
     logger.info("Uploading from video %s.", str(video_path))
+    video, rotate_code = _open_video(video_path)
+    video_name = Path(video_path).name
+    existing_names = set(search_images(project, video_name + "_"))
+    frames = _iter_video_frames(
+        video, video_name, rotate_code, target_fps, start_time, end_time,
+        existing_names
+    )
+    image_upload_options = _get_image_upload_options()
+
+    def _prepare(_, frame):
+        images = get_image_array_to_upload(
+            io.BytesIO(frame), image_quality_in_editor, **image_upload_options
+        )
+        return tuple(image.getvalue() for image in images)
+
+    # frames are decoded in a background thread while the previous
+    # ones are uploaded, at most max_workers encoded frames wait in memory
+    frames = iter_in_background(
+        ((name, frame, None) for name, frame in frames), get_max_workers()
+    )
+    with contextlib.closing(frames):
+        uploaded, not_uploaded = __upload_images(
+            project, frames, _prepare, annotation_status
+        )
+    logger.info("Uploaded %s frames from video.", len(uploaded))
+
+    assert len(not_uploaded) == 0
+
+    return sorted(uploaded)
+
+
+def _open_video(video_path):
+    """Opens the video for decoding and finds rotation of its frames from
+    the metadata.
+
+    :return: opened video and cv2 rotate code of the frames or None
+    :rtype: tuple (2 members)
+    """
     rotate_code = None
     try:
         meta_dict = ffmpeg.probe(str(video_path))
@@ -320,81 +381,91 @@ def upload_video_to_project(
     video = cv2.VideoCapture(str(video_path), cv2.CAP_FFMPEG)
     if not video.isOpened():
         raise SABaseException(0, "Couldn't open video file " + str(video_path))
+    return video, rotate_code
 
-    total_num_of_frames = int(video.get(cv2.CAP_PROP_FRAME_COUNT))
-    if total_num_of_frames < 0:
-        if target_fps is not None:
-            logger.warning(
-                "Number of frames indicated in the video is negative number. Disabling FPS change."
-            )
-            target_fps = None
-    else:
-        logger.info("Video frame count is %s.", total_num_of_frames)
 
-    if target_fps is not None:
-        video_fps = video.get(cv2.CAP_PROP_FPS)
-        logger.info(
-            "Video frame rate is %s. Target frame rate is %s.", video_fps,
-            target_fps
-        )
-        if target_fps > video_fps:
-            target_fps = None
+def _iter_video_frames(
+    video,
+    video_name,
+    rotate_code=None,
+    target_fps=None,
+    start_time=0.0,
+    end_time=None,
+    skip_names=()
+):
+    """Decodes frames of the opened video and yields the selected ones as
+    (frame name, JPEG encoded frame bytes). The video is released at the end.
+
+    With target_fps the first frames at or after start_time + k / target_fps
+    (k = 0, 1, ...) are selected, so the sampling is evenly spaced and
+    deterministic. Frames that aren't selected, as well as the ones whose
+    names are in skip_names, are only grabbed, without converting and
+    encoding them. The video is seeked to start_time and over gaps between
+    selected frames longer than _VIDEO_SEEK_MIN_GAP seconds.
+    """
+    try:
+        total_num_of_frames = int(video.get(cv2.CAP_PROP_FRAME_COUNT))
+        if total_num_of_frames < 0:
+            if target_fps is not None:
+                logger.warning(
+                    "Number of frames indicated in the video is negative number. Disabling FPS change."
+                )
+                target_fps = None
         else:
-            r = video_fps / target_fps
-            frames_count_to_drop = total_num_of_frames - (
-                total_num_of_frames / r
-            )
-            percent_to_drop = frames_count_to_drop / total_num_of_frames
-            my_random = random.Random(122222)
+            logger.info("Video frame count is %s.", total_num_of_frames)
 
-    zero_fill_count = len(str(total_num_of_frames))
-    tempdir = tempfile.TemporaryDirectory()
-
-    video_name = Path(video_path).name
-    frame_no = 1
-    while True:
-        success, frame = video.read()
-        if not success:
-            break
-        if target_fps is not None and my_random.random() < percent_to_drop:
-            continue
-        frame_time = video.get(cv2.CAP_PROP_POS_MSEC) / 1000.0
-        if frame_time < start_time:
-            continue
-        if end_time is not None and frame_time > end_time:
-            continue
-        if rotate_code is not None:
-            frame = cv2.rotate(frame, rotate_code)
-        cv2.imwrite(
-            str(
-                Path(tempdir.name) / (
-                    video_name + "_" + str(frame_no).zfill(zero_fill_count) +
-                    ".jpg"
+        video_fps = video.get(cv2.CAP_PROP_FPS)
+        if target_fps is not None:
+            logger.info(
+                "Video frame rate is %s. Target frame rate is %s.", video_fps,
+                target_fps
+            )
+            if target_fps > video_fps:
+                target_fps = None
+        # frame timestamps are compared with half a frame tolerance
+        tolerance = 0.5 / video_fps if video_fps > 0 else 0.0
+
+        zero_fill_count = len(str(total_num_of_frames))
+        frame_no = 1
+        sample_no = 0
+        next_time = start_time
+        if start_time > 0:
+            video.set(cv2.CAP_PROP_POS_MSEC, start_time * 1000.0)
+        while True:
+            if not video.grab():
+                break
+            frame_time = video.get(cv2.CAP_PROP_POS_MSEC) / 1000.0
+            if end_time is not None and frame_time > end_time + tolerance:
+                break
+            if frame_time < next_time - tolerance:
+                if next_time - frame_time > _VIDEO_SEEK_MIN_GAP:
+                    video.set(cv2.CAP_PROP_POS_MSEC, next_time * 1000.0)
+                continue
+            if target_fps is not None:
+                while next_time <= frame_time + tolerance:
+                    sample_no += 1
+                    next_time = start_time + sample_no / target_fps
+            frame_name = video_name + "_" + str(frame_no).zfill(
+                zero_fill_count
+            ) + ".jpg"
+            frame_no += 1
+            if frame_name in skip_names:
+                logger.warning(
+                    "Image %s already exists in the project, it won't be uploaded.",
+                    frame_name
                 )
-            ), frame
-        )
-        frame_no += 1
-
-    logger.info(
-        "Extracted %s frames from video. Now uploading to platform.",
-        frame_no - 1
-    )
-
-    filenames = upload_images_from_folder_to_project(
-        project,
-        tempdir.name,
-        extensions=["jpg"],
-        annotation_status=annotation_status,
-        image_quality_in_editor=image_quality_in_editor
-    )
-
-    assert len(filenames[1]) == 0
-
-    filenames_base = []
-    for file in filenames[0]:
-        filenames_base.append(Path(file).name)
-
-    return filenames_base
+                continue
+            success, frame = video.retrieve()
+            if not success:
+                break
+            if rotate_code is not None:
+                frame = cv2.rotate(frame, rotate_code)
+            success, encoded = cv2.imencode(".jpg", frame)
+            if not success:
+                raise SABaseException(0, "Couldn't encode frame " + frame_name)
+            yield frame_name, encoded.tobytes()
+    finally:
+        video.release()
 
 
 def upload_videos_from_folder_to_project(
@@ -407,11 +478,16 @@ def upload_videos_from_folder_to_project(
     start_time=0.0,
     end_time=None,
     annotation_status="NotStarted",
-    image_quality_in_editor=None
+    image_quality_in_editor=None,
+    processes=None,
+    return_video_results=False
 ):
     """Uploads image frames from all videos with given extensions from folder_path to the project.
     Sets status of all the uploaded images to set_status if it is not None.
 
+    Videos are decoded in parallel worker processes, which feed frames to
+    the shared upload workers (see :py:func:`set_max_workers`).
+
     :param project: project name or metadata of the project to upload videos to
     :type project: str or dict
     :param folder_path: from which folder to upload the videos
@@ -423,7 +499,7 @@ def upload_videos_from_folder_to_project(
     :type exclude_file_patterns: list of strs
     :param recursive_subfolders: enable recursive subfolder parsing
     :type recursive_subfolders: bool
-    :param target_fps: how many frames per second need to extract from the video (approximate).
+    :param target_fps: how many frames per second need to extract from the video. Frames are sampled evenly.
                        If None, all frames will be uploaded
     :type target_fps: float
     :param start_time: Time (in seconds) from which to start extracting frames
@@ -435,9 +511,17 @@ def upload_videos_from_folder_to_project(
     :param image_quality_in_editor: image quality be seen in SuperAnnotate web annotation editor.
            Can be either "compressed" or "original".  If None then the default value in project settings will be used.
     :type image_quality_in_editor: str
-
-    :return: uploaded and not-uploaded video frame images' filenames
-    :rtype: tuple of list of strs
+    :param processes: number of videos decoded in parallel. If None, the number
+                      of CPUs, but not more than the number of videos
+    :type processes: int
+    :param return_video_results: return results for each video instead of
+                                 all uploaded frame names
+    :type return_video_results: bool
+
+    :return: uploaded video frame images' filenames or, with return_video_results,
+             dict of video path to dict with "uploaded" and "not_uploaded"
+             frame filenames and "error" (None or exception of the video decoding)
+    :rtype: list of strs or dict
     """
     if not isinstance(project, dict):
         project = get_project_metadata(project)
@@ -477,21 +561,164 @@ def upload_videos_from_folder_to_project(
         if all(not_in_exclude_list):
             filtered_paths.append(path)
 
+    if processes is None:
+        processes = min(os.cpu_count() or 1, max(len(filtered_paths), 1))
+    elif not isinstance(processes, int) or processes < 1:
+        raise SABaseException(0, "processes should be a positive integer")
+    annotation_status = annotation_status_str_to_int(annotation_status)
+    image_quality_in_editor = _get_project_image_quality_in_editor(
+        project, image_quality_in_editor
+    )
+    results = {
+        str(path): {
+            "uploaded": [],
+            "not_uploaded": [],
+            "error": None
+        }
+        for path in filtered_paths
+    }
+    video_of_frame = {}
+
+    def _on_video_error(video_path, error):
+        logger.warning("Couldn't decode video %s: %s", video_path, error)
+        results[video_path]["error"] = error
+
+    frames = _iter_videos_frames(
+        project, [str(path) for path in filtered_paths], processes,
+        video_of_frame, _on_video_error, target_fps, start_time, end_time
+    )
+    image_upload_options = _get_image_upload_options()
+
+    def _prepare(_, frame):
+        images = get_image_array_to_upload(
+            io.BytesIO(frame), image_quality_in_editor, **image_upload_options
+        )
+        return tuple(image.getvalue() for image in images)
+
+    if filtered_paths:
+        with contextlib.closing(frames):
+            uploaded, not_uploaded = __upload_images(
+                project, frames, _prepare, annotation_status
+            )
+        for key, names in (
+            ("uploaded", uploaded), ("not_uploaded", not_uploaded)
+        ):
+            for name in names:
+                results[video_of_frame[name]][key].append(name)
     filenames = []
-    for path in filtered_paths:
-        filenames += upload_video_to_project(
-            project,
-            path,
-            target_fps=target_fps,
-            start_time=start_time,
-            end_time=end_time,
-            annotation_status=annotation_status,
-            image_quality_in_editor=image_quality_in_editor
+    for video_path, result in results.items():
+        result["uploaded"].sort()
+        result["not_uploaded"].sort()
+        logger.info(
+            "Uploaded %s frames from video %s.", len(result["uploaded"]),
+            video_path
         )
+        for name in result["not_uploaded"]:
+            logger.warning("Couldn't upload video frame %s", name)
+        filenames += result["uploaded"]
 
+    if return_video_results:
+        return results
     return filenames
 
 
+_video_frames_queue = None
+_video_stop_event = None
+
+
+def _init_video_decode_process(frames_queue, stop_event):
+    global _video_frames_queue, _video_stop_event
+    _video_frames_queue = frames_queue
+    _video_stop_event = stop_event
+
+
+def _decode_video_to_queue(
+    video_path, skip_names, target_fps, start_time, end_time
+):
+    """Runs in video decoding worker processes. Puts (video_path, frame name,
+    JPEG encoded frame) to the frames queue and (video_path, None, exception
+    or None) when the video is done.
+    """
+    try:
+        video, rotate_code = _open_video(video_path)
+        frames = _iter_video_frames(
+            video,
+            Path(video_path).name, rotate_code, target_fps, start_time,
+            end_time, skip_names
+        )
+        with contextlib.closing(frames):
+            for name, frame in frames:
+                if _video_stop_event.is_set():
+                    break
+                _video_frames_queue.put((video_path, name, frame))
+    except Exception as e:  # pylint: disable=broad-except
+        _video_frames_queue.put((video_path, None, e))
+    else:
+        _video_frames_queue.put((video_path, None, None))
+
+
+def _iter_videos_frames(
+    project, video_paths, processes, video_of_frame, on_error, target_fps,
+    start_time, end_time
+):
+    """Decodes the videos in a process pool and yields their frames as
+    (frame name, JPEG encoded frame, None) in the order they are decoded.
+    At most 2 * max_workers decoded frames wait in the queue. Video path of
+    each yielded frame name is set in video_of_frame, on_error(video_path,
+    exception) is called for videos that couldn't be decoded.
+    """
+    frames_queue = multiprocessing.Queue(2 * get_max_workers())
+    stop_event = multiprocessing.Event()
+    futures = {}
+    with concurrent.futures.ProcessPoolExecutor(
+        processes,
+        initializer=_init_video_decode_process,
+        initargs=(frames_queue, stop_event)
+    ) as pool:
+        try:
+            for video_path in video_paths:
+                logger.info("Uploading from video %s.", video_path)
+                # frames already in the project aren't decoded again
+                skip_names = set(
+                    search_images(project,
+                                  Path(video_path).name + "_")
+                )
+                future = pool.submit(
+                    _decode_video_to_queue, video_path, skip_names, target_fps,
+                    start_time, end_time
+                )
+                futures[future] = video_path
+            remaining = set(video_paths)
+            while remaining:
+                try:
+                    video_path, name, frame = frames_queue.get(timeout=1)
+                except queue.Empty:
+                    # worker process could have been terminated
+                    for future, video_path in futures.items():
+                        if video_path in remaining and future.done(
+                        ) and future.exception() is not None:
+                            remaining.discard(video_path)
+                            on_error(video_path, future.exception())
+                    continue
+                if name is not None:
+                    video_of_frame[name] = video_path
+                    yield name, frame, None
+                    continue
+                remaining.discard(video_path)
+                if frame is not None:
+                    on_error(video_path, frame)
+        finally:
+            stop_event.set()
+            for future in futures:
+                future.cancel()
+            # unblock workers waiting to put frames to the full queue
+            while not all(future.done() for future in futures):
+                try:
+                    frames_queue.get(timeout=0.1)
+                except queue.Empty:
+                    pass
+
+
 def upload_images_from_folder_to_project(
     project,
     folder_path,
@@ -566,7 +793,7 @@ def upload_images_from_folder_to_project(
                         Path(folder_path).rglob(f'*.{extension.upper()}')
                     )
     else:
-        s3_client = boto3.client('s3')
+        s3_client = get_s3_client()
         paginator = s3_client.get_paginator('list_objects_v2')
         response_iterator = paginator.paginate(
             Bucket=from_s3_bucket, Prefix=folder_path
@@ -598,20 +825,71 @@ def upload_images_from_folder_to_project(
     )
 
 
-def get_image_array_to_upload(byte_io_orig, image_quality_in_editor):
+def _has_alpha(im):
+    alpha_modes = ('RGBA', 'RGBa', 'LA', 'La', 'PA')
+    return im.mode in alpha_modes or 'transparency' in im.info
+
+
+def get_image_array_to_upload(
+    byte_io_orig, image_quality_in_editor, fast=False, resample=Image.LANCZOS
+):
+    """Generates lores, huge (600px wide) and thumbnail (128x96) versions of
+    the image for the SuperAnnotate editor.
+
+    :param byte_io_orig: image file contents
+    :type byte_io_orig: io.BytesIO
+    :param image_quality_in_editor: JPEG quality of lores version, 60 or 100
+    :type image_quality_in_editor: int
+    :param fast: when lores version doesn't need decoding (JPEG with quality 100)
+                 decode JPEG at reduced scale, compose on white background only
+                 images with alpha channel, downscale in integer reduce steps
+                 before resampling and make the thumbnail from the huge version.
+                 Derived versions can differ from the default path by rounding.
+    :type fast: bool
+    :param resample: PIL resampling filter for huge and thumbnail versions
+    :type resample: int
+
+    :return: original, lores, huge and thumbnail images
+    :rtype: tuple (4 members) of io.BytesIO
+    """
+    byte_io_lores, byte_io_huge, byte_io_thumbs = _get_image_versions(
+        byte_io_orig, image_quality_in_editor, fast, resample
+    )
+    if byte_io_lores is None:
+        byte_io_lores = io.BytesIO(byte_io_orig.getbuffer())
+    byte_io_orig.seek(0)
+
+    return byte_io_orig, byte_io_lores, byte_io_huge, byte_io_thumbs
+
+
+def _get_image_versions(file, image_quality_in_editor, fast, resample):
+    """Generates editor versions of the image in binary file object file.
+
+    :return: lores, huge and thumbnail images. lores is None if it is the
+             same as the original image
+    :rtype: tuple (3 members) of io.BytesIO
+    """
     Image.MAX_IMAGE_PIXELS = None
-    im = Image.open(byte_io_orig)
+    im = Image.open(file)
     im_format = im.format
     width, height = im.size
+    hsize = int(height * 600.0 / width)
 
     if image_quality_in_editor == 100 and im_format in ['JPEG', 'JPG']:
-        byte_io_lores = io.BytesIO(byte_io_orig.getbuffer())
+        byte_io_lores = None
+        if fast:
+            # lores is the original file, so full resolution pixels
+            # are not needed
+            im.draft(im.mode, (600, hsize))
     else:
         byte_io_lores = io.BytesIO()
-        bg = Image.new('RGBA', im.size, (255, 255, 255))
-        im = im.convert("RGBA")
-        bg.paste(im, mask=im)
-        bg = bg.convert('RGB')
+        if fast and not _has_alpha(im):
+            bg = im if im.mode == 'RGB' else im.convert('RGB')
+        else:
+            bg = Image.new('RGBA', im.size, (255, 255, 255))
+            im = im.convert("RGBA")
+            bg.paste(im, mask=im)
+            bg = bg.convert('RGB')
         if image_quality_in_editor == 100:
             bg.save(
                 byte_io_lores,
@@ -624,13 +902,18 @@ def get_image_array_to_upload(byte_io_orig, image_quality_in_editor):
         im = bg
 
     byte_io_huge = io.BytesIO()
-    hsize = int(height * 600.0 / width)
-    im.resize((600, hsize), Image.ANTIALIAS).save(byte_io_huge, 'JPEG')
+    if fast:
+        im_huge = im.resize((600, hsize), resample, reducing_gap=3.0)
+    else:
+        im_huge = im.resize((600, hsize), resample)
+    im_huge.save(byte_io_huge, 'JPEG')
 
     byte_io_thumbs = io.BytesIO()
     thumbnail_size = (128, 96)
     background = Image.new('RGB', thumbnail_size, "black")
-    im.thumbnail(thumbnail_size, Image.ANTIALIAS)
+    if fast:
+        im = im_huge
+    im.thumbnail(thumbnail_size, resample)
     (w, h) = im.size
     background.paste(
         im, ((thumbnail_size[0] - w) // 2, (thumbnail_size[1] - h) // 2)
@@ -639,80 +922,113 @@ def get_image_array_to_upload(byte_io_orig, image_quality_in_editor):
     im.save(byte_io_thumbs, 'JPEG')
 
     byte_io_thumbs.seek(0)
-    byte_io_lores.seek(0)
+    if byte_io_lores is not None:
+        byte_io_lores.seek(0)
     byte_io_huge.seek(0)
-    byte_io_orig.seek(0)
 
-    return byte_io_orig, byte_io_lores, byte_io_huge, byte_io_thumbs
+    return byte_io_lores, byte_io_huge, byte_io_thumbs
+
+
+def set_image_upload_options(processes=None, fast=None, resample=None):
+    """Configures how images are prepared for upload by upload_images_to_project,
+    upload_image_to_project and the functions based on them.
+
+    :param processes: number of worker processes that decode images and generate
+                      their lores, huge and thumbnail versions, which otherwise is
+                      done in the upload threads and is limited to one CPU core.
+                      0 disables the process pool.
+    :type processes: int
+    :param fast: use reduced scale decoding for huge and thumbnail versions
+                 (see fast argument of get_image_array_to_upload). Disabled by default,
+                 as it can change the versions by rounding
+    :type fast: bool
+    :param resample: PIL resampling filter for huge and thumbnail versions,
+                     e.g., PIL.Image.LANCZOS (default) or PIL.Image.BILINEAR
+    :type resample: int
+    """
+    global _image_upload_processes, _image_upload_fast, _image_upload_resample
+    if processes is not None:
+        if not isinstance(processes, int) or processes < 0:
+            raise SABaseException(
+                0, "processes should be a non-negative integer"
+            )
+        _image_upload_processes = processes
+    if fast is not None:
+        _image_upload_fast = fast
+    if resample is not None:
+        _image_upload_resample = resample
 
 
-def __upload_images_to_aws_thread(
-    res,
-    img_paths,
-    project,
-    annotation_status,
-    prefix,
-    thread_id,
-    chunksize,
-    couldnt_upload,
-    uploaded,
+def _get_image_upload_options():
+    return {"fast": _image_upload_fast, "resample": _image_upload_resample}
+
+
+def _prepare_image_to_upload(
+    path,
     image_quality_in_editor,
     from_s3_bucket=None,
+    fast=False,
+    resample=Image.LANCZOS
 ):
-    len_img_paths = len(img_paths)
-    start_index = thread_id * chunksize
-    end_index = start_index + chunksize
+    """Reads the image and generates its versions to upload. Local files
+    of at least multipart upload threshold size aren't kept in memory,
+    their path is returned instead of the original (and of the lores
+    version if it is the same as the original) to stream them from disk.
+
+    :return: original, lores, huge and thumbnail image bytes or paths
+    :rtype: tuple (4 members) of bytes or Paths
+    """
     if from_s3_bucket is not None:
-        from_session = boto3.Session()
-        from_s3 = from_session.resource('s3')
-    if start_index >= len_img_paths:
-        return
-    s3_session = boto3.Session(
-        aws_access_key_id=res['accessKeyId'],
-        aws_secret_access_key=res['secretAccessKey'],
-        aws_session_token=res['sessionToken']
-    )
-    s3_resource = s3_session.resource('s3')
-    bucket = s3_resource.Bucket(res["bucket"])
-    prefix = res['filePath']
-    uploaded_imgs = []
-    for i in range(start_index, end_index):
-        if i >= len_img_paths:
-            break
-        path = img_paths[i]
-        key = prefix + f'{Path(path).name}'
-        try:
-            if from_s3_bucket is not None:
-                file = io.BytesIO()
-                from_s3_object = from_s3.Object(from_s3_bucket, path)
-                from_s3_object.download_fileobj(file)
-            else:
-                with open(path, "rb") as f:
-                    file = io.BytesIO(f.read())
-        except Exception as e:
-            logger.warning("Unable to open image %s.", e)
-            couldnt_upload[thread_id].append(path)
-            continue
-        try:
-            orig_image, lores_image, huge_image, thumbnail_image = get_image_array_to_upload(
-                file, image_quality_in_editor
+        file = io.BytesIO()
+        get_s3_client().download_fileobj(from_s3_bucket, path, file)
+    elif os.path.getsize(path) >= get_multipart_threshold():
+        with open(path, "rb") as f:
+            lores, huge, thumbnail = _get_image_versions(
+                f, image_quality_in_editor, fast, resample
             )
-            bucket.put_object(Body=orig_image, Key=key)
-            bucket.put_object(Body=lores_image, Key=key + '___lores.jpg')
-            bucket.put_object(Body=huge_image, Key=key + '___huge.jpg')
-            bucket.put_object(Body=thumbnail_image, Key=key + '___thumb.jpg')
-        except Exception as e:
-            logger.warning("Unable to upload to data server %s.", e)
-            couldnt_upload[thread_id].append(path)
-        else:
-            uploaded[thread_id].append(path)
-            uploaded_imgs.append(path)
-            if len(uploaded_imgs) >= 100:
-                __create_image(
-                    uploaded_imgs, project, annotation_status, prefix
-                )
-                uploaded_imgs = []
-    __create_image(uploaded_imgs, project, annotation_status, prefix)
+        return (
+            Path(path), Path(path) if lores is None else lores.getvalue(),
+            huge.getvalue(), thumbnail.getvalue()
+        )
+    else:
+        with open(path, "rb") as f:
+            file = io.BytesIO(f.read())
+    return tuple(
+        image.getvalue() for image in get_image_array_to_upload(
+            file, image_quality_in_editor, fast, resample
+        )
+    )
+
+
+def _iter_prepared_images(
+    img_paths, image_quality_in_editor, from_s3_bucket, processes
+):
+    """Prepares images in a process pool. At most 2 * processes images are
+    pending, so that prepared images don't pile up in memory when uploads are
+    slower.
+
+    Yields (path, prepared images, exception) in completion order.
+    """
+    prepare = functools.partial(
+        _prepare_image_to_upload,
+        image_quality_in_editor=image_quality_in_editor,
+        from_s3_bucket=from_s3_bucket,
+        **_get_image_upload_options()
+    )
+    with concurrent.futures.ProcessPoolExecutor(processes) as pool:
+        for _, path, images, exception in iter_bulk(
+            prepare, img_paths, processes, pool=pool
+        ):
+            yield path, images, exception
+
+
+def __upload_image_to_aws(path, images, prefix, s3_client, bucket):
+    orig_image, lores_image, huge_image, thumbnail_image = images
+    key = prefix + f'{Path(path).name}'
+    upload_to_s3(s3_client, orig_image, bucket, key)
+    upload_to_s3(s3_client, lores_image, bucket, key + '___lores.jpg')
+    upload_to_s3(s3_client, huge_image, bucket, key + '___huge.jpg')
+    upload_to_s3(s3_client, thumbnail_image, bucket, key + '___thumb.jpg')
 
 
 def __create_image(img_paths, project, annotation_status, remote_dir):
@@ -738,6 +1054,29 @@ def __create_image(img_paths, project, annotation_status, remote_dir):
         raise SABaseException(
             response.status_code, "Couldn't ext-create image " + response.text
         )
+    _remove_from_images_index(
+        project, [image["name"] for image in data["images"]]
+    )
+
+
+def _split_duplicate_image_paths(project, img_paths):
+    """Splits img_paths to the paths to upload and the paths whose image names
+    already exist in the project. Only the first path with an existing
+    image name is treated as duplicate, input order is kept in both lists.
+
+    :return: paths to upload, duplicate paths
+    :rtype: tuple (2 members) of lists
+    """
+    image_names = [Path(img_path).name for img_path in img_paths]
+    existing_names = _get_existing_image_names(project, image_names)
+    to_upload, duplicates = [], []
+    for img_path, image_name in zip(img_paths, image_names):
+        if image_name in existing_names:
+            existing_names.remove(image_name)
+            duplicates.append(img_path)
+        else:
+            to_upload.append(img_path)
+    return to_upload, duplicates
 
 
 def upload_images_to_project(
@@ -779,18 +1118,9 @@ def upload_images_to_project(
     image_quality_in_editor = _get_project_image_quality_in_editor(
         project, image_quality_in_editor
     )
-    team_id, project_id = project["team_id"], project["id"]
-    existing_images = search_images(project)
-    duplicate_images = []
-    for existing_image in existing_images:
-        i = -1
-        for j, img_path in enumerate(img_paths):
-            if str(img_path).endswith(existing_image):
-                i = j
-                break
-        if i != -1:
-            duplicate_images.append(img_paths[i])
-            del img_paths[i]
+    img_paths, duplicate_images = _split_duplicate_image_paths(
+        project, img_paths
+    )
     if len(duplicate_images) != 0:
         logger.warning(
             "%s already existing images found that won't be uploaded.",
@@ -802,145 +1132,175 @@ def upload_images_to_project(
     )
     if len_img_paths == 0:
         return ([], [], duplicate_images)
+    if _image_upload_processes > 0:
+        prepared = _iter_prepared_images(
+            img_paths, image_quality_in_editor, from_s3_bucket,
+            _image_upload_processes
+        )
+    else:
+        prepared = ((path, None, None) for path in img_paths)
+
+    def _prepare(path, images):
+        if images is None:
+            images = _prepare_image_to_upload(
+                path, image_quality_in_editor, from_s3_bucket,
+                **_get_image_upload_options()
+            )
+        return images
+
+    with contextlib.closing(prepared):
+        list_of_uploaded, list_of_not_uploaded = __upload_images(
+            project, prepared, _prepare, annotation_status, len_img_paths
+        )
+    for file in list_of_not_uploaded:
+        logger.warning("Couldn't upload image %s", file)
+
+    return (list_of_uploaded, list_of_not_uploaded, duplicate_images)
+
+
+def __get_image_upload_token(project):
+    team_id, project_id = project["team_id"], project["id"]
     params = {
         'team_id': team_id,
     }
-    uploaded = []
-    for _ in range(_NUM_THREADS):
-        uploaded.append([])
-    couldnt_upload = []
-    for _ in range(_NUM_THREADS):
-        couldnt_upload.append([])
-    finish_event = threading.Event()
-    chunksize = int(math.ceil(len(img_paths) / _NUM_THREADS))
-    tqdm_thread = threading.Thread(
-        target=__tqdm_thread_image_upload,
-        args=(len_img_paths, uploaded, couldnt_upload, finish_event)
-    )
-    tqdm_thread.start()
     response = _api.send_request(
         req_type='GET',
         path=f'/project/{project_id}/sdkImageUploadToken',
         params=params
     )
-    if response.ok:
-        res = response.json()
-        prefix = res['filePath']
-    else:
+    if not response.ok:
         raise SABaseException(
             response.status_code, "Couldn't get upload token " + response.text
         )
+    return response.json()
 
-    threads = []
-    for thread_id in range(_NUM_THREADS):
-        t = threading.Thread(
-            target=__upload_images_to_aws_thread,
-            args=(
-                res, img_paths, project, annotation_status, prefix, thread_id,
-                chunksize, couldnt_upload, uploaded, image_quality_in_editor,
-                from_s3_bucket
-            )
+
+def __upload_images(project, items, prepare, annotation_status, total=None):
+    """Uploads images to the data storage in the upload workers and creates
+    them in the project in batches. Items are taken from items as workers
+    become free, so it can be a lazily produced iterator.
+
+    :param items: (path, images, exception) tuples. Image versions to upload
+                  are got with prepare(path, images) in the upload workers,
+                  image name is the name of the path
+    :type items: iterable
+    :param prepare: function that returns original, lores, huge and thumbnail
+                    images (bytes, file objects or file paths)
+    :type prepare: callable
+
+    :return: uploaded, could-not-upload paths
+    :rtype: tuple (2 members) of list of strs
+    """
+    res = __get_image_upload_token(project)
+    prefix = res['filePath']
+    s3_client = get_s3_client(res)
+
+    def _upload(item):
+        path, images, exception = item
+        if exception is not None:
+            raise exception
+        __upload_image_to_aws(
+            path, prepare(path, images), prefix, s3_client, res["bucket"]
         )
-        threads.append(t)
-        t.start()
-    for t in threads:
-        t.join()
-    finish_event.set()
-    tqdm_thread.join()
-    list_of_not_uploaded = []
-    for couldnt_upload_thread in couldnt_upload:
-        for file in couldnt_upload_thread:
-            logger.warning("Couldn't upload image %s", file)
-            list_of_not_uploaded.append(str(file))
+
     list_of_uploaded = []
-    for upload_thread in uploaded:
-        for file in upload_thread:
-            list_of_uploaded.append(str(file))
+    list_of_not_uploaded = []
+    to_create = []
 
-    return (list_of_uploaded, list_of_not_uploaded, duplicate_images)
+    def _create_images():
+        try:
+            __create_image(to_create, project, annotation_status, prefix)
+        except SABaseException as e:
+            logger.warning("Couldn't create images %s", e)
+            list_of_not_uploaded.extend(str(path) for path in to_create)
+        else:
+            list_of_uploaded.extend(str(path) for path in to_create)
+        to_create.clear()
+
+    with tqdm(total=total) as pbar:
+        for _, (path, _, _), _, exception in iter_bulk(_upload, items):
+            if exception is not None:
+                logger.warning(
+                    "Unable to upload image %s to data server %s.", path,
+                    exception
+                )
+                list_of_not_uploaded.append(str(path))
+            else:
+                to_create.append(path)
+                if len(to_create) >= _CREATE_IMAGES_BATCH_SIZE:
+                    _create_images()
+            pbar.update(1)
+    _create_images()
+    return list_of_uploaded, list_of_not_uploaded
 
 
-def __upload_annotations_thread(
-    team_id, project_id, project_type, anns_filenames, folder_path,
-    annotation_classes_dict, thread_id, chunksize, num_uploaded, from_s3_bucket,
-    actually_uploaded
+def __get_annotation_upload_targets(
+    team_id, project_id, image_names, postfix_json
 ):
+    """Yields (image_name, remote image path, S3 client, S3 bucket) for
+    annotation uploads, getting upload paths and credentials for images in
+    chunks.
+    """
     NUM_TO_SEND = 500
-    len_anns = len(anns_filenames)
-    start_index = thread_id * chunksize
-    if start_index >= len_anns:
-        return
-    end_index = min(start_index + chunksize, len_anns)
-
-    postfix_json = '___objects.json' if project_type == 1 else '___pixel.json'
-    len_postfix_json = len(postfix_json)
-    postfix_mask = '___save.png'
-    if from_s3_bucket is not None:
-        from_session = boto3.Session()
-        from_s3 = from_session.resource('s3')
-
-    for i in range(start_index, end_index, NUM_TO_SEND):
-        data = {"project_id": project_id, "team_id": team_id, "names": []}
-        for j in range(i, i + NUM_TO_SEND):
-            if j >= end_index:
-                break
-            image_name = anns_filenames[j][:-len_postfix_json]
-            data["names"].append(image_name)
+    for i in range(0, len(image_names), NUM_TO_SEND):
+        data = {
+            "project_id": project_id,
+            "team_id": team_id,
+            "names": image_names[i:i + NUM_TO_SEND]
+        }
         response = _api.send_request(
             req_type='POST',
             path='/images/getAnnotationsPathsAndTokens',
             json_req=data
         )
+        if not response.ok:
+            raise SABaseException(
+                response.status_code,
+                "Couldn't get annotation upload tokens " + response.text
+            )
         res = response.json()
         if len(res["images"]) != len(data["names"]):
             logger.warning("Couldn't find all the images for annotation JSONs.")
         aws_creds = res["creds"]
-        s3_session = boto3.Session(
-            aws_access_key_id=aws_creds['accessKeyId'],
-            aws_secret_access_key=aws_creds['secretAccessKey'],
-            aws_session_token=aws_creds['sessionToken']
-        )
-        s3_resource = s3_session.resource('s3')
-        bucket = s3_resource.Bucket(aws_creds["bucket"])
-
+        s3_client = get_s3_client(aws_creds)
         for image_name, image_path in res['images'].items():
-            json_filename = image_name + postfix_json
-            if from_s3_bucket is None:
-                annotation_json = json.load(
-                    open(Path(folder_path) / json_filename)
-                )
-            else:
-                file = io.BytesIO()
-                from_s3_object = from_s3.Object(
-                    from_s3_bucket, folder_path + json_filename
-                )
-                from_s3_object.download_fileobj(file)
-                file.seek(0)
-                annotation_json = json.load(file)
+            yield image_name, image_path, s3_client, aws_creds["bucket"]
 
-            fill_class_and_attribute_ids(
-                annotation_json, annotation_classes_dict
-            )
-            bucket.put_object(
-                Key=image_path + postfix_json, Body=json.dumps(annotation_json)
-            )
-            if project_type != 1:
-                mask_filename = image_name + postfix_mask
-                if from_s3_bucket is None:
-                    with open(Path(folder_path) / mask_filename, 'rb') as fin:
-                        file = io.BytesIO(fin.read())
-                else:
-                    file = io.BytesIO()
-                    from_s3_object = from_s3.Object(
-                        from_s3_bucket, folder_path + mask_filename
-                    )
-                    from_s3_object.download_fileobj(file)
-                    file.seek(0)
-                bucket.put_object(Key=image_path + postfix_mask, Body=file)
-            num_uploaded[thread_id] += 1
-            actually_uploaded[thread_id].append(
-                Path(folder_path) / json_filename
+
+def __read_annotation_file(folder_path, filename, from_s3_bucket=None):
+    if from_s3_bucket is None:
+        with open(Path(folder_path) / filename, 'rb') as fin:
+            return io.BytesIO(fin.read())
+    file = io.BytesIO()
+    get_s3_client().download_fileobj(
+        from_s3_bucket, folder_path + filename, file
+    )
+    file.seek(0)
+    return file
+
+
+def __upload_annotation(
+    project_type, folder_path, annotation_classes_dict, json_filename,
+    s3_client, bucket, json_key, mask_key, from_s3_bucket
+):
+    annotation_json = json.load(
+        __read_annotation_file(folder_path, json_filename, from_s3_bucket)
+    )
+    fill_class_and_attribute_ids(annotation_json, annotation_classes_dict)
+    s3_client.put_object(
+        Bucket=bucket, Key=json_key, Body=json.dumps(annotation_json)
+    )
+    if project_type != 1:
+        postfix_json = '___pixel.json'
+        mask_filename = json_filename[:-len(postfix_json)] + '___save.png'
+        if from_s3_bucket is None:
+            # streamed from disk
+            mask = Path(folder_path) / mask_filename
+        else:
+            mask = __read_annotation_file(
+                folder_path, mask_filename, from_s3_bucket
             )
+        upload_to_s3(s3_client, mask, bucket, mask_key)
 
 
 def upload_annotations_from_folder_to_project(
@@ -1002,7 +1362,7 @@ def _upload_annotations_from_folder_to_project(
                         project, path, from_s3_bucket, recursive_subfolders
                     )
         else:
-            s3_client = boto3.client('s3')
+            s3_client = get_s3_client()
             result = s3_client.list_objects(
                 Bucket=from_s3_bucket, Prefix=folder_path, Delimiter='/'
             )
@@ -1030,7 +1390,7 @@ def _upload_annotations_from_folder_to_project(
                 annotations_paths.append(path)
                 annotations_filenames.append(path.name)
     else:
-        s3_client = boto3.client('s3')
+        s3_client = get_s3_client()
         paginator = s3_client.get_paginator('list_objects_v2')
         response_iterator = paginator.paginate(
             Bucket=from_s3_bucket, Prefix=folder_path
@@ -1053,139 +1413,37 @@ def _upload_annotations_from_folder_to_project(
     )
     if len_annotations_paths == 0:
         return return_result
-    num_uploaded = [0] * _NUM_THREADS
-    actually_uploaded = []
-    for _ in range(_NUM_THREADS):
-        actually_uploaded.append([])
-    finish_event = threading.Event()
-    tqdm_thread = threading.Thread(
-        target=__tqdm_thread,
-        args=(len_annotations_paths, num_uploaded, finish_event)
-    )
-    tqdm_thread.start()
-
-    annotation_classes = search_annotation_classes(
-        project, return_metadata=True
-    )
-    annotation_classes_dict = get_annotation_classes_name_to_id(
-        annotation_classes
-    )
-    chunksize = int(math.ceil(len_annotations_paths / _NUM_THREADS))
-    threads = []
-    for thread_id in range(_NUM_THREADS):
-        t = threading.Thread(
-            target=__upload_annotations_thread,
-            args=(
-                team_id, project_id, project_type, annotations_filenames,
-                folder_path, annotation_classes_dict, thread_id, chunksize,
-                num_uploaded, from_s3_bucket, actually_uploaded
-            )
-        )
-        threads.append(t)
-        t.start()
-    for t in threads:
-        t.join()
-    finish_event.set()
-    tqdm_thread.join()
-    logger.info("Number of annotations uploaded %s.", sum(num_uploaded))
-
-    for ac_upl in actually_uploaded:
-        return_result += [str(p) for p in ac_upl]
-    print(return_result)
-    return return_result
-
-
-def __upload_preannotations_thread(
-    aws_creds, project_type, preannotations_filenames, folder_path,
-    annotation_classes_dict, thread_id, chunksize, num_uploaded,
-    already_uploaded, from_s3_bucket
-):
-    len_preanns = len(preannotations_filenames)
-    start_index = thread_id * chunksize
-    if start_index >= len_preanns:
-        return
-    end_index = min(start_index + chunksize, len_preanns)
-    s3_session = boto3.Session(
-        aws_access_key_id=aws_creds['accessKeyId'],
-        aws_secret_access_key=aws_creds['secretAccessKey'],
-        aws_session_token=aws_creds['sessionToken']
-    )
-    s3_resource = s3_session.resource('s3')
-    bucket = s3_resource.Bucket(aws_creds["bucket"])
-
+    annotation_classes_dict = _get_project_classes_name_to_id(project)
     postfix_json = '___objects.json' if project_type == 1 else '___pixel.json'
-    len_postfix_json = len(postfix_json)
     postfix_mask = '___save.png'
-    if from_s3_bucket is not None:
-        from_session = boto3.Session()
-        from_s3 = from_session.resource('s3')
 
-    for i in range(start_index, end_index):
-        if already_uploaded[i]:
-            continue
-        json_filename = preannotations_filenames[i]
-        if from_s3_bucket is None:
-            annotation_json = json.load(open(Path(folder_path) / json_filename))
-        else:
-            file = io.BytesIO()
-            from_s3_object = from_s3.Object(
-                from_s3_bucket, folder_path + json_filename
-            )
-            from_s3_object.download_fileobj(file)
-            file.seek(0)
-            annotation_json = json.load(file)
-
-        fill_class_and_attribute_ids(annotation_json, annotation_classes_dict)
-        bucket.put_object(
-            Key=aws_creds["filePath"] + f"/{json_filename}",
-            Body=json.dumps(annotation_json)
+    def _upload(target):
+        image_name, image_path, s3_client, bucket = target
+        __upload_annotation(
+            project_type, folder_path, annotation_classes_dict,
+            image_name + postfix_json, s3_client, bucket,
+            image_path + postfix_json, image_path + postfix_mask, from_s3_bucket
         )
-        if project_type != 1:
-            mask_filename = json_filename[:-len_postfix_json] + postfix_mask
-            if from_s3_bucket is None:
-                with open(Path(folder_path) / mask_filename, 'rb') as fin:
-                    file = io.BytesIO(fin.read())
-            else:
-                file = io.BytesIO()
-                from_s3_object = from_s3.Object(
-                    from_s3_bucket, folder_path + mask_filename
-                )
-                from_s3_object.download_fileobj(file)
-                file.seek(0)
-            bucket.put_object(
-                Key=aws_creds['filePath'] + f'/{mask_filename}', Body=file
-            )
-        num_uploaded[thread_id] += 1
-        already_uploaded[i] = True
-
 
-def __tqdm_thread(total_num, current_nums, finish_event):
-    with tqdm(total=total_num) as pbar:
-        while True:
-            finished = finish_event.wait(5)
-            if not finished:
-                pbar.update(sum(current_nums) - pbar.n)
-            else:
-                pbar.update(total_num - pbar.n)
-                break
-
-
-def __tqdm_thread_image_upload(
-    total_num, uploaded, couldnt_upload, finish_event
-):
-    with tqdm(total=total_num) as pbar:
-        while True:
-            finished = finish_event.wait(5)
-            if not finished:
-                sum_all = 0
-                for i in couldnt_upload:
-                    sum_all += len(i)
-                for i in uploaded:
-                    sum_all += len(i)
-                pbar.update(sum_all - pbar.n)
-            else:
-                pbar.update(total_num - pbar.n)
-                break
+    result = run_bulk(
+        _upload,
+        __get_annotation_upload_targets(
+            team_id, project_id,
+            [f[:-len(postfix_json)] for f in annotations_filenames],
+            postfix_json
+        ),
+        total=len_annotations_paths
+    )
+    for target, e in result.failed:
+        logger.warning("Couldn't upload annotation of %s %s", target[0], e)
+    logger.info("Number of annotations uploaded %s.", len(result.succeeded))
+
+    return_result += [
+        str(Path(folder_path) / (target[0] + postfix_json))
+        for target in result.succeeded
+    ]
+    print(return_result)
+    return return_result
 
 
 def upload_preannotations_from_folder_to_project(
@@ -1247,7 +1505,7 @@ def _upload_preannotations_from_folder_to_project(
                         project, path, from_s3_bucket, recursive_subfolders
                     )
         else:
-            s3_client = boto3.client('s3')
+            s3_client = get_s3_client()
             result = s3_client.list_objects(
                 Bucket=from_s3_bucket, Prefix=folder_path, Delimiter='/'
             )
@@ -1275,7 +1533,7 @@ def _upload_preannotations_from_folder_to_project(
                 preannotations_paths.append(path)
                 preannotations_filenames.append(path.name)
     else:
-        s3_client = boto3.client('s3')
+        s3_client = get_s3_client()
         paginator = s3_client.get_paginator('list_objects_v2')
         response_iterator = paginator.paginate(
             Bucket=from_s3_bucket, Prefix=folder_path
@@ -1299,24 +1557,13 @@ def _upload_preannotations_from_folder_to_project(
     if len_preannotations_paths == 0:
         return return_result
     params = {'team_id': team_id, 'creds_only': True, 'type': project_type}
-    num_uploaded = [0] * _NUM_THREADS
-    already_uploaded = [False] * len_preannotations_paths
-    chunksize = int(math.ceil(len_preannotations_paths / _NUM_THREADS))
-    finish_event = threading.Event()
-    tqdm_thread = threading.Thread(
-        target=__tqdm_thread,
-        args=(len_preannotations_paths, num_uploaded, finish_event)
-    )
-    tqdm_thread.start()
-    annotation_classes = search_annotation_classes(
-        project, return_metadata=True
-    )
-    annotation_classes_dict = get_annotation_classes_name_to_id(
-        annotation_classes
-    )
-    while True:
-        if sum(num_uploaded) == len_preannotations_paths:
-            break
+    annotation_classes_dict = _get_project_classes_name_to_id(project)
+    postfix_json = '___objects.json' if project_type == 1 else '___pixel.json'
+    uploaded = []
+    not_uploaded = list(zip(preannotations_paths, preannotations_filenames))
+    while not_uploaded:
+        # upload credentials are re-fetched in each round, as they may have
+        # expired during the previous one
         response = _api.send_request(
             req_type='GET',
             path=f'/project/{project_id}/preannotation',
@@ -1325,25 +1572,29 @@ def _upload_preannotations_from_folder_to_project(
         if not response.ok:
             raise SABaseException(response.status_code, response.text)
         aws_creds = response.json()
+        s3_client = get_s3_client(aws_creds)
+
+        def _upload(preannotation):
+            json_filename = preannotation[1]
+            mask_filename = json_filename[:-len(postfix_json)] + '___save.png'
+            __upload_annotation(
+                project_type, folder_path, annotation_classes_dict,
+                json_filename, s3_client, aws_creds["bucket"],
+                aws_creds["filePath"] + f"/{json_filename}",
+                aws_creds["filePath"] + f"/{mask_filename}", from_s3_bucket
+            )
 
-        threads = []
-        for thread_id in range(_NUM_THREADS):
-            t = threading.Thread(
-                target=__upload_preannotations_thread,
-                args=(
-                    aws_creds, project_type, preannotations_filenames,
-                    folder_path, annotation_classes_dict, thread_id, chunksize,
-                    num_uploaded, already_uploaded, from_s3_bucket
+        result = run_bulk(_upload, not_uploaded)
+        uploaded += result.succeeded
+        if not result.succeeded:
+            for preannotation, e in result.failed:
+                logger.warning(
+                    "Couldn't upload preannotation %s %s", preannotation[0], e
                 )
-            )
-            threads.append(t)
-            t.start()
-        for t in threads:
-            t.join()
-    finish_event.set()
-    tqdm_thread.join()
-    logger.info("Number of preannotations uploaded %s.", sum(num_uploaded))
-    return return_result + [str(p) for p in preannotations_paths]
+            break
+        not_uploaded = [preannotation for preannotation, _ in result.failed]
+    logger.info("Number of preannotations uploaded %s.", len(uploaded))
+    return return_result + [str(p) for p, _ in uploaded]
 
 
 def share_project(project, user, user_role):
@@ -1373,6 +1624,7 @@ def share_project(project, user, user_role):
     )
     if not response.ok:
         raise SABaseException(response.status_code, response.text)
+    _cache.invalidate(team_id, project_id, kinds=("project", ))
     logger.info(
         "Shared project %s with user %s and role %s", project["name"],
         user["email"], user_role_int_to_str(user_role)
@@ -1403,6 +1655,7 @@ def unshare_project(project, user):
     )
     if not response.ok:
         raise SABaseException(response.status_code, response.text)
+    _cache.invalidate(team_id, project_id, kinds=("project", ))
     logger.info("Unshared project %s from user ID %s", project["name"], user_id)
 
 
@@ -1595,6 +1848,7 @@ def set_project_workflow(project, new_workflow):
             response.status_code,
             "Couldn't set project workflow " + response.text
         )
+    _cache.invalidate(team_id, project_id, kinds=("project", ))
     res = response.json()
     return res
 
@@ -1680,6 +1934,7 @@ def set_project_settings(project, new_settings):
             response.status_code,
             "Couldn't set project settings " + response.text
         )
+    _cache.invalidate(team_id, project_id, kinds=("project", ))
     return response.json()
 
 
@@ -0,0 +1,203 @@
+import datetime
+import io
+import logging
+import os
+import threading
+import time
+
+import boto3
+from boto3.s3.transfer import TransferConfig
+from botocore.config import Config
+
+from ..exceptions import SABaseException
+from .executor import get_max_workers
+
+logger = logging.getLogger("superannotate-python-sdk")
+
+# temporary credentials given by the platform are STS credentials, which
+# are valid for at least 15 minutes
+_DEFAULT_CREDENTIALS_TTL = 15 * 60
+_EXPIRY_MARGIN = 60
+_MAX_CLIENTS = 64
+# S3 multipart upload parts should be at least 5 MiB
+_MIN_PART_SIZE = 5 * 1024 * 1024
+
+_multipart_threshold = 16 * 1024 * 1024
+_multipart_part_size = 16 * 1024 * 1024
+_multipart_max_concurrency = 4
+
+_clients = {}
+_lock = threading.Lock()
+
+
+def _credentials_expiry(creds, now):
+    expiration = creds.get("expiration", creds.get("Expiration"))
+    if expiration is None:
+        return now + _DEFAULT_CREDENTIALS_TTL - _EXPIRY_MARGIN
+    if isinstance(expiration, (int, float)):
+        # epoch seconds or milliseconds
+        expires = expiration / 1000 if expiration > 1e11 else expiration
+    else:
+        expires = _parse_iso_datetime(str(expiration))
+        if expires is None:
+            return now + _DEFAULT_CREDENTIALS_TTL - _EXPIRY_MARGIN
+    return expires - _EXPIRY_MARGIN
+
+
+def _parse_iso_datetime(text):
+    """Returns epoch seconds of ISO 8601 date-time, e.g.,
+    2021-01-01T00:00:00.000Z, or None if it can't be parsed. Date-times
+    without timezone are taken as UTC.
+    """
+    text = text.strip()
+    if text.endswith("Z"):
+        text = text[:-1] + "+0000"
+    elif len(text) > 6 and text[-6] in "+-" and text[-3] == ":":
+        # %z of Python 3.6 doesn't accept colon in the offset
+        text = text[:-3] + text[-2:]
+    elif not (len(text) > 5 and text[-5] in "+-"):
+        text += "+0000"
+    for date_format in ("%Y-%m-%dT%H:%M:%S.%f%z", "%Y-%m-%dT%H:%M:%S%z"):
+        try:
+            return datetime.datetime.strptime(text, date_format).timestamp()
+        except ValueError:
+            pass
+    return None
+
+
+def get_s3_client(creds=None):
+    """Returns low-level S3 client for the temporary credentials given by the
+    platform (dict with accessKeyId, secretAccessKey and sessionToken keys)
+    or for the default AWS credentials if creds is None.
+
+    Clients are thread-safe and are reused, with their connection pools,
+    until the credentials expire, after which a new client is created.
+    """
+    if creds is None:
+        key = None
+    else:
+        key = (
+            creds['accessKeyId'], creds['secretAccessKey'],
+            creds['sessionToken']
+        )
+    now = time.time()
+    with _lock:
+        entry = _clients.get(key)
+        if entry is not None and entry[1] > now:
+            return entry[0]
+        for expired_key in [k for k, e in _clients.items() if e[1] <= now]:
+            del _clients[expired_key]
+        while len(_clients) >= _MAX_CLIENTS:
+            del _clients[next(iter(_clients))]
+        config = Config(
+            max_pool_connections=max(
+                get_max_workers() * _multipart_max_concurrency, 10
+            )
+        )
+        if creds is None:
+            client = boto3.Session().client('s3', config=config)
+            expires = float("inf")
+        else:
+            client = boto3.Session(
+                aws_access_key_id=creds['accessKeyId'],
+                aws_secret_access_key=creds['secretAccessKey'],
+                aws_session_token=creds['sessionToken']
+            ).client('s3', config=config)
+            expires = _credentials_expiry(creds, now)
+        _clients[key] = (client, expires)
+        return client
+
+
+def clear_s3_clients():
+    with _lock:
+        _clients.clear()
+
+
+def configure_multipart_upload(
+    threshold=None, part_size=None, max_concurrency=None
+):
+    """Configures multipart upload of large files to the data storage by
+    image, video frame and annotation upload functions. Files of at least
+    threshold size are uploaded in parts in parallel and local files are
+    streamed from disk instead of being read to memory, smaller files are
+    uploaded in a single request.
+
+    :param threshold: size in bytes from which multipart upload is used
+    :type threshold: int
+    :param part_size: size of upload parts in bytes, at least 5 MiB
+    :type part_size: int
+    :param max_concurrency: number of parts of one file uploaded in parallel
+    :type max_concurrency: int
+    """
+    global _multipart_threshold, _multipart_part_size, _multipart_max_concurrency
+    for name, value in (
+        ("threshold", threshold), ("part_size", part_size),
+        ("max_concurrency", max_concurrency)
+    ):
+        if value is not None and (not isinstance(value, int) or value < 1):
+            raise SABaseException(0, f"{name} should be a positive integer")
+    if part_size is not None and part_size < _MIN_PART_SIZE:
+        raise SABaseException(
+            0, f"part_size should be at least {_MIN_PART_SIZE} bytes"
+        )
+    if threshold is not None:
+        _multipart_threshold = threshold
+    if part_size is not None:
+        _multipart_part_size = part_size
+    if max_concurrency is not None:
+        _multipart_max_concurrency = max_concurrency
+        # connection pools of the clients are sized by the concurrency
+        clear_s3_clients()
+
+
+def get_multipart_threshold():
+    return _multipart_threshold
+
+
+def _get_transfer_config():
+    return TransferConfig(
+        multipart_threshold=_multipart_threshold,
+        multipart_chunksize=_multipart_part_size,
+        max_concurrency=_multipart_max_concurrency,
+        use_threads=_multipart_max_concurrency > 1
+    )
+
+
+def _remaining_size(fileobj):
+    try:
+        position = fileobj.tell()
+        size = fileobj.seek(0, io.SEEK_END)
+        fileobj.seek(position)
+    except (AttributeError, OSError, ValueError):
+        return None
+    return size - position
+
+
+def upload_to_s3(s3_client, body, bucket, key):
+    """Uploads body to S3 with multipart upload if its size is at least
+    the multipart threshold (see configure_multipart_upload), otherwise
+    with a single put_object request.
+
+    :param body: bytes, binary file object (uploaded from its current position)
+                 or local file path, which is streamed from disk
+    :type body: bytes, file object or Pathlike (str or Path)
+    """
+    if isinstance(body, (str, os.PathLike)):
+        if os.path.getsize(body) >= _multipart_threshold:
+            s3_client.upload_file(
+                str(body), bucket, key, Config=_get_transfer_config()
+            )
+            return
+        with open(body, "rb") as f:
+            body = f.read()
+    if isinstance(body, (bytes, bytearray)):
+        if len(body) < _multipart_threshold:
+            s3_client.put_object(Bucket=bucket, Key=key, Body=body)
+            return
+        body = io.BytesIO(body)
+    else:
+        size = _remaining_size(body)
+        if size is not None and size < _multipart_threshold:
+            s3_client.put_object(Bucket=bucket, Key=key, Body=body)
+            return
+    s3_client.upload_fileobj(body, bucket, key, Config=_get_transfer_config())
@@ -2,6 +2,7 @@ import logging
 
 from ..api import API
 from ..exceptions import SABaseException
+from .executor import get_all_pages
 
 logger = logging.getLogger("superannotate-python-sdk")
 
@@ -23,7 +24,6 @@ def search_team_contributors(
     :return: metadata of found users
     :rtype: list of dicts
     """
-    result_list = []
     params = {'team_id': _api.team_id, 'offset': 0}
     if email is not None:
         params['email'] = email
@@ -31,23 +31,9 @@ def search_team_contributors(
         params['first_name'] = first_name
     if last_name is not None:
         params['last_name'] = last_name
-
-    while True:
-        response = _api.send_request(
-            req_type='GET', path='/users', params=params
-        )
-        if response.ok:
-            res = response.json()
-            result_list += res["data"]
-            new_len = len(result_list)
-            if res["count"] <= new_len:
-                break
-            params["offset"] = new_len
-        else:
-            raise SABaseException(
-                response.status_code,
-                "Couldn't search projects. " + response.text
-            )
+    result_list = get_all_pages(
+        '/users', params, "Couldn't search team contributors. "
+    )
 
     if return_metadata:
         return result_list
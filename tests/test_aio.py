@@ -0,0 +1,49 @@
+import asyncio
+from pathlib import Path
+
+import pytest
+
+import superannotate as sa
+
+saio = pytest.importorskip("superannotate.aio")
+
+PROJECT_NAME = "test aio vector"
+PROJECT_FOLDER = Path("./tests/sample_project_vector")
+
+
+def test_aio_get_images_annotations():
+    projects = sa.search_projects(PROJECT_NAME, return_metadata=True)
+    for project in projects:
+        sa.delete_project(project)
+    project = sa.create_project(PROJECT_NAME, "test", "Vector")
+    sa.upload_images_from_folder_to_project(
+        project, PROJECT_FOLDER, annotation_status="NotStarted"
+    )
+    sa.create_annotation_classes_from_classes_json(
+        project, PROJECT_FOLDER / "classes" / "classes.json"
+    )
+    sa.upload_annotations_from_folder_to_project(project, PROJECT_FOLDER)
+    images = sa.search_images(project)
+
+    async def _get():
+        try:
+            assert await saio.search_images(PROJECT_NAME) == images
+            metadata = await saio.get_image_metadata(PROJECT_NAME, images[0])
+            assert metadata == sa.get_image_metadata(project, images[0])
+            return [
+                result async for result in saio.get_images_annotations(
+                    PROJECT_NAME, images + ["nonexistent.jpg"]
+                )
+            ]
+        finally:
+            await saio.close()
+
+    results = asyncio.get_event_loop().run_until_complete(_get())
+    assert len(results) == len(images) + 1
+    for result in results:
+        if result["image_name"] == "nonexistent.jpg":
+            assert result["error"] is not None
+            continue
+        assert result["error"] is None
+        single = sa.get_image_annotations(project, result["image_name"])
+        assert result["annotation_json"] == single["annotation_json"]
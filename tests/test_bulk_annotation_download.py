@@ -0,0 +1,49 @@
+from pathlib import Path
+
+import pytest
+
+import superannotate as sa
+
+
+@pytest.mark.parametrize(
+    "project_type,name,description,from_folder", [
+        (
+            "Vector", "Example Project test vector bulk annotation download",
+            "test vector", Path("./tests/sample_project_vector")
+        ),
+        (
+            "Pixel", "Example Project test pixel bulk annotation download",
+            "test pixel", Path("./tests/sample_project_pixel")
+        )
+    ]
+)
+def test_get_images_annotations(project_type, name, description, from_folder):
+    projects = sa.search_projects(name, return_metadata=True)
+    for project in projects:
+        sa.delete_project(project)
+    project = sa.create_project(name, description, project_type)
+    sa.upload_images_from_folder_to_project(
+        project, from_folder, annotation_status="NotStarted"
+    )
+    sa.create_annotation_classes_from_classes_json(
+        project, from_folder / "classes" / "classes.json"
+    )
+    sa.upload_annotations_from_folder_to_project(project, from_folder)
+    images = sa.search_images(project)
+
+    results = list(
+        sa.get_images_annotations(
+            project, images + ["nonexistent.jpg"], max_workers=4
+        )
+    )
+    assert len(results) == len(images) + 1
+    for result in results:
+        if result["image_name"] == "nonexistent.jpg":
+            assert result["error"] is not None
+            continue
+        assert result["error"] is None
+        single = sa.get_image_annotations(project, result["image_name"])
+        assert result["annotation_json"] == single["annotation_json"]
+        if project_type == "Pixel":
+            assert result["annotation_mask"].getvalue(
+            ) == single["annotation_mask"].getvalue()
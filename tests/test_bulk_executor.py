@@ -0,0 +1,143 @@
+import threading
+import time
+from pathlib import Path
+
+import superannotate as sa
+from superannotate.db import executor
+from superannotate.db.executor import iter_in_background, run_bulk
+
+PROJECT_NAME = "test bulk executor upload"
+PROJECT_DESCRIPTION = "Desc"
+PROJECT_TYPE = "Vector"
+FROM_FOLDER = Path("./tests/sample_project_vector")
+
+
+def test_run_bulk_slow_item_doesnt_block_others():
+    worker_items = {}
+
+    def work(item):
+        if item == 0:
+            time.sleep(1)
+        worker_items.setdefault(threading.get_ident(), []).append(item)
+        if item == 7:
+            raise ValueError("bad item")
+        return item * 2
+
+    result = run_bulk(work, list(range(40)), max_workers=4)
+    assert result.succeeded == [i for i in range(40) if i != 7]
+    assert result.results == [2 * i for i in result.succeeded]
+    assert len(result.failed) == 1 and result.failed[0][0] == 7
+    assert result.cancelled == []
+    slow_worker_items = [
+        items for items in worker_items.values() if 0 in items
+    ][0]
+    assert len(slow_worker_items) < 10
+
+
+def test_run_bulk_cancel():
+    cancel_event = threading.Event()
+
+    def work(item):
+        if item == 5:
+            cancel_event.set()
+        return item
+
+    result = run_bulk(
+        work, iter(range(1000)), max_workers=2, cancel_event=cancel_event
+    )
+    assert len(result.succeeded) + len(result.cancelled) == 1000
+    assert len(result.cancelled) > 900
+
+
+def test_upload_with_max_workers():
+    projects = sa.search_projects(PROJECT_NAME, return_metadata=True)
+    for project in projects:
+        sa.delete_project(project)
+    project = sa.create_project(PROJECT_NAME, PROJECT_DESCRIPTION, PROJECT_TYPE)
+    sa.set_max_workers(3)
+    try:
+        uploaded, not_uploaded, _ = sa.upload_images_from_folder_to_project(
+            project, FROM_FOLDER, annotation_status="InProgress"
+        )
+        assert len(uploaded) == 4
+        assert len(not_uploaded) == 0
+        sa.create_annotation_classes_from_classes_json(
+            project, FROM_FOLDER / "classes" / "classes.json"
+        )
+        annotations = sa.upload_annotations_from_folder_to_project(
+            project, FROM_FOLDER
+        )
+        assert len(annotations) == 4
+    finally:
+        sa.set_max_workers(10)
+
+
+def test_iter_in_background():
+    produced = []
+
+    def items():
+        for i in range(100):
+            produced.append(i)
+            yield i
+        raise ValueError("bad item")
+
+    consumed = []
+    try:
+        for item in iter_in_background(items(), 4):
+            consumed.append(item)
+            if item == 0:
+                time.sleep(0.5)
+                # producer ran ahead only up to the queue size
+                assert len(produced) <= 6
+    except ValueError:
+        pass
+    else:
+        assert False
+    assert consumed == list(range(100))
+
+    closed = []
+
+    def endless():
+        try:
+            while True:
+                yield 1
+        finally:
+            closed.append(True)
+
+    items = iter_in_background(endless(), 4)
+    next(items)
+    items.close()
+    assert closed == [True]
+
+
+def test_iter_pages_short_page(monkeypatch):
+    items = list(range(100))
+    requested_offsets = []
+
+    class Response:
+        ok = True
+
+        def __init__(self, data):
+            self._data = data
+
+        def json(self):
+            return self._data
+
+    def send_request(req_type, path, params=None, json_req=None):
+        offset = params["offset"]
+        requested_offsets.append(offset)
+        # page at offset 30 is short, e.g., items were removed meanwhile
+        page_size = 5 if offset == 30 else 10
+        return Response(
+            {
+                "data": items[offset:offset + page_size],
+                "count": len(items)
+            }
+        )
+
+    monkeypatch.setattr(executor._api, "send_request", send_request)
+    pages = list(
+        executor.iter_pages("/items", {}, "Couldn't list ", max_workers=2)
+    )
+    assert [item for page in pages for item in page] == items
+    assert 35 in requested_offsets
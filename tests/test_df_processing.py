@@ -1,5 +1,9 @@
+import json
+import os
+import shutil
 from pathlib import Path
 
+import pandas as pd
 import pytest
 
 import superannotate as sa
@@ -24,3 +28,202 @@ def test_filter_instances(tmpdir):
     assert len(df) == 2
     assert df.iloc[0]["imageName"] == "example_image_1.jpg"
     assert df.iloc[1]["imageName"] == "example_image_2.jpg"
+
+
+def test_aggregate_annotations_process_pool(tmpdir):
+    tmpdir = Path(tmpdir)
+    shutil.copytree(Path(PROJECT_DIR) / "classes", tmpdir / "classes")
+    annotations = sorted(Path(PROJECT_DIR).glob("*___objects.json"))
+    for i in range(1200):
+        annotation_json = json.load(open(annotations[i % len(annotations)]))
+        created_at = f"2020-11-0{i % 9 + 1}T12:00:0{i % 10}.000Z"
+        for annotation in annotation_json:
+            annotation["createdAt"] = created_at
+        json.dump(
+            annotation_json, open(tmpdir / f"{i}.jpg___objects.json", "w")
+        )
+
+    df = sa.aggregate_annotations_as_df(
+        tmpdir, include_comments=True, include_tags=True, processes=2
+    )
+    df_single_process = sa.aggregate_annotations_as_df(
+        tmpdir, include_comments=True, include_tags=True, processes=0
+    )
+    pd.testing.assert_frame_equal(df, df_single_process)
+    assert str(df["createdAt"].dt.tz) == "UTC"
+
+
+def test_aggregate_annotations_columns_categorical():
+    df = sa.aggregate_annotations_as_df(PROJECT_DIR, include_tags=True)
+    columns = ["imageName", "instanceId", "className", "type", "tag"]
+    df_projected = sa.aggregate_annotations_as_df(
+        PROJECT_DIR, include_tags=True, columns=columns
+    )
+    pd.testing.assert_frame_equal(df[columns], df_projected)
+
+    df_categorical = sa.aggregate_annotations_as_df(
+        PROJECT_DIR, include_tags=True, categorical=True
+    )
+    assert df_categorical["className"].dtype == "category"
+    assert df_categorical["meta"].dtype == object
+    assert df_categorical["className"].astype(object).fillna("").tolist(
+    ) == df["className"].astype(object).fillna("").tolist()
+
+    with pytest.raises(sa.SABaseException):
+        sa.aggregate_annotations_as_df(PROJECT_DIR, columns=["tag"])
+
+
+def test_aggregate_annotations_cache(tmpdir, monkeypatch):
+    tmpdir = Path(tmpdir)
+    monkeypatch.setenv("HOME", str(tmpdir / "home"))
+    shutil.copytree(PROJECT_DIR, tmpdir / "project")
+    project_dir = tmpdir / "project"
+
+    df = sa.aggregate_annotations_as_df(project_dir, include_comments=True)
+    df_cached = sa.aggregate_annotations_as_df(
+        project_dir, include_comments=True, cache=True
+    )
+    pd.testing.assert_frame_equal(df, df_cached)
+    # cache is kept in the user's home, not in the export root
+    cache_dir = tmpdir / "home" / ".superannotate" / "cache"
+    assert len(list(cache_dir.rglob("*.pickle"))) == 1
+    assert len(list(project_dir.iterdir())) == len(
+        list(Path(PROJECT_DIR).iterdir())
+    )
+    df_cached = sa.aggregate_annotations_as_df(
+        project_dir, include_comments=True, cache=True
+    )
+    pd.testing.assert_frame_equal(df, df_cached)
+    df_cached = sa.aggregate_annotations_as_df(
+        project_dir, include_comments=True, cache=True, columns=["className"]
+    )
+    pd.testing.assert_frame_equal(df[["className"]], df_cached)
+
+    annotation_path = project_dir / "example_image_1.jpg___objects.json"
+    annotation_json = json.load(open(annotation_path))
+    json.dump(
+        [
+            annotation for annotation in annotation_json
+            if annotation.get("type") != "bbox"
+        ],
+        open(annotation_path, "w"),
+    )
+    (project_dir / "example_image_2.jpg___objects.json").unlink()
+    df = sa.aggregate_annotations_as_df(project_dir, include_comments=True)
+    df_cached = sa.aggregate_annotations_as_df(
+        project_dir, include_comments=True, cache=True
+    )
+    pd.testing.assert_frame_equal(df, df_cached)
+
+
+@pytest.mark.skipif(
+    "AO_TEST_LEVEL" not in os.environ or
+    os.environ["AO_TEST_LEVEL"] != "stress",
+    reason="Requires env variable to be set"
+)
+def test_aggregate_annotations_memory_benchmark(tmpdir):
+    tmpdir = Path(tmpdir)
+    shutil.copytree(Path(PROJECT_DIR) / "classes", tmpdir / "classes")
+    annotations = sorted(Path(PROJECT_DIR).glob("*___objects.json"))
+    for i in range(20000):
+        shutil.copy(
+            annotations[i % len(annotations)],
+            tmpdir / f"{i}.jpg___objects.json"
+        )
+
+    columns = [
+        "imageName", "instanceId", "className", "attributeGroupName",
+        "attributeName", "type", "probability"
+    ]
+    options = {
+        "default": {},
+        "categorical": {
+            "categorical": True
+        },
+        "projected categorical": {
+            "categorical": True,
+            "columns": columns
+        }
+    }
+    memory_usages = {}
+    for name, kwargs in options.items():
+        df = sa.aggregate_annotations_as_df(tmpdir, **kwargs)
+        memory_usages[name] = df.memory_usage(deep=True).sum()
+        print(f"{name}: {len(df)} rows {memory_usages[name] / 2**20:.1f} MiB")
+    assert memory_usages["categorical"] < memory_usages["default"]
+    assert memory_usages["projected categorical"] < memory_usages["categorical"]
+
+
+def test_update_annotations_df(tmpdir):
+    tmpdir = Path(tmpdir)
+    shutil.copytree(PROJECT_DIR, tmpdir / "project")
+    project_dir = tmpdir / "project"
+    df = sa.aggregate_annotations_as_df(
+        project_dir, include_classes_wo_annotations=True, include_tags=True
+    )
+
+    annotation_path = project_dir / "example_image_1.jpg___objects.json"
+    annotation_json = json.load(open(annotation_path))
+    json.dump(
+        [
+            annotation for annotation in annotation_json
+            if annotation.get("type") != "bbox"
+        ],
+        open(annotation_path, "w"),
+    )
+    (project_dir / "example_image_2.jpg___objects.json").unlink()
+    shutil.copy(
+        project_dir / "example_image_3.jpg___objects.json",
+        project_dir / "example_image_5.jpg___objects.json"
+    )
+    df_updated = sa.update_annotations_df(
+        df,
+        project_dir,
+        added=["example_image_5.jpg___objects.json"],
+        modified=[annotation_path],
+        removed=["example_image_2.jpg___objects.json"],
+        include_classes_wo_annotations=True,
+        include_tags=True
+    )
+    df = sa.aggregate_annotations_as_df(
+        project_dir, include_classes_wo_annotations=True, include_tags=True
+    )
+    assert set(df_updated["imageName"].dropna()) == set(
+        df["imageName"].dropna()
+    )
+
+    def sort(df):
+        return df.sort_values(["imageName", "instanceId"],
+                              kind="stable").reset_index(drop=True)
+
+    pd.testing.assert_frame_equal(sort(df_updated), sort(df))
+
+
+def test_df_to_annotations(tmpdir):
+    tmpdir = Path(tmpdir)
+    df = sa.aggregate_annotations_as_df(
+        PROJECT_DIR,
+        include_comments=True,
+        include_tags=True,
+        include_classes_wo_annotations=True
+    )
+    sa.df_to_annotations(df, tmpdir)
+    df_written = sa.aggregate_annotations_as_df(tmpdir, include_comments=True)
+    # tags and classes without annotations aren't written as instances
+    df = df[df["type"] != "tag"]
+    df = df[df["imageName"].notna()]
+    df = df.drop(columns="tag")
+
+    # instance IDs of written annotations don't count skipped instances
+    columns = [
+        "imageName", "className", "attributeGroupName", "attributeName", "type",
+        "probability", "meta", "commentResolved", "classColor"
+    ]
+
+    def sort(df):
+        # comments are written after instances
+        df = df.assign(comment=df["type"] == "comment")
+        return df.sort_values(["imageName", "comment"],
+                              kind="stable")[columns].reset_index(drop=True)
+
+    pd.testing.assert_frame_equal(sort(df_written), sort(df))
@@ -40,3 +40,12 @@ def test_duplicate_upload_images(tmpdir):
     assert len(uploads[0]) == 0
     assert len(uploads[1]) == 0
     assert len(uploads[2]) == 4
+
+    img_paths = [
+        "./tests/sample_project_vector/example_image_1.jpg",
+        "./tests/sample_project_vector/example_image_1.jpg"
+    ]
+    uploads = sa.upload_images_to_project(project, img_paths)
+
+    assert len(img_paths) == 2
+    assert uploads[2] == [img_paths[0]]
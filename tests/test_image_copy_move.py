@@ -160,3 +160,58 @@ def test_image_move(tmpdir):
 
     si = sa.search_images(project)
     assert len(si) == 1
+
+
+def test_images_copy_move(tmpdir):
+    projects_found = sa.search_projects(
+        PROJECT_NAME_CPY_MULT, return_metadata=True
+    )
+    for pr in projects_found:
+        sa.delete_project(pr)
+    projects_found = sa.search_projects(PROJECT_NAME_MOVE, return_metadata=True)
+    for pr in projects_found:
+        sa.delete_project(pr)
+
+    project = sa.create_project(PROJECT_NAME_CPY_MULT, "test", "Vector")
+    dest_project = sa.create_project(PROJECT_NAME_MOVE, "test", "Vector")
+    for pr in (project, dest_project):
+        sa.create_annotation_classes_from_classes_json(
+            pr, "./tests/sample_project_vector/classes/classes.json"
+        )
+    sa.upload_images_from_folder_to_project(
+        project,
+        "./tests/sample_project_vector",
+        annotation_status="InProgress"
+    )
+    sa.upload_annotations_from_folder_to_project(
+        project, "./tests/sample_project_vector"
+    )
+    sa.pin_image(project, "example_image_1.jpg")
+    images = sa.search_images(project)
+
+    copied, not_copied = sa.copy_images(
+        project,
+        images + ["nonexistent.jpg"],
+        project,
+        include_annotations=True,
+        copy_annotation_status=True,
+        copy_pin=True
+    )
+    assert not_copied == ["nonexistent.jpg"]
+    assert copied["example_image_1.jpg"] == "example_image_1_(1).jpg"
+    metadata = sa.get_image_metadata(project, "example_image_1_(1).jpg")
+    assert metadata["is_pinned"] == 1
+    assert metadata["annotation_status"] == sa.get_image_metadata(
+        project, "example_image_1.jpg"
+    )["annotation_status"]
+    assert sa.get_image_annotations(project, "example_image_1_(1).jpg"
+                                   )["annotation_json"] is not None
+    assert len(sa.search_images(project)) == 2 * len(images)
+
+    with pytest.raises(sa.SABaseException):
+        sa.move_images(project, images, project)
+    moved, not_moved = sa.move_images(project, images, dest_project)
+    assert not_moved == []
+    assert sorted(moved.values()) == sorted(images)
+    assert sorted(sa.search_images(dest_project)) == sorted(images)
+    assert len(sa.search_images(project)) == len(images)
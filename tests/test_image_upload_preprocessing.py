@@ -0,0 +1,65 @@
+import io
+import os
+import time
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from superannotate.db.projects import get_image_array_to_upload
+
+
+def _image_bytes(mode, size, image_format):
+    array = np.random.RandomState(0).randint(
+        0, 255, (48, 64, 3), dtype=np.uint8
+    )
+    image = Image.fromarray(array).resize(size, Image.BILINEAR)
+    if mode != "RGB":
+        image = image.convert(mode)
+    byte_io = io.BytesIO()
+    image.save(byte_io, image_format)
+    return byte_io.getvalue()
+
+
+@pytest.mark.parametrize(
+    "mode,image_format,quality", [
+        ("RGB", "JPEG", 100), ("RGB", "JPEG", 60), ("RGBA", "PNG", 60),
+        ("L", "PNG", 100)
+    ]
+)
+def test_fast_image_versions(mode, image_format, quality):
+    image_bytes = _image_bytes(mode, (1600, 1200), image_format)
+    legacy = get_image_array_to_upload(io.BytesIO(image_bytes), quality)
+    fast = get_image_array_to_upload(
+        io.BytesIO(image_bytes), quality, fast=True
+    )
+    for legacy_version, fast_version in zip(legacy, fast):
+        assert Image.open(legacy_version).size == Image.open(fast_version).size
+    assert fast[0].getvalue() == image_bytes
+    huge_diff = np.abs(
+        np.asarray(Image.open(legacy[2]).convert("RGB"), dtype=float) -
+        np.asarray(Image.open(fast[2]).convert("RGB"), dtype=float)
+    ).mean()
+    assert huge_diff < 5
+
+
+@pytest.mark.skipif(
+    "AO_TEST_LEVEL" not in os.environ or
+    os.environ["AO_TEST_LEVEL"] != "stress",
+    reason="Requires env variable to be set"
+)
+@pytest.mark.parametrize("quality", [100, 60])
+def test_fast_image_versions_benchmark(quality):
+    image_bytes = _image_bytes("RGB", (7296, 5472), "JPEG")
+    timings = {}
+    for fast in (False, True):
+        start = time.time()
+        for _ in range(3):
+            get_image_array_to_upload(
+                io.BytesIO(image_bytes), quality, fast=fast
+            )
+        timings[fast] = time.time() - start
+    print(
+        f"quality {quality}: legacy {timings[False]:.2f}s fast {timings[True]:.2f}s"
+    )
+    assert timings[True] < timings[False]
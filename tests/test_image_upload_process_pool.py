@@ -0,0 +1,22 @@
+import superannotate as sa
+
+PROJECT_NAME = "test image upload process pool"
+
+
+def test_image_upload_process_pool():
+    projects = sa.search_projects(PROJECT_NAME, return_metadata=True)
+    for project in projects:
+        sa.delete_project(project)
+    project = sa.create_project(PROJECT_NAME, "test", "Vector")
+
+    sa.set_image_upload_options(processes=2)
+    try:
+        uploaded, not_uploaded, duplicates = sa.upload_images_from_folder_to_project(
+            project, "./tests/sample_project_vector"
+        )
+    finally:
+        sa.set_image_upload_options(processes=0)
+    assert len(uploaded) == 4
+    assert len(not_uploaded) == 0
+    assert len(duplicates) == 0
+    assert sa.get_project_image_count(project) == 4
@@ -0,0 +1,94 @@
+from pathlib import Path
+
+import superannotate as sa
+from superannotate.db import images
+
+PROJECT_NAME1 = "test images index"
+
+
+def test_images_index(tmpdir):
+    tmpdir = Path(tmpdir)
+
+    projects = sa.search_projects(PROJECT_NAME1, return_metadata=True)
+    for project in projects:
+        sa.delete_project(project)
+
+    project = sa.create_project(PROJECT_NAME1, "test", "Vector")
+
+    sa.upload_images_from_folder_to_project(
+        project,
+        "./tests/sample_project_vector",
+        annotation_status="QualityCheck"
+    )
+
+    images = sa.search_images(project, return_metadata=True)
+    for image in images:
+        metadata = sa.get_image_metadata(project, image["name"])
+        assert metadata["id"] == image["id"]
+
+    sa.set_image_annotation_status(project, "example_image_1.jpg", "Completed")
+    sa.pin_image(project, "example_image_1.jpg")
+    metadata = sa.get_image_metadata(project, "example_image_1.jpg")
+    assert metadata["annotation_status"] == 5
+    assert metadata["is_pinned"] == 1
+
+    sa.invalidate_images_index(project)
+    metadata = sa.get_image_metadata(project, "example_image_1.jpg")
+    assert metadata["annotation_status"] == 5
+    assert metadata["is_pinned"] == 1
+
+    sa.delete_image(project, "example_image_1.jpg")
+    try:
+        sa.get_image_metadata(project, "example_image_1.jpg")
+    except sa.SABaseException:
+        pass
+    else:
+        assert False
+
+
+def test_search_images_pages():
+    projects = sa.search_projects(PROJECT_NAME1, return_metadata=True)
+    for project in projects:
+        sa.delete_project(project)
+
+    project = sa.create_project(PROJECT_NAME1, "test", "Vector")
+    sa.upload_images_from_folder_to_project(
+        project, "./tests/sample_project_vector"
+    )
+
+    images = sa.search_images(project, return_metadata=True)
+    pages = list(sa.search_images_pages(project, return_metadata=True))
+    assert [image for page in pages for image in page] == images
+    images = sa.search_images(project, "example_image_1")
+    assert images == ["example_image_1.jpg"]
+
+
+def test_images_index_missing_names(monkeypatch):
+    project = {"team_id": -1, "id": -1, "name": PROJECT_NAME1}
+    names = ["example_image_1.jpg", "example_image_2.jpg"]
+    searches = []
+
+    def search_images(project, image_name_prefix=None, return_metadata=False):
+        searches.append(image_name_prefix)
+        found = [n for n in names if n.startswith(image_name_prefix or "")]
+        return [{"name": name} for name in found]
+
+    monkeypatch.setattr(images, "search_images", search_images)
+    images.invalidate_images_index(project)
+    try:
+        assert images._get_existing_image_names(
+            project, ["example_image_1.jpg", "new.jpg"]
+        ) == {"example_image_1.jpg"}
+        # names that don't exist don't re-list the project
+        new_names = [f"new_{i}.jpg" for i in range(100)]
+        assert images._get_existing_image_names(project, new_names) == set()
+        assert searches == [None]
+
+        # names removed from the index by the SDK are searched
+        names.append("new_1.jpg")
+        images._remove_from_images_index(project, ["new_1.jpg"])
+        existing = images._get_existing_image_names(project, new_names)
+        assert existing == {"new_1.jpg"}
+        assert searches == [None, "new_1.jpg"]
+    finally:
+        images.invalidate_images_index(project)
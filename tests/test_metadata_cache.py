@@ -0,0 +1,36 @@
+import superannotate as sa
+
+PROJECT_NAME1 = "test metadata cache"
+PROJECT_NAME2 = "test metadata cache renamed"
+
+
+def test_metadata_cache():
+    for name in [PROJECT_NAME1, PROJECT_NAME2]:
+        projects = sa.search_projects(name, return_metadata=True)
+        for project in projects:
+            sa.delete_project(project)
+
+    project = sa.create_project(PROJECT_NAME1, "test", "Vector")
+    assert sa.get_project_metadata(PROJECT_NAME1)["id"] == project["id"]
+
+    sa.create_annotation_class(PROJECT_NAME1, "cat", "#FFFFFF")
+    assert sa.search_annotation_classes(PROJECT_NAME1) == ["cat"]
+    sa.create_annotation_class(PROJECT_NAME1, "dog", "#000000")
+    assert sorted(sa.search_annotation_classes(PROJECT_NAME1)) == ["cat", "dog"]
+    sa.delete_annotation_class(PROJECT_NAME1, "cat")
+    assert sa.search_annotation_classes(PROJECT_NAME1) == ["dog"]
+
+    sa.rename_project(PROJECT_NAME1, PROJECT_NAME2)
+    try:
+        sa.get_project_metadata(PROJECT_NAME1)
+    except sa.SANonExistingProjectNameException:
+        pass
+    else:
+        assert False
+    assert sa.get_project_metadata(PROJECT_NAME2)["id"] == project["id"]
+
+    sa.configure_metadata_cache(enabled=False)
+    assert sa.search_annotation_classes(PROJECT_NAME2) == ["dog"]
+    sa.configure_metadata_cache(enabled=True)
+    sa.clear_metadata_cache()
+    sa.delete_project(PROJECT_NAME2)
@@ -0,0 +1,34 @@
+import numpy as np
+from PIL import Image
+
+import superannotate as sa
+
+PROJECT_NAME = "test multipart upload"
+
+
+def test_multipart_image_upload(tmpdir):
+    projects = sa.search_projects(PROJECT_NAME, return_metadata=True)
+    for project in projects:
+        sa.delete_project(project)
+    project = sa.create_project(PROJECT_NAME, "test", "Vector")
+
+    image_path = tmpdir / "large.png"
+    Image.fromarray(
+        np.random.RandomState(0).randint(
+            0, 255, (2200, 2200, 3), dtype=np.uint8
+        )
+    ).save(image_path)
+    sa.configure_multipart_upload(
+        threshold=6 * 1024 * 1024, part_size=5 * 1024 * 1024
+    )
+    try:
+        uploaded, _, _ = sa.upload_images_to_project(project, [image_path])
+    finally:
+        sa.configure_multipart_upload(
+            threshold=16 * 1024 * 1024, part_size=16 * 1024 * 1024
+        )
+    assert len(uploaded) == 1
+
+    image_bytes = sa.get_image_bytes(project, "large.png").getvalue()
+    with open(image_path, "rb") as f:
+        assert image_bytes == f.read()
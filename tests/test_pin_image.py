@@ -47,3 +47,33 @@ def test_pin_image(tmpdir):
     del img_metadata0["updatedAt"]
 
     assert img_metadata == img_metadata0
+
+
+def test_pin_images_and_set_statuses():
+    projects = sa.search_projects(PROJECT_NAME1, return_metadata=True)
+    for project in projects:
+        sa.delete_project(project)
+
+    project = sa.create_project(PROJECT_NAME1, "test", "Vector")
+    sa.upload_images_from_folder_to_project(
+        project,
+        "./tests/sample_project_vector",
+        annotation_status="QualityCheck"
+    )
+    images = sa.search_images(project)
+
+    pinned, not_pinned = sa.pin_images(project, images + ["nonexistent.jpg"])
+    assert sorted(pinned) == sorted(images)
+    assert not_pinned == ["nonexistent.jpg"]
+
+    updated, not_updated = sa.set_images_annotation_statuses(
+        project, images, "Completed"
+    )
+    assert sorted(updated) == sorted(images)
+    assert not_updated == []
+
+    sa.invalidate_images_index(project)
+    for image in sa.search_images(project, return_metadata=True):
+        assert image["is_pinned"] == 1
+    assert sorted(sa.search_images(project, annotation_status="Completed")
+                 ) == sorted(images)
@@ -0,0 +1,28 @@
+import time
+
+from superannotate.db.s3_clients import get_s3_client
+
+CREDS = {
+    "accessKeyId": "test-key",
+    "secretAccessKey": "test-secret",
+    "sessionToken": "test-token",
+    "bucket": "test-bucket"
+}
+
+
+def test_s3_client_reused_for_same_credentials():
+    client = get_s3_client(CREDS)
+    assert get_s3_client(dict(CREDS, filePath="other")) is client
+    assert get_s3_client(dict(CREDS, sessionToken="other")) is not client
+
+
+def test_s3_client_recreated_after_expiry():
+    expired = dict(
+        CREDS, sessionToken="expired", expiration="2000-01-01T00:00:00Z"
+    )
+    assert get_s3_client(expired) is not get_s3_client(expired)
+
+    valid = dict(
+        CREDS, sessionToken="valid", expiration=(time.time() + 3600) * 1000
+    )
+    assert get_s3_client(valid) is get_s3_client(valid)
@@ -1,4 +1,5 @@
 from pathlib import Path
+import concurrent.futures
 import json
 import io
 
@@ -10,6 +11,7 @@ PROJECT_NAME = "test single image upload 1"
 PROJECT_NAME_S3 = "test single image upload s3 2"
 PROJECT_NAME_S3_CHANGE_NAME = "test single image upload s3 change name 3"
 PROJECT_NAME_BYTES = "test single image upload bytes 4"
+PROJECT_NAME_NO_WAIT = "test single image upload no wait 5"
 
 
 def test_single_image_upload(tmpdir):
@@ -119,3 +121,29 @@ def test_single_image_upload_bytesio(tmpdir):
         sa.get_image_metadata(project, image)["annotation_status"]
     ) == "InProgress"
     assert image == "rr.jpg"
+
+
+def test_single_image_upload_no_wait():
+    projects_found = sa.search_projects(
+        PROJECT_NAME_NO_WAIT, return_metadata=True
+    )
+    for pr in projects_found:
+        sa.delete_project(pr)
+
+    project = sa.create_project(PROJECT_NAME_NO_WAIT, "test", "Vector")
+
+    futures = []
+    for i in range(1, 5):
+        futures.append(
+            sa.upload_image_to_project(
+                project,
+                f"./tests/sample_project_vector/example_image_{i}.jpg",
+                wait=False
+            )
+        )
+    done, not_done = concurrent.futures.wait(futures, timeout=300)
+    assert len(not_done) == 0
+    assert sorted(f.result() for f in done) == [
+        f"example_image_{i}.jpg" for i in range(1, 5)
+    ]
+    assert len(sa.search_images(project)) == 4
@@ -28,3 +28,23 @@ def test_upload_stress():
     assert count == 40670
 
     # sa.delete_project(project)
+
+
+@pytest.mark.skipif(
+    "AO_TEST_LEVEL" not in os.environ or
+    os.environ["AO_TEST_LEVEL"] != "stress",
+    reason="Requires env variable to be set"
+)
+def test_upload_stress_process_pool():
+    project = sa.create_project("test_test_16", "hk", 1)
+    sa.set_image_upload_options(processes=os.cpu_count())
+    try:
+        sa.upload_images_from_folder_to_project(
+            project,
+            "/media/disc_drive/datasets/COCO/test2017",
+            annotation_status="QualityCheck"
+        )
+    finally:
+        sa.set_image_upload_options(processes=0)
+    count = sa.get_project_image_count(project)
+    assert count == 40670
@@ -42,3 +42,48 @@ def test_image_quality_setting1(tmpdir):
     assert len(sa.search_images(PROJECT_NAME1)) == len(
         sa.search_images(PROJECT_NAME2)
     )
+
+
+def test_video_frames_streamed_upload():
+    projects = sa.search_projects(PROJECT_NAME1, return_metadata=True)
+    for project in projects:
+        sa.delete_project(project)
+    project = sa.create_project(PROJECT_NAME1, "test", "Vector")
+
+    video_path = next(Path("./tests/sample_videos").glob("*"))
+    uploaded = sa.upload_video_to_project(
+        project, video_path, start_time=1.0, end_time=2.0
+    )
+    assert len(uploaded) > 0
+    assert uploaded == sorted(sa.search_images(project))
+
+    # already uploaded frames are skipped
+    assert sa.upload_video_to_project(
+        project, video_path, start_time=1.0, end_time=2.0
+    ) == []
+
+
+def test_videos_parallel_upload(tmpdir):
+    tmpdir = Path(tmpdir)
+    projects = sa.search_projects(PROJECT_NAME1, return_metadata=True)
+    for project in projects:
+        sa.delete_project(project)
+    project = sa.create_project(PROJECT_NAME1, "test", "Vector")
+
+    (tmpdir / "broken.mp4").write_bytes(b"not a video")
+    for video_path in Path("./tests/sample_videos").glob("*"):
+        (tmpdir / video_path.name).write_bytes(video_path.read_bytes())
+
+    results = sa.upload_videos_from_folder_to_project(
+        project, tmpdir, target_fps=2, processes=2, return_video_results=True
+    )
+    assert set(results) == {str(path) for path in tmpdir.glob("*")}
+    assert results[str(tmpdir / "broken.mp4")]["error"] is not None
+    uploaded = []
+    for video_path, result in results.items():
+        assert result["not_uploaded"] == []
+        if not video_path.endswith("broken.mp4"):
+            assert result["error"] is None
+            assert len(result["uploaded"]) > 0
+        uploaded += result["uploaded"]
+    assert sorted(uploaded) == sorted(sa.search_images(project))
@@ -0,0 +1,95 @@
+import os
+import random
+import time
+
+import cv2
+import numpy as np
+import pytest
+
+from superannotate.db.projects import _iter_video_frames, _open_video
+
+
+def _write_video(path, fps, num_frames, size, fourcc="MJPG"):
+    writer = cv2.VideoWriter(
+        str(path), cv2.VideoWriter_fourcc(*fourcc), fps, size
+    )
+    for i in range(num_frames):
+        # frame index is encoded in pixel values
+        writer.write(np.full((size[1], size[0], 3), i % 128 * 2, np.uint8))
+    writer.release()
+
+
+def _sampled_frame_indices(video_path, **kwargs):
+    video, rotate_code = _open_video(video_path)
+    indices = []
+    for _, frame in _iter_video_frames(video, "v", rotate_code, **kwargs):
+        image = cv2.imdecode(np.frombuffer(frame, np.uint8), 0)
+        indices.append(int(round(image.mean() / 2)))
+    return indices
+
+
+def test_video_frames_evenly_sampled(tmpdir):
+    video_path = tmpdir / "video.avi"
+    _write_video(video_path, 30, 120, (160, 120))
+
+    indices = _sampled_frame_indices(video_path, target_fps=3)
+    assert indices == list(range(0, 120, 10))
+    assert _sampled_frame_indices(
+        video_path, target_fps=5, start_time=1.0, end_time=2.0
+    ) == list(range(30, 61, 6))
+    indices = _sampled_frame_indices(video_path, start_time=3.5)
+    assert indices == list(range(105, 120))
+
+
+@pytest.mark.skipif(
+    "AO_TEST_LEVEL" not in os.environ or
+    os.environ["AO_TEST_LEVEL"] != "stress",
+    reason="Requires env variable to be set"
+)
+def test_video_frames_sampling_benchmark(tmpdir):
+    video_path = str(tmpdir / "video.mp4")
+    writer = cv2.VideoWriter(
+        video_path, cv2.VideoWriter_fourcc(*"mp4v"), 60, (1280, 720)
+    )
+    image = np.random.RandomState(0).randint(
+        0, 255, (720, 1280, 3), dtype=np.uint8
+    )
+    for i in range(60 * 60):
+        writer.write(np.roll(image, 4 * i, axis=1))
+    writer.release()
+
+    def decode_and_drop(target_fps, start_time):
+        # frame selection of upload_video_to_project before seek-based sampling
+        video = cv2.VideoCapture(video_path, cv2.CAP_FFMPEG)
+        total = int(video.get(cv2.CAP_PROP_FRAME_COUNT))
+        r = video.get(cv2.CAP_PROP_FPS) / target_fps
+        percent_to_drop = (total - total / r) / total
+        my_random = random.Random(122222)
+        while True:
+            success, frame = video.read()
+            if not success:
+                break
+            if my_random.random() < percent_to_drop:
+                continue
+            if video.get(cv2.CAP_PROP_POS_MSEC) / 1000.0 < start_time:
+                continue
+            cv2.imencode(".jpg", frame)
+
+    def sample(target_fps, start_time):
+        video, _ = _open_video(video_path)
+        for _ in _iter_video_frames(
+            video, "v", target_fps=target_fps, start_time=start_time
+        ):
+            pass
+
+    for target_fps, start_time in ((1, 0.0), (1, 30.0)):
+        timings = []
+        for func in (decode_and_drop, sample):
+            start = time.time()
+            func(target_fps, start_time)
+            timings.append(time.time() - start)
+        print(
+            f"target_fps {target_fps} start_time {start_time}: "
+            f"decode and drop {timings[0]:.2f}s sampling {timings[1]:.2f}s"
+        )
+        assert timings[1] < timings[0]